@@ -0,0 +1,8 @@
+__doc__ = """
+Benchmarks for the engine.  Each module can be run from the root of the project, for example::
+
+    python -m benchmarks.memory
+
+The results of every benchmark can be kept in a history, to find regressions between runs, with
+:mod:`benchmarks.history`.
+"""
@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import benchmarks.memory
+import benchmarks.speed
+
+__doc__ = """
+Keeps a history of benchmark results, and compares runs to find regressions.
+
+Each run of every benchmark is added to a JSON file, along with when it was run, the commit that was checked out and
+the version of Python used.  A new run can then be compared with an earlier one::
+
+    python -m benchmarks.history run
+    python -m benchmarks.history compare --threshold 0.1
+
+Every result is a time or a size, so a result which has gone up by more than the threshold is a regression.  The exit
+status of ``compare`` is 1 if there were any regressions, so it can be used in scripts.
+"""
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+THRESHOLD = 0.1
+
+
+def run_benchmarks():
+    """
+    Run the speed and memory benchmarks
+
+    :return: A dict from the name of each benchmark to its result
+    :rtype: dict
+    """
+    results = benchmarks.speed.run()
+    for board_size, size in benchmarks.memory.run().items():
+        results["copy_bytes_{}_minions".format(board_size)] = size
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path=HISTORY_FILE):
+    """
+    Read the history of benchmark runs
+
+    :param str path: The history file
+    :return: The runs, oldest first.  If there is no history file, there are no runs.
+    :rtype: [dict]
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def record(results, path=HISTORY_FILE, label=None):
+    """
+    Add the results of a run to the history
+
+    :param dict results: The results, as returned by :func:`run_benchmarks`
+    :param str path: The history file
+    :param str label: An optional description of this run
+    :return: The new entry in the history
+    :rtype: dict
+    """
+    history = load_history(path)
+    entry = {
+        'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'label': label,
+        'results': results,
+    }
+    history.append(entry)
+    with open(path, "w") as file:
+        json.dump(history, file, indent=2, sort_keys=True)
+    return entry
+
+
+def compare(old, new, threshold=THRESHOLD):
+    """
+    Compare the results of two runs
+
+    :param dict old: The results to compare against
+    :param dict new: The results to check
+    :param float threshold: How much larger a result must be, as a fraction of the old result, to be a regression
+    :return: A tuple of the names of the benchmarks which are in both runs, with their ratio of new to old, sorted by
+             name, and the names of those which are regressions
+    :rtype: ([(str, float)], [str])
+    """
+    ratios = [(name, new[name] / old[name]) for name in sorted(old) if name in new and old[name]]
+    regressions = [name for name, ratio in ratios if ratio > 1 + threshold]
+    return ratios, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmarks, or compare the results of two runs")
+    parser.add_argument("--file", default=HISTORY_FILE, help="the history file")
+    commands = parser.add_subparsers(dest="command")
+    run_parser = commands.add_parser("run", help="run the benchmarks and add the results to the history")
+    run_parser.add_argument("--label", help="a description of this run")
+    compare_parser = commands.add_parser("compare", help="compare the latest run with an earlier one")
+    compare_parser.add_argument("--baseline", type=int, default=-2,
+                                help="the index in the history of the run to compare against (default: the one "
+                                     "before the latest)")
+    compare_parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                                help="the fraction a result can grow by before it is a regression")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        entry = record(run_benchmarks(), args.file, args.label)
+        for name, result in sorted(entry['results'].items()):
+            print("{:<30} {:>14.6g}".format(name, result))
+        return 0
+    elif args.command == "compare":
+        history = load_history(args.file)
+        if len(history) < 2:
+            print("At least two runs are needed to compare")
+            return 2
+        old, new = history[args.baseline], history[-1]
+        ratios, regressions = compare(old['results'], new['results'], args.threshold)
+        print("Comparing {} ({}) with {} ({})".format(new['time'], new['commit'], old['time'], old['commit']))
+        for name, ratio in ratios:
+            print("{:<30} {:>+8.1%}{}".format(name, ratio - 1, "  REGRESSION" if name in regressions else ""))
+        return 1 if regressions else 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
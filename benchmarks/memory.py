@@ -0,0 +1,72 @@
+import gc
+import random
+import tracemalloc
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.engine import Game, card_lookup
+from run_games import load_deck
+
+__doc__ = """
+Measures how much memory a copy of a game takes, for boards with different numbers of minions on them.
+
+Searching agents keep a great many copies of a game alive at once, so the size of a copy limits how far they can
+search.
+"""
+
+SEED = 1857
+BOARD_SIZES = [0, 3, 7]
+# Minions with auras, effects and buffs, so that their tags are counted as well
+MINIONS = ["Raid Leader", "Dire Wolf Alpha", "Flametongue Totem", "Acolyte of Pain", "Chillwind Yeti",
+           "Stormwind Champion", "Shieldbearer"]
+
+
+def build_game(board_size):
+    """
+    Create a game between the zoo and example decks, with a number of minions on each side of the board.
+
+    :param int board_size: How many minions each player has
+    :rtype: :class:`hearthbreaker.engine.Game`
+    """
+    random.seed(SEED)
+    game = Game([load_deck("zoo.hsdeck"), load_deck("example.hsdeck")], [DoNothingAgent(), DoNothingAgent()])
+    game.pre_game()
+    game.current_player = game.players[1]
+    game.play_single_turn()
+    for player in game.players:
+        for index in range(board_size):
+            card_lookup(MINIONS[index % len(MINIONS)]).summon(player, game, index)
+    return game
+
+
+def bytes_per_copy(game, copies=100):
+    """
+    Measure the memory used by a copy of a game, on average.
+
+    :param hearthbreaker.engine.Game game: The game to copy
+    :param int copies: How many copies to make at once
+    :rtype: float
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [game.copy() for _ in range(copies)]
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return used / copies
+
+
+def run():
+    """
+    Measure the size of a copy for each of the board sizes
+
+    :return: A dict from the number of minions on each side of the board to the bytes used per copy
+    :rtype: dict
+    """
+    return {board_size: bytes_per_copy(build_game(board_size)) for board_size in BOARD_SIZES}
+
+
+if __name__ == "__main__":
+    for board_size, size in run().items():
+        print("{} minions each: {:.0f} bytes per copy".format(board_size, size))
@@ -0,0 +1,156 @@
+import io
+import random
+import time
+from benchmarks.memory import BOARD_SIZES, build_game
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.agents.trade_agent import TradeAgent
+from hearthbreaker.engine import Game, card_lookup, card_table
+from hearthbreaker.replay import Replay
+from hearthbreaker.serialization.binary import serialize_binary, deserialize_binary
+from hearthbreaker.serialization.serialization import serialize, deserialize
+from run_games import load_deck
+
+__doc__ = """
+Measures how long the engine takes to do the things which simulations spend most of their time on.
+
+Every benchmark is seeded, so each run does exactly the same work, and is timed several times over, keeping the fastest
+time.  The results are all in seconds per operation, so that lower is always better.
+"""
+
+SEED = 1857
+REPEAT = 3
+DECKS = ["example.hsdeck", "zoo.hsdeck"]
+AGENTS = [("random", RandomAgent), ("trade", TradeAgent)]
+
+
+def best_time(func, number, repeat=REPEAT):
+    """
+    Time a function, taking the fastest of several runs
+
+    :param function func: The function to time.  It is called with the number of the call in each run, from 0
+    :param int number: How many times to call the function in each run
+    :param int repeat: How many runs to make
+    :return: The time taken by each call in the fastest run, in seconds
+    :rtype: float
+    """
+    best = None
+    for run in range(repeat):
+        start = time.perf_counter()
+        for index in range(number):
+            func(index)
+        taken = time.perf_counter() - start
+        if best is None or taken < best:
+            best = taken
+    return best / number
+
+
+def time_games(deck_file, agent_type, number=20):
+    """
+    Time full games between two copies of the same deck and agent
+
+    :param str deck_file: The deck both players use
+    :param agent_type: The class of agent both players use
+    :param int number: How many games to play in each run
+    :return: The time taken for each game, in seconds
+    """
+    random.seed(SEED)
+    game = Game([load_deck(deck_file), load_deck(deck_file)], [agent_type(), agent_type()])
+
+    def play(index):
+        game.reset(SEED + index)
+        game.start()
+    return best_time(play, number)
+
+
+def time_copy(board_size, number=200):
+    """
+    Time copying a game with a number of minions on each side of the board
+    """
+    game = build_game(board_size)
+    return best_time(lambda index: game.copy(), number)
+
+
+def time_calculate_stat(number=200):
+    """
+    Time calculating the attack and maximum health of every character on a full board of minions with auras
+    """
+    game = build_game(7)
+    characters = [character for player in game.players for character in player.minions + [player.hero]]
+
+    def calculate(index):
+        for character in characters:
+            character.calculate_attack()
+            character.calculate_max_health()
+    return best_time(calculate, number)
+
+
+def time_serialization(number=20):
+    """
+    Time serializing and deserializing a game with a full board, in both the json and the binary formats
+
+    :return: A dict from the name of each operation to the time it takes
+    """
+    game = build_game(7)
+    agents = [RandomAgent(), RandomAgent()]
+    results = {}
+    for name, dump, load in [("", serialize, deserialize), ("_binary", serialize_binary, deserialize_binary)]:
+        serialized = dump(game)
+        results["serialize" + name] = best_time(lambda index: dump(game), number)
+        results["deserialize" + name] = best_time(lambda index: load(serialized, agents), number)
+    return results
+
+
+def time_replays(number=20):
+    """
+    Time reading and writing a replay, in both the compact and the json formats
+
+    :return: A dict from the name of each operation to the time it takes
+    """
+    results = {}
+    for name, path, read, write in [("replay", "tests/replays/compact/example.rep", Replay.read, Replay.write),
+                                    ("replay_json", "tests/replays/example.hsreplay", Replay.read_json,
+                                     Replay.write_json)]:
+        with open(path, "r") as file:
+            contents = file.read()
+        replay = Replay()
+        read(replay, io.StringIO(contents))
+        results[name + "_read"] = best_time(lambda index: read(Replay(), io.StringIO(contents)), number)
+        results[name + "_write"] = best_time(lambda index: write(replay, io.StringIO()), number)
+    return results
+
+
+def time_card_lookup(number=5):
+    """
+    Time looking up every card by name
+    """
+    names = sorted(card_table)
+
+    def look_up(index):
+        for name in names:
+            card_lookup(name)
+    return best_time(look_up, number)
+
+
+def run():
+    """
+    Run every benchmark
+
+    :return: A dict from the name of each benchmark to its time in seconds
+    :rtype: dict
+    """
+    results = {}
+    for deck_file in DECKS:
+        for agent_name, agent_type in AGENTS:
+            results["game_{}_{}".format(agent_name, deck_file.split(".")[0])] = time_games(deck_file, agent_type)
+    for board_size in BOARD_SIZES:
+        results["copy_{}_minions".format(board_size)] = time_copy(board_size)
+    results["calculate_stat"] = time_calculate_stat()
+    results.update(time_serialization())
+    results.update(time_replays())
+    results["card_lookup"] = time_card_lookup()
+    return results
+
+
+if __name__ == "__main__":
+    for name, taken in sorted(run().items()):
+        print("{:<30} {:>12.1f} us".format(name, taken * 1e6))
@@ -0,0 +1,41 @@
+import argparse
+import sys
+
+from hearthbreaker.agents import registry
+from hearthbreaker.evaluation import compare_agents
+from run_games import load_deck
+
+__doc__ = """
+Compares two agents from the agent registry with common random numbers.  See :mod:`hearthbreaker.evaluation`
+
+Usage: ``python compare_agents.py [--opponent NAME] [--seeds N] [--first-seed N] deck1 deck2 agent_a agent_b``
+"""
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Compare two agents, playing the same seeds with each of them")
+    parser.add_argument("deck1", help="The first deck file")
+    parser.add_argument("deck2", help="The second deck file")
+    parser.add_argument("agent_a", choices=registry.get_names(), help="The first agent")
+    parser.add_argument("agent_b", choices=registry.get_names(), help="The second agent")
+    parser.add_argument("--opponent", choices=registry.get_names(), default="Random",
+                        help="The agent they both play against")
+    parser.add_argument("--seeds", type=int, default=100, help="The number of seeds to play, each played four times")
+    parser.add_argument("--first-seed", type=int, default=0, help="The first seed to play")
+    options = parser.parse_args(args)
+
+    decks = [load_deck(options.deck1), load_deck(options.deck2)]
+    comparison = compare_agents(decks, lambda: registry.create_agent(options.agent_a),
+                                lambda: registry.create_agent(options.agent_b),
+                                lambda: registry.create_agent(options.opponent),
+                                range(options.first_seed, options.first_seed + options.seeds))
+    low, high = comparison.interval()
+    print("{} win rate: {:.3f}".format(options.agent_a, sum(comparison.scores_a) / len(comparison.scores_a)))
+    print("{} win rate: {:.3f}".format(options.agent_b, sum(comparison.scores_b) / len(comparison.scores_b)))
+    print("Difference: {:+.3f} (95% interval {:+.3f} to {:+.3f})".format(comparison.difference, low, high))
+    print("Games saved by pairing: {:.1f}x".format(comparison.efficiency))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,16 @@
 from hearthbreaker.agents.agent_registry import AgentRegistry as __ar__
 from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.agents.beam import BeamPlannerAgent
+from hearthbreaker.agents.monte_carlo import FlatMonteCarloAgent
+from hearthbreaker.agents.remote import AsyncRemoteAgent
+from hearthbreaker.agents.rollout import RolloutAgent
 from hearthbreaker.agents.trade_agent import TradeAgent
 
 registry = __ar__()
 
 registry.register("Random", RandomAgent)
-registry.register("Trade", TradeAgent)
\ No newline at end of file
+registry.register("Trade", TradeAgent)
+registry.register("Remote", AsyncRemoteAgent)
+registry.register("MonteCarlo", FlatMonteCarloAgent)
+registry.register("Beam", BeamPlannerAgent)
+registry.register("Rollout", RolloutAgent)
@@ -0,0 +1,112 @@
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.agents.planning import play_plan, successors
+
+__doc__ = """
+An agent which plans its whole turn with a beam search.
+
+At each step of the search, :class:`BeamPlannerAgent` tries every move (with every target and option it asks for) on
+copies of the games in the beam, scores each game that results with an evaluation function, and keeps only the best
+few for the next step.  Games which are reached by more than one order of moves are merged, using
+:meth:`Game.state_hash <hearthbreaker.engine.Game.state_hash>`.  Ending the turn at any point is a candidate too, so the
+plan chosen is the sequence of moves leading to the best scoring game seen anywhere in the search.
+
+The cost of planning a turn is bounded by the width of the beam and the number of moves searched.  The evaluation
+function is given a copy of the game and the player to score it for, and returns a number, higher being better for the
+player.  :func:`board_value` is used unless another is given.
+"""
+
+
+def board_value(game, player):
+    """
+    A simple evaluation of a game for a player, comparing the health of the heroes, the minions on the board and the
+    cards in hand
+
+    :param hearthbreaker.engine.Game game: The game to evaluate
+    :param hearthbreaker.engine.Player player: The player to evaluate it for
+    :rtype: float
+    """
+    opponent = player.opponent
+    if player.hero.dead:
+        return float("-inf")
+    if opponent.hero.dead:
+        return float("inf")
+    value = player.hero.health + player.hero.armor - opponent.hero.health - opponent.hero.armor
+    for minion in player.minions:
+        value += 2 * (minion.calculate_attack() + minion.health)
+    for minion in opponent.minions:
+        value -= 2 * (minion.calculate_attack() + minion.health)
+        if minion.taunt:
+            value -= minion.health
+    value += len(player.hand) - len(opponent.hand)
+    return value
+
+
+class BeamPlannerAgent(RandomAgent):
+    """
+    Plans each turn with a beam search over copies of the game.  The targets and options which aren't part of a turn,
+    such as those asked for during the other player's turn, are chosen at random.
+
+    :param int beam_width: The number of games kept at each step of the search
+    :param int max_depth: The most moves in a plan
+    :param function evaluate: Scores a game for a player, as :func:`board_value` does
+    """
+    def __init__(self, beam_width=4, max_depth=8, evaluate=board_value):
+        super().__init__()
+        self.beam_width = beam_width
+        self.max_depth = max_depth
+        self.evaluate = evaluate
+        #: The number of different games scored while planning the last turn
+        self.nodes = 0
+
+    def do_turn(self, player):
+        # Random effects can leave a plan impossible to follow, in which case the rest of the turn is planned again
+        for attempt in range(self.max_depth):
+            if player.game.game_ended:
+                return
+            plan = self.plan(player)
+            if not plan or play_plan(player, plan):
+                return
+
+    def plan(self, player):
+        """
+        Plan the rest of a player's turn
+
+        :param hearthbreaker.engine.Player player: The player whose turn it is
+        :return: The plan, as described in :mod:`hearthbreaker.agents.planning`
+        :rtype: [(int, [int])]
+        """
+        player_index = player.game.players.index(player)
+        game = player.game.copy()
+        best_score = self.evaluate(game, game.players[player_index])
+        best_plan = []
+        beam = [(game, [])]
+        seen = {game.state_hash()}
+        self.nodes = 1
+        for depth in range(self.max_depth):
+            children = []
+            for state, plan in beam:
+                if state.game_ended:
+                    continue
+                for index, script, outcome in successors(state, player_index):
+                    state_hash = outcome.state_hash()
+                    if state_hash in seen:
+                        outcome.dispose()
+                        continue
+                    seen.add(state_hash)
+                    self.nodes += 1
+                    score = self.evaluate(outcome, outcome.players[player_index])
+                    children.append((score, outcome, plan + [(index, script)]))
+            for state, plan in beam:
+                state.dispose()
+            children.sort(key=lambda child: child[0], reverse=True)
+            if children and children[0][0] > best_score:
+                best_score = children[0][0]
+                best_plan = children[0][2]
+            for score, outcome, plan in children[self.beam_width:]:
+                outcome.dispose()
+            beam = [(outcome, plan) for score, outcome, plan in children[:self.beam_width]]
+            if not beam:
+                break
+        for state, plan in beam:
+            state.dispose()
+        return best_plan
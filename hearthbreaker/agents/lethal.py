@@ -0,0 +1,106 @@
+from hearthbreaker.agents.planning import successors
+
+__doc__ = """
+Finds a way to kill the opposing hero this turn, if there is one.
+
+:class:`LethalSolver` searches through every order of the attacks, card plays and hero power uses a player can make
+this turn, along with every target and option those moves ask for.  Each move is tried on a copy of the game, so
+every card works exactly as it does when played for real.  The search is kept small by:
+
+* never searching the same state twice, using :meth:`Game.state_hash <hearthbreaker.engine.Game.state_hash>`, since
+  most orders of the same moves lead to the same state
+* giving up on a state once no more cards can be played and the hero power can't be used, if the characters which
+  can still attack don't have enough attack between them to kill the opposing hero
+
+A plan found by the solver is played with :func:`play_plan <hearthbreaker.agents.planning.play_plan>`::
+
+    plan = LethalSolver().solve(player)
+    if plan is not None:
+        play_plan(player, plan)
+"""
+
+
+class _OutOfNodes(Exception):
+    pass
+
+
+class LethalSolver:
+    """
+    Searches for a way to kill the opposing hero this turn
+
+    :param int max_nodes: The most states to search before giving up
+    """
+    def __init__(self, max_nodes=2000):
+        self.max_nodes = max_nodes
+        #: The number of states searched by the last call to :meth:`solve`
+        self.nodes = 0
+        #: Whether the last call to :meth:`solve` searched every state, so that if no plan was found, there isn't one
+        self.complete = True
+        self._seen = set()
+
+    def solve(self, player):
+        """
+        Find a way for a player to kill the opposing hero this turn
+
+        :param hearthbreaker.engine.Player player: The player whose turn it is
+        :return: The plan, as described in :mod:`hearthbreaker.agents.planning`, or ``None`` if there isn't one
+        :rtype: [(int, [int])]
+        """
+        self.nodes = 0
+        self.complete = True
+        self._seen = set()
+        game = player.game.copy()
+        try:
+            return self._search(game, player.game.players.index(player))
+        except _OutOfNodes:
+            self.complete = False
+            return None
+        finally:
+            self._seen = set()
+            game.dispose()
+
+    def _search(self, game, player_index):
+        player = game.players[player_index]
+        opponent = player.opponent
+        if opponent.hero.dead:
+            if player.hero.dead:
+                return None
+            return []
+        if game.game_ended or player.hero.dead:
+            return None
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise _OutOfNodes()
+        state = game.state_hash()
+        if state in self._seen:
+            return None
+        self._seen.add(state)
+        if not self._could_kill(player, opponent):
+            return None
+
+        for index, script, outcome in successors(game, player_index):
+            try:
+                plan = self._search(outcome, player_index)
+            finally:
+                outcome.dispose()
+            if plan is not None:
+                return [(index, script)] + plan
+        return None
+
+    @staticmethod
+    def _could_kill(player, opponent):
+        # Cards and hero powers could do any amount of damage, but once they can't be used, only the characters which
+        # can still attack can do any
+        if player.hero.power.can_use():
+            return True
+        for card in player.hand:
+            if card.can_use(player, player.game):
+                return True
+        damage = 0
+        for character in player.minions + [player.hero]:
+            if character.can_attack():
+                attacks = 1
+                if character.windfury() and not character.attacks_performed:
+                    attacks = 2
+                damage += character.calculate_attack() * attacks
+        return damage >= opponent.hero.health + opponent.hero.armor
@@ -0,0 +1,130 @@
+import math
+import time
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.agents.rollout import RolloutAgent
+from hearthbreaker.decisions import legal_actions
+
+__doc__ = """
+An agent which looks ahead by playing out copies of the game.
+
+Before each move, :class:`FlatMonteCarloAgent` tries each of the moves it could make (including ending its turn) on
+copies of the game, and plays the rest of each copy out with a simple agent, by default a
+:class:`RolloutAgent <hearthbreaker.agents.rollout.RolloutAgent>`.  Each move is scored by the share of those games the
+agent won, and the move with the best score is made.
+
+The number of playouts is set by a time budget for each move, or by a fixed number of iterations.  The budget is
+divided between rounds of successive halving: in each round every remaining move is played out in turn, and at the end
+of the round the worse half of the moves are dropped, so most of the playouts are spent on telling the best few moves
+apart.  With a time budget, the agent makes its move as soon as the budget runs out, using the playouts it has so far,
+so the time each move takes can be relied on.
+"""
+
+
+class FlatMonteCarloAgent(RandomAgent):
+    """
+    Chooses each move by playing out copies of the game.  The targets, options and positions for minions are chosen at
+    random, the same as :class:`RandomAgent <hearthbreaker.agents.basic_agents.RandomAgent>`.
+
+    :param float time_budget: How long to spend choosing each move, in seconds
+    :param int iterations: If given, the most playouts to make for each move instead, no matter how long they take
+    :param rollout_agent: The class of agent used to play out copies of the game, for both players
+    """
+    def __init__(self, time_budget=0.1, iterations=None, rollout_agent=RolloutAgent):
+        super().__init__()
+        self.time_budget = time_budget
+        self.iterations = iterations
+        self.rollout_agent = rollout_agent()
+        #: The number of playouts made for the last move chosen
+        self.playouts = 0
+
+    def do_turn(self, player):
+        while not player.game.game_ended:
+            actions = legal_actions(player)
+            if not actions:
+                return
+            choice = self.choose_action(player, actions)
+            if choice is None:
+                return
+            actions[choice]()
+
+    def choose_action(self, player, actions):
+        """
+        Choose the best of a player's moves
+
+        :param hearthbreaker.engine.Player player: The player whose turn it is
+        :param [hearthbreaker.decisions.Action] actions: The moves the player can make, from
+                                                         :func:`legal_actions <hearthbreaker.decisions.legal_actions>`
+        :return: The index of the best move in ``actions``, or ``None`` if it is best to end the turn
+        """
+        candidates = list(range(len(actions))) + [None]
+        wins = dict((candidate, 0.0) for candidate in candidates)
+        plays = dict((candidate, 0) for candidate in candidates)
+        player_index = player.game.players.index(player)
+        rounds = max(1, int(math.ceil(math.log(len(candidates), 2))))
+        start = time.perf_counter()
+        self.playouts = 0
+
+        for round_number in range(rounds):
+            simulated = 0
+            if self.iterations is not None:
+                remaining = self.iterations - self.playouts
+                if remaining <= 0:
+                    break
+                # Every remaining move is played out at least once in each round, unless that would go over the budget
+                round_playouts = min(remaining, max(len(candidates), remaining // (rounds - round_number)))
+                deadline = None
+            else:
+                round_playouts = None
+                deadline = start + self.time_budget * (round_number + 1) / rounds
+            while True:
+                if round_playouts is not None and simulated >= round_playouts:
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                candidate = candidates[simulated % len(candidates)]
+                wins[candidate] += self.simulate(player.game, player_index, candidate)
+                plays[candidate] += 1
+                simulated += 1
+                self.playouts += 1
+            if len(candidates) > 1:
+                candidates.sort(key=lambda c: self._score(wins[c], plays[c]), reverse=True)
+                candidates = candidates[:(len(candidates) + 1) // 2]
+        # The budget may have run out before the last round, leaving more than one move
+        return max(candidates, key=lambda c: self._score(wins[c], plays[c]))
+
+    @staticmethod
+    def _score(wins, plays):
+        # Moves which couldn't be played out before the time ran out are given the benefit of the doubt
+        if plays == 0:
+            return 0.5
+        return wins / plays
+
+    def simulate(self, game, player_index, action_index):
+        """
+        Play out a copy of a game after making one move, or ending the turn
+
+        :param hearthbreaker.engine.Game game: The game to copy
+        :param int player_index: The index of the player making the move in the game's players
+        :param int action_index: The index of the move in the player's legal actions, or ``None`` to end the turn
+        :return: 1 if the player won, 0 if they lost and 0.5 for a draw
+        :rtype: float
+        """
+        copied_game = game.copy()
+        for copied_player in copied_game.players:
+            copied_player.agent = self.rollout_agent
+        player = copied_game.players[player_index]
+        opponent = player.opponent
+        if action_index is not None:
+            legal_actions(player)[action_index]()
+            if not copied_game.game_ended:
+                self.rollout_agent.do_turn(player)
+        while not copied_game.game_ended:
+            copied_game.play_single_turn()
+        if player.hero.dead and opponent.hero.dead:
+            result = 0.5
+        elif opponent.hero.dead:
+            result = 1.0
+        else:
+            result = 0.0
+        copied_game.dispose()
+        return result
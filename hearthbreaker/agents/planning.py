@@ -0,0 +1,128 @@
+from hearthbreaker.agents.basic_agents import Agent
+from hearthbreaker.decisions import legal_actions
+
+__doc__ = """
+Tools for agents which plan their turn by trying out moves on copies of the game.
+
+A plan is a list of moves, each of which is the index of the move in the player's
+:func:`legal_actions <hearthbreaker.decisions.legal_actions>` at that point, and a list of the index of each choice
+(such as a target or an option) the move asks for, in the order it asks for them.  :func:`successors` finds every
+move and combination of choices a player could make next, and the game each of them leads to, and :func:`play_plan`
+plays a plan in the real game.
+
+Minions are always placed on the right of the board.  Cards with random effects are only played out once on each copy,
+so a plan which relies on one of them may not work when it is played for real.
+"""
+
+
+class _Branch(Exception):
+    """
+    Raised when a move asks for a choice which hasn't been made yet, with the number of choices there are
+    """
+    def __init__(self, count):
+        super().__init__()
+        self.count = count
+
+
+class ScriptedAgent(Agent):
+    """
+    Makes the choices a move asks for from a list of the index of each choice
+
+    :param [int] script: The index of each choice
+    :param bool branch: If True, a choice which isn't in the script raises an exception, so that each of the choices
+                        can be tried in turn.  Choices with only one option are added to the script instead.  If False,
+                        the first option is chosen.
+    """
+    def __init__(self, script, branch=True):
+        self.script = script
+        self.position = 0
+        self.branch = branch
+
+    def _choose(self, options):
+        if self.position < len(self.script):
+            # When a plan is played for real, random effects may have left fewer choices than there were in the copy
+            choice = options[min(self.script[self.position], len(options) - 1)]
+            self.position += 1
+            return choice
+        if self.branch and len(options) > 1:
+            raise _Branch(len(options))
+        if self.branch:
+            self.script.append(0)
+            self.position += 1
+        return options[0]
+
+    def do_card_check(self, cards):
+        return [True, True, True, True]
+
+    def do_turn(self, player):
+        pass
+
+    def choose_target(self, targets):
+        return self._choose(targets)
+
+    def choose_index(self, card, player):
+        return len(player.minions)
+
+    def choose_option(self, options, player):
+        return self._choose(self.filter_options(options, player))
+
+
+def successors(game, player_index):
+    """
+    Try every move the player whose turn it is could make next, with every combination of the choices each move asks
+    for, each on its own copy of the game.  Only one of several identical cards in the player's hand is tried, since
+    playing any of them leads to the same games.
+
+    :param hearthbreaker.engine.Game game: The game, which isn't changed
+    :param int player_index: The index of the player whose turn it is in the game's players
+    :return: A generator of the index of each move, the list of choices made for it, and the copy of the game after the
+             move has been made.  The copy belongs to the caller, who should dispose of it once it's done with.
+    """
+    tried = set()
+    for index, action in enumerate(legal_actions(game.players[player_index])):
+        if action.kind == "play":
+            card = (action.subject.name, action.subject.mana_cost())
+            if card in tried:
+                continue
+            tried.add(card)
+        scripts = [[]]
+        while scripts:
+            script = scripts.pop()
+            outcome = game.copy()
+            agent = ScriptedAgent(list(script))
+            player = outcome.players[player_index]
+            player.agent = agent
+            player.opponent.agent = ScriptedAgent([], False)
+            try:
+                legal_actions(player)[index]()
+            except _Branch as branch:
+                outcome.dispose()
+                for choice in reversed(range(branch.count)):
+                    scripts.append(script + [choice])
+                continue
+            yield index, agent.script, outcome
+
+
+def play_plan(player, plan):
+    """
+    Play a plan in the real game.  If random effects make the game differ from the copies the plan was made on, so
+    that the plan can't be followed, the player is left to carry on with their turn.
+
+    :param hearthbreaker.engine.Player player: The player whose turn it is
+    :param [(int, [int])] plan: The plan
+    :return: True if the plan was followed to the end, or until the game was over
+    :rtype: bool
+    """
+    agent = player.agent
+    try:
+        for index, script in plan:
+            if player.game.game_ended:
+                break
+            actions = legal_actions(player)
+            if index >= len(actions):
+                return False
+            player.agent = ScriptedAgent(script, False)
+            actions[index]()
+    finally:
+        player.agent = agent
+    return True
@@ -0,0 +1,509 @@
+import collections
+import json
+import os
+import select
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from hearthbreaker.agents.basic_agents import Agent
+from hearthbreaker.cards.base import Card
+from hearthbreaker.decisions import Decision
+from hearthbreaker.engine import Game, card_lookup
+from hearthbreaker.proxies import ProxyCharacter
+
+__doc__ = """
+Agents which run in another process, such as a server for a model, and are asked for each decision over a Unix socket.
+
+Each message is a JSON object, sent as its length in bytes (as a four byte, big endian integer) followed by the
+UTF-8 encoded JSON.  A request describes one decision::
+
+    {"id": 12, "kind": "choose_target", "player": 1, "game": {...}, "args": {...}}
+
+where ``kind`` is the name of the agent method being asked, ``player`` is 1 or 2, ``game`` is the serialized game (or
+``null`` for ``do_card_check``, which is asked before the game starts) and ``args`` describes the choices to be made
+between.  The answer is sent back with the same id, as ``{"id": 12, "answer": ...}``, or ``{"id": 12, "error": "..."}``
+if the server couldn't answer.  The answers are:
+
+* ``do_card_check``: a list of whether each card is kept
+* ``do_turn``: the index of the move to make in ``args["moves"]``, or ``null`` to end the turn.  As with
+  :mod:`hearthbreaker.decisions`, a turn is played one move at a time, and the player is asked again after each move.
+* ``choose_target``: the index of the chosen target in ``args``
+* ``choose_option``: the index of the chosen option in ``args["options"]``
+* ``choose_index``: the index the minion is placed at
+
+An :class:`AsyncRemoteAgent` can be used like any other agent, in which case the game waits for each answer before
+carrying on.  :func:`play_games` instead plays many games at once, and sends the requests for all of them over a pool
+of connections without waiting for the answers, carrying on with each game as its answer arrives.  The server is then
+kept busy rather than waiting for each round trip.
+
+:class:`AgentServer` serves any agent in this process over a socket, for testing, or to run agents in another process::
+
+    python -m hearthbreaker.agents.remote /tmp/agent.sock Trade
+"""
+
+_HEADER = struct.Struct(">I")
+
+#: The environment variable giving the socket agents connect to, when no path is given
+SOCKET_VARIABLE = "HEARTHBREAKER_AGENT_SOCKET"
+
+
+class RemoteAgentError(Exception):
+    """
+    Raised when a remote agent couldn't answer a request
+    """
+    pass
+
+
+def _encode(message):
+    data = json.dumps(message, default=lambda o: o.__to_json__()).encode("utf-8")
+    return _HEADER.pack(len(data)) + data
+
+
+def send_message(sock, message):
+    """
+    Send one message over a socket
+
+    :param socket.socket sock: The socket to send over
+    :param dict message: The message, which must be JSON serializable, or made of objects with a ``__to_json__`` method
+    """
+    sock.sendall(_encode(message))
+
+
+def _read_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError("The connection was closed")
+        data += chunk
+    return data
+
+
+def read_message(sock):
+    """
+    Read one message from a socket, waiting until it has all arrived
+
+    :param socket.socket sock: The socket to read from
+    :rtype: dict
+    """
+    size, = _HEADER.unpack(_read_exactly(sock, _HEADER.size))
+    return json.loads(_read_exactly(sock, size).decode("utf-8"))
+
+
+def _player_number(player):
+    if player is player.game.players[0]:
+        return 1
+    return 2
+
+
+def _option_name(option):
+    # Options are either cards, or have the card they are for
+    if isinstance(option, Card):
+        return option.ref_name
+    return option.card.ref_name
+
+
+def encode_request(decision, request_id):
+    """
+    Describe a decision as a request to send to a remote agent
+
+    :param hearthbreaker.decisions.Decision decision: The decision to ask for
+    :param int request_id: The id the answer will be sent back with
+    :rtype: dict
+    """
+    request = {
+        'id': request_id,
+        'kind': decision.kind,
+        'player': None,
+        'game': None,
+    }
+    if decision.kind == "do_card_check":
+        request['args'] = [card.ref_name for card in decision.args[0]]
+        return request
+    request['player'] = _player_number(decision.player)
+    request['game'] = decision.game
+    if decision.kind == "do_turn":
+        moves = []
+        for action in decision.options:
+            if action.kind == "play":
+                moves.append({'kind': "play", 'card': decision.player.hand.index(action.subject)})
+            elif action.kind == "attack":
+                moves.append({'kind': "attack", 'character': ProxyCharacter(action.subject)})
+            else:
+                moves.append({'kind': "power"})
+        request['args'] = {'moves': moves, 'turn_moves': decision.turn_moves}
+    elif decision.kind == "choose_target":
+        request['args'] = [ProxyCharacter(target) for target in decision.args[0]]
+    elif decision.kind == "choose_index":
+        request['args'] = {'card': decision.args[0].ref_name}
+    else:
+        options = decision.args[0]
+        request['args'] = {
+            'options': [_option_name(option) for option in options],
+            'cards': isinstance(options[0], Card),
+        }
+    return request
+
+
+def decode_answer(decision, response):
+    """
+    Turn the response to a request back into the answer to a decision
+
+    :param hearthbreaker.decisions.Decision decision: The decision which was asked for
+    :param dict response: The response to the request for it
+    :return: The answer to the decision, as given to :meth:`Game.run <hearthbreaker.engine.Game.run>`
+    """
+    if 'error' in response:
+        raise RemoteAgentError(response['error'])
+    answer = response['answer']
+    if decision.kind == "do_turn":
+        if answer is None:
+            return None
+        return decision.options[answer]
+    elif decision.kind in ("choose_target", "choose_option"):
+        return decision.args[0][answer]
+    return answer
+
+
+class _Connection:
+    def __init__(self, path):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.buffer = b""
+        self.in_flight = 0
+
+    def fileno(self):
+        return self.socket.fileno()
+
+    def receive(self):
+        """
+        Read whatever has arrived, and return the complete messages in it
+        """
+        chunk = self.socket.recv(65536)
+        if not chunk:
+            raise EOFError("The connection was closed")
+        self.buffer += chunk
+        messages = []
+        while len(self.buffer) >= _HEADER.size:
+            size, = _HEADER.unpack(self.buffer[:_HEADER.size])
+            if len(self.buffer) < _HEADER.size + size:
+                break
+            data = self.buffer[_HEADER.size:_HEADER.size + size]
+            self.buffer = self.buffer[_HEADER.size + size:]
+            messages.append(json.loads(data.decode("utf-8")))
+        return messages
+
+
+class ConnectionPool:
+    """
+    A set of connections to the same remote agent server, shared by all of the agents which use it
+
+    :param str path: The path of the server's socket
+    :param int size: The most connections to open
+    """
+    def __init__(self, path, size=4):
+        self.path = path
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def next_id(self):
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def acquire(self):
+        """
+        Take a connection from the pool, opening a new one if none are free
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _Connection(self.path)
+
+    def release(self, connection):
+        """
+        Put a connection back in the pool, or close it if the pool already has enough
+        """
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(connection)
+                return
+        connection.socket.close()
+
+    def request(self, message):
+        """
+        Send a request, and wait for the response to it
+        """
+        connection = self.acquire()
+        try:
+            send_message(connection.socket, message)
+            response = read_message(connection.socket)
+        except BaseException:
+            connection.socket.close()
+            raise
+        self.release(connection)
+        return response
+
+    def close(self):
+        with self._lock:
+            for connection in self._idle:
+                connection.socket.close()
+            self._idle = []
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def connection_pool(path):
+    """
+    The pool of connections shared by all of the agents using the server at a path
+
+    :rtype: ConnectionPool
+    """
+    with _pools_lock:
+        if path not in _pools:
+            _pools[path] = ConnectionPool(path)
+        return _pools[path]
+
+
+class AsyncRemoteAgent(Agent):
+    """
+    An agent which asks a server for each decision.  It can be used like any other agent, but games are much faster
+    when played together with :func:`play_games`, which doesn't wait on each request.
+
+    :param str path: The path of the server's socket.  Defaults to the path in the ``HEARTHBREAKER_AGENT_SOCKET``
+                     environment variable, so that agents can be created by name from the registry.
+    """
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get(SOCKET_VARIABLE)
+            if path is None:
+                raise RemoteAgentError("No socket given for the remote agent, and {} is not set"
+                                       .format(SOCKET_VARIABLE))
+        self.path = path
+        self.pool = connection_pool(path)
+
+    def _ask(self, decision):
+        return decode_answer(decision, self.pool.request(encode_request(decision, self.pool.next_id())))
+
+    def _player(self, game):
+        for player in game.players:
+            if player.agent is self:
+                return player
+        return game.current_player
+
+    def do_card_check(self, cards):
+        return self._ask(Decision(None, None, self, "do_card_check", (cards,)))
+
+    def do_turn(self, player):
+        moves = 0
+        while not player.game.game_ended:
+            move = self._ask(Decision(player.game, player, self, "do_turn", (player,), moves))
+            if move is None:
+                break
+            move()
+            moves += 1
+
+    def choose_target(self, targets):
+        game = targets[0].player.game
+        return self._ask(Decision(game, self._player(game), self, "choose_target", (targets,)))
+
+    def choose_index(self, card, player):
+        return self._ask(Decision(player.game, player, self, "choose_index", (card, player)))
+
+    def choose_option(self, options, player):
+        return self._ask(Decision(player.game, player, self, "choose_option", (options, player)))
+
+
+def play_games(games, depth=8):
+    """
+    Play many games at once, sending the requests for the decisions of every :class:`AsyncRemoteAgent` without
+    waiting for their answers.  The decisions of any other agents are made as usual.
+
+    :param [hearthbreaker.engine.Game] games: The games to play, which must not have started yet
+    :param int depth: The most requests waiting on an answer over each connection
+    """
+    runs = [game.run() for game in games]
+    queued = collections.deque()
+    waiting = {}
+    connections = {}
+    try:
+        for run in runs:
+            _advance(run, next, queued)
+        while queued or waiting:
+            while queued:
+                run, decision = queued[0]
+                pool = decision.agent.pool
+                pool_connections = connections.setdefault(pool, [])
+                connection = None
+                if pool_connections:
+                    connection = min(pool_connections, key=lambda c: c.in_flight)
+                if connection is None or connection.in_flight >= depth:
+                    if len(pool_connections) >= pool.size:
+                        break
+                    connection = pool.acquire()
+                    pool_connections.append(connection)
+                queued.popleft()
+                request_id = pool.next_id()
+                send_message(connection.socket, encode_request(decision, request_id))
+                connection.in_flight += 1
+                waiting[request_id] = (run, decision)
+            readable, writable, errors = select.select([c for cs in connections.values() for c in cs], [], [])
+            for connection in readable:
+                for response in connection.receive():
+                    connection.in_flight -= 1
+                    run, decision = waiting.pop(response['id'])
+                    answer = decode_answer(decision, response)
+                    _advance(run, lambda r: r.send(answer), queued)
+    finally:
+        for run in runs:
+            run.close()
+        for pool, pool_connections in connections.items():
+            for connection in pool_connections:
+                if connection.in_flight:
+                    connection.socket.close()
+                else:
+                    pool.release(connection)
+
+
+def _advance(run, resume, queued):
+    # Carry on with a game until it needs a remote decision, or is over
+    try:
+        decision = resume(run)
+        while not isinstance(decision.agent, AsyncRemoteAgent):
+            decision = run.send(decision.ask())
+    except StopIteration:
+        return
+    queued.append((run, decision))
+
+
+class _RemoteOption:
+    """
+    Stands in for an option which isn't a card, such as the choices of a minion, on the server
+    """
+    def __init__(self, card):
+        self.card = card
+
+
+class _MoveMade(Exception):
+    def __init__(self, kind, subject):
+        super().__init__()
+        self.kind = kind
+        self.subject = subject
+
+
+def _intercepted(kind, subject):
+    def intercept(*args):
+        raise _MoveMade(kind, subject)
+    return intercept
+
+
+def _first_move(agent, game, player, moves):
+    # The agent plays out its turn on the server's copy of the game, and is stopped at the first move it makes.  The
+    # methods are only replaced on this game, so agents which look ahead play out copies of it as usual.
+    characters = player.minions + [player.hero]
+    game.play_card = lambda card: _intercepted("play", card)()
+    for character in characters:
+        character.attack = _intercepted("attack", character)
+    player.hero.power.use = _intercepted("power", player.hero.power)
+    try:
+        agent.do_turn(player)
+    except _MoveMade as move:
+        for index, (kind, subject) in enumerate(moves):
+            if kind == move.kind and subject is move.subject:
+                return index
+        raise RemoteAgentError("The agent made a move which isn't allowed: {} {}".format(move.kind, move.subject))
+    finally:
+        del game.play_card
+        for character in characters:
+            del character.attack
+        del player.hero.power.use
+    return None
+
+
+def answer_request(agent, request):
+    """
+    Answer a request using an agent in this process, as the server does
+
+    :param hearthbreaker.agents.basic_agents.Agent agent: The agent to make the decision
+    :param dict request: The request
+    :return: The answer, to send back in the response
+    """
+    kind = request['kind']
+    args = request['args']
+    if kind == "do_card_check":
+        return [bool(keep) for keep in agent.do_card_check([card_lookup(name) for name in args])]
+    game = Game.__from_json__(request['game'], [agent, agent])
+    player = game.players[request['player'] - 1]
+    if kind == "do_turn":
+        moves = []
+        for move in args['moves']:
+            if move['kind'] == "play":
+                moves.append(("play", player.hand[move['card']]))
+            elif move['kind'] == "attack":
+                moves.append(("attack", ProxyCharacter.from_json(**move['character']).resolve(game)))
+            else:
+                moves.append(("power", player.hero.power))
+        return _first_move(agent, game, player, moves)
+    elif kind == "choose_target":
+        targets = [ProxyCharacter.from_json(**target).resolve(game) for target in args]
+        target = agent.choose_target(targets)
+        return [index for index, candidate in enumerate(targets) if candidate is target][0]
+    elif kind == "choose_index":
+        return agent.choose_index(card_lookup(args['card']), player)
+    else:
+        options = [card_lookup(name) for name in args['options']]
+        if not args['cards']:
+            options = [_RemoteOption(option) for option in options]
+        option = agent.choose_option(options, player)
+        return [index for index, candidate in enumerate(options) if candidate is option][0]
+
+
+class _AgentHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        agent = self.server.agent_factory()
+        while True:
+            try:
+                request = read_message(self.request)
+            except (EOFError, OSError):
+                return
+            try:
+                with self.server.lock:
+                    response = {'id': request['id'], 'answer': answer_request(agent, request)}
+            except Exception as e:
+                response = {'id': request['id'], 'error': "{}: {}".format(type(e).__name__, e)}
+            try:
+                send_message(self.request, response)
+            except OSError:
+                # The client has gone, after giving up on a game
+                return
+
+
+class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves an agent in this process to :class:`AsyncRemoteAgent` clients.  Each connection is handled in its own
+    thread, with its own agent, but only one request is answered at a time, as the engine isn't thread safe.
+
+    :param str path: The path of the socket to listen on
+    :param function agent_factory: Creates an agent for each connection, such as an agent class
+    """
+    daemon_threads = True
+
+    def __init__(self, path, agent_factory):
+        self.agent_factory = agent_factory
+        self.lock = threading.Lock()
+        super().__init__(path, _AgentHandler)
+
+
+if __name__ == "__main__":
+    from hearthbreaker.agents import registry
+    server = AgentServer(sys.argv[1], lambda: registry.create_agent(sys.argv[2]))
+    try:
+        server.serve_forever()
+    finally:
+        os.remove(sys.argv[1])
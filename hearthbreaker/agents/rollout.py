@@ -0,0 +1,126 @@
+import random
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.cards.base import Card
+
+__doc__ = """
+A cheap random agent for playing out copies of the game.
+
+:class:`RandomAgent <hearthbreaker.agents.basic_agents.RandomAgent>` checks every card in hand and every character on
+the board to see whether it can be used before each move it makes, which is most of the time spent on a playout.
+:class:`RolloutAgent` instead keeps a list of the moves which might be possible, picks one at random and only checks
+that one.  A move which can't be made is dropped from the list, and the moves which were dropped are tried again after
+a card is played or the hero power is used, since these are what usually make new moves possible.  Minions are added to
+the list as they are placed on the board, and cards as they are added to the hand.
+
+Because a move is only dropped when it is picked, each possible move is as likely to be made next as with
+:class:`RandomAgent <hearthbreaker.agents.basic_agents.RandomAgent>`, except that a move which only becomes possible
+after an attack won't be made until after the next card or hero power.
+"""
+
+
+class RolloutAgent(RandomAgent):
+    """
+    Plays its turns at random, as cheaply as possible.  Its choices are made with its own random number generator, so
+    that they don't disturb the random effects of the game itself.
+
+    :param str mode: How targets are chosen, one of:
+
+                     * ``"uniform"``: at random
+                     * ``"face"``: the opposing hero whenever it is one of the targets, and otherwise at random
+                     * ``"trades"``: when attacking, a minion the attacker can kill without dying itself, or failing
+                       that, any minion it can kill, or failing that, the opposing hero.  Other targets are chosen at
+                       random
+    :param seed: The seed for the agent's random number generator
+    """
+    modes = ("uniform", "face", "trades")
+
+    def __init__(self, mode="uniform", seed=None):
+        super().__init__()
+        if mode not in self.modes:
+            raise ValueError("Unknown rollout mode: {0}".format(mode))
+        self.mode = mode
+        self.random = random.Random(seed)
+        self._player = None
+        self._attacker = None
+
+    def do_turn(self, player):
+        game = player.game
+        hero = player.hero
+        power = hero.power
+        hand = player.hand
+        minions = player.minions
+        moves = list(minions)
+        moves.append(hero)
+        moves.append(power)
+        moves.extend(hand)
+        known = dict((id(card), card) for card in hand)
+        dropped = []
+        self._player = player
+        player.bind("minion_placed", moves.append)
+        try:
+            while moves and not game.game_ended:
+                index = self.random.randrange(len(moves))
+                move = moves[index]
+                if move is power:
+                    possible = power.can_use()
+                elif isinstance(move, Card):
+                    possible = move in hand and move.can_use(player, game)
+                else:
+                    possible = (move is hero or move in minions) and move.can_attack()
+                if not possible:
+                    moves[index] = moves[-1]
+                    moves.pop()
+                    dropped.append(move)
+                    continue
+
+                if move is power:
+                    power.use()
+                elif isinstance(move, Card):
+                    moves[index] = moves[-1]
+                    moves.pop()
+                    del known[id(move)]
+                    game.play_card(move)
+                else:
+                    self._attacker = move
+                    move.attack()
+                    self._attacker = None
+                    continue
+                moves.extend(dropped)
+                dropped = []
+                for card in hand:
+                    if id(card) not in known:
+                        known[id(card)] = card
+                        moves.append(card)
+        finally:
+            player.unbind("minion_placed", moves.append)
+            self._player = None
+            self._attacker = None
+
+    def choose_target(self, targets):
+        if self.mode != "uniform" and self._player is not None:
+            enemy_hero = self._player.opponent.hero
+            if self.mode == "face":
+                if enemy_hero in targets:
+                    return enemy_hero
+            elif self._attacker is not None:
+                return self._trade(self._attacker, targets, enemy_hero)
+        return targets[self.random.randrange(len(targets))]
+
+    def _trade(self, attacker, targets, enemy_hero):
+        attack = attacker.calculate_attack()
+        kills = [target for target in targets if target is not enemy_hero and target.health <= attack]
+        survives = [target for target in kills if target.calculate_attack() < attacker.health]
+        if survives:
+            return survives[self.random.randrange(len(survives))]
+        if kills:
+            return kills[self.random.randrange(len(kills))]
+        if enemy_hero in targets:
+            return enemy_hero
+        return targets[self.random.randrange(len(targets))]
+
+    def choose_index(self, card, player):
+        return self.random.randint(0, len(player.minions))
+
+    def choose_option(self, options, player):
+        options = self.filter_options(options, player)
+        return options[self.random.randrange(len(options))]
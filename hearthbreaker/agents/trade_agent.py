@@ -1,4 +1,6 @@
 from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.agents.lethal import LethalSolver
+from hearthbreaker.agents.planning import play_plan
 from hearthbreaker.agents.trade.possible_play import PlayMixin
 from hearthbreaker.agents.trade.trade import TradeMixin, AttackMixin
 from hearthbreaker.agents.trade.util import Util
@@ -103,19 +105,41 @@ class NullCard:
 
 
 class TradeAgent(TradeMixin, AttackMixin, PlayMixin, ChooseTargetMixin, DoNothingAgent):
-    def __init__(self):
+    """
+    :param bool find_lethal: If True, search for a way to kill the opposing hero at the start of each turn, with a
+                             :class:`LethalSolver <hearthbreaker.agents.lethal.LethalSolver>`, once the opposing hero
+                             has at most :attr:`lethal_health` health and armor
+    """
+    #: Lethal is only searched for when the opposing hero has at most this much health and armor
+    lethal_health = 15
+    #: The most states searched when looking for lethal
+    lethal_nodes = 100
+
+    def __init__(self, find_lethal=False):
         super().__init__()
         self.current_trade = None
         self.last_card_played = NullCard()
+        self.find_lethal = find_lethal
 
     def do_turn(self, player):
         self.player = player
+        if self.find_lethal and self.play_lethal(player):
+            return
         self.play_cards(player)
         self.attack(player)
 
         if not player.game.game_ended:
             self.play_cards(player)
 
+    def play_lethal(self, player):
+        opponent = player.opponent
+        if opponent.hero.health + opponent.hero.armor > self.lethal_health:
+            return False
+        plan = LethalSolver(self.lethal_nodes).solve(player)
+        if plan is None:
+            return False
+        return play_plan(player, plan) and player.game.game_ended
+
     def do_card_check(self, cards):
         return [True, True, True, True]
 
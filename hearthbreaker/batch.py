@@ -0,0 +1,107 @@
+__doc__ = """
+Plays many games in lockstep, so that the decisions every game is waiting on can be made together, in one batch.
+
+Agents which evaluate positions with a model are much faster when they evaluate many positions at once, but each game
+only asks its agents for one decision at a time.  A :class:`BatchRunner` plays each of its games until it needs a
+decision, and then passes the decisions for all of the games to a single function, which answers all of them::
+
+    def decide(decisions):
+        return [model.answer(decision) for decision in decisions]
+
+    BatchRunner(decide).run(games)
+
+Each decision is a :class:`hearthbreaker.decisions.Decision`, answered the same way as the decisions yielded by
+:meth:`Game.run <hearthbreaker.engine.Game.run>`, which is how each game is played.  The runner resumes each game in
+turn, and waits for it to stop at its next decision before resuming the next, so games are played exactly as they would
+be on their own.
+
+Only ``max_games`` games are played at once, which is also the largest a batch can be.  The rest are started as others
+finish, which keeps the batches full.
+"""
+
+
+class BatchRunner:
+    """
+    Plays games in lockstep, making all of the decisions they are waiting on in a single batch
+
+    :param function decide: Called with a list of :class:`hearthbreaker.decisions.Decision` objects, and
+                            returns a list of the answers to them, in the same order
+    :param int max_games: The most games played at once, which is also the largest a batch can be.  If greenlet isn't
+                          installed, it can't be more than :data:`hearthbreaker.decisions.MAX_RUNNING`.
+    """
+    def __init__(self, decide, max_games=256):
+        self.decide = decide
+        self.max_games = max_games
+        #: The number of batches decided in the last run
+        self.batches = 0
+        #: The number of decisions made in the last run
+        self.decisions = 0
+
+    def run(self, games):
+        """
+        Play games until they are all over.  The games must not have started yet.  The agents of the players are
+        replaced while the games are played, and put back once they are over.
+
+        If any game raises an exception, the other games are stopped where they are, and the exception is raised
+        again once all of the agents have been put back.  The same happens if ``decide`` doesn't return exactly one
+        answer for each decision, which raises a ValueError.
+
+        :param [hearthbreaker.engine.Game] games: The games to play
+        """
+        self.batches = 0
+        self.decisions = 0
+        games = iter(games)
+        runs = []
+        waiting = []
+        try:
+            self._start(games, runs, waiting)
+            while waiting:
+                decisions = [decision for run, decision in waiting]
+                answers = self.decide(decisions)
+                if len(answers) != len(decisions):
+                    raise ValueError("Expected {} answers, but got {}".format(len(decisions), len(answers)))
+                self.batches += 1
+                self.decisions += len(decisions)
+                resumed = waiting
+                waiting = []
+                for (run, decision), answer in zip(resumed, answers):
+                    self._resume(run, answer, waiting)
+                self._start(games, runs, waiting)
+        finally:
+            # Closing a game which is over does nothing, and closing one which isn't stops it and restores its agents
+            for run in runs:
+                run.close()
+
+    def _start(self, games, runs, waiting):
+        # Every game which hasn't finished is waiting on a decision, so games are started until there are max_games
+        # waiting, or there are none left
+        while len(waiting) < self.max_games:
+            game = next(games, None)
+            if game is None:
+                return
+            run = game.run()
+            runs.append(run)
+            self._resume(run, None, waiting, first=True)
+
+    @staticmethod
+    def _resume(run, answer, waiting, first=False):
+        try:
+            if first:
+                decision = next(run)
+            else:
+                decision = run.send(answer)
+        except StopIteration:
+            return
+        waiting.append((run, decision))
+
+    @staticmethod
+    def delegate(decisions):
+        """
+        Answer decisions using the agents the players had before their games were run in a batch.  This plays games
+        the same as they would be played without a batch, and is useful for answering some of the decisions in a
+        batch, such as those for players who aren't using a model.
+
+        :param [hearthbreaker.decisions.Decision] decisions: The decisions to make
+        :return: The answers to the decisions
+        """
+        return [decision.ask() for decision in decisions]
@@ -151,12 +151,31 @@ class Card(Bindable, GameObject):
         r_val['name'] = self.name
         return r_val
 
+    def __reduce__(self):
+        # Cards are unpickled by creating a new instance, which sets up the targeting functions and the events.  The
+        # rest of the state replaces what the constructor created.  The player, and the targets from when the card
+        # was last played, may belong to another game entirely (cards are shared between tags), so they are left
+        # out.  The game sets the player again when it attaches the cards in each player's hand.
+        state = dict(self.__dict__)
+        for attribute in ['events', 'get_targets', 'filter_func', 'player', 'target', 'current_target',
+                          '_placeholder']:
+            state.pop(attribute, None)
+        state['_attached'] = False
+        return type(self), (), state
+
     def __str__(self):  # pragma: no cover
         """
         Outputs a description of the card for debugging purposes.
         """
         return self.name + " (" + str(self.mana) + " mana)"
 
+    def dispose(self):
+        super().dispose()
+        self.current_target = None
+        if self.targetable:
+            self.targets = []
+            self.target = None
+
     def replace(self, new_card):
         index = self.player.hand.index(self)
         self.unattach()
@@ -261,6 +280,7 @@ class MinionCard(Card, metaclass=abc.ABCMeta):
         if self._placeholder:
             minion.index = self._placeholder.index
             player.minions.remove(self._placeholder)
+            self._placeholder = None
             for m in player.minions[minion.index:]:
                 m.index -= 1
         else:
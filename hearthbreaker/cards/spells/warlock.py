@@ -136,8 +136,7 @@ class SenseDemons(SpellCard):
                                           c.is_minion() and
                                           c.minion_type == MINION_TYPE.DEMON)
             if demon_card:
-                demon_card.drawn = True
-                player.deck.left -= 1
+                player.deck.take(demon_card)
                 if len(player.hand) < 10:
                     player.hand.append(demon_card)
                     demon_card.player = player
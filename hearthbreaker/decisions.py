@@ -0,0 +1,314 @@
+import threading
+from hearthbreaker.cards.base import Card
+
+try:
+    import greenlet
+except ImportError:  # pragma: no cover
+    greenlet = None
+
+__doc__ = """
+Plays a game as a generator of the decisions it needs, rather than by calling its agents.
+
+Ordinarily a game asks each player's agent for decisions, and the agent calls back into the game to play its turn.
+:meth:`Game.run <hearthbreaker.engine.Game.run>` turns this around: it returns a generator which yields a
+:class:`Decision` whenever the game needs one, and is sent the answer to it::
+
+    decisions = game.run()
+    try:
+        decision = next(decisions)
+        while True:
+            decision = decisions.send(choose(decision))
+    except StopIteration:
+        pass
+
+The ``kind`` of a decision is the name of the agent method the game would have called (``do_card_check``,
+``do_turn``, ``choose_target``, ``choose_index`` or ``choose_option``), and its ``args`` are the arguments it would have
+been called with.  The answer to a decision is what that method would have returned, apart from ``do_turn``.  Instead
+of playing out a whole turn, a ``do_turn`` decision asks for the player's next move, and is answered with one of the
+:class:`Action` objects in its ``options``, or any other function which makes a move, or with ``None`` to end the turn.
+The player is asked again after each move, until the turn is ended or the game is over.  :meth:`Decision.ask` answers a
+decision with an ordinary agent, so agents can still be used alongside a generator.
+
+The decisions are asked for from deep within the engine and the cards, which can't be suspended part way through, so
+each game being run is played on a `greenlet <https://greenlet.readthedocs.io/>`_ of its own, which switches back to
+the generator whenever the game needs a decision, and is switched back to when the generator is sent the answer.
+Greenlets are switched cooperatively on the thread which runs the generators, so any number of games can be
+interleaved on one thread, each of them is played exactly as it would be by
+:meth:`Game.start <hearthbreaker.engine.Game.start>`, and the engine doesn't need to be thread safe.
+
+The greenlet is released when the game is over, or when the generator is closed, which stops the game where it is.  A
+generator which is thrown away before the game is over is closed when it is garbage collected.
+
+greenlet is optional.  Without it, each game is played in a thread of its own instead, of which only one is ever
+running at a time, and no more than :data:`MAX_RUNNING` games can be run at once.
+"""
+
+#: The most games which can be run at once when greenlet isn't installed, each of which holds a thread until it is over
+#: or its generator is closed
+MAX_RUNNING = 1000
+
+# The number of games being run with a thread of their own
+_running = 0
+_running_lock = threading.Lock()
+
+
+class GameAborted(Exception):
+    """
+    Raised within a game which is stopped before it is over, because its generator was closed
+    """
+    pass
+
+
+class Action:
+    """
+    One of the moves a player can make on their turn
+
+    :param str kind: ``"play"`` to play a card, ``"attack"`` to attack with a character or ``"power"`` to use the
+                     hero power
+    :param subject: The card played, the character attacking or the power used
+    :param function move: Makes the move
+    """
+    def __init__(self, kind, subject, move):
+        self.kind = kind
+        self.subject = subject
+        self.move = move
+
+    def __call__(self):
+        self.move()
+
+    def __str__(self):
+        return "{} {}".format(self.kind, self.subject)
+
+
+def legal_actions(player):
+    """
+    Find the moves a player can make, which are the cards they can play, the characters they can attack with and
+    their hero power if they can use it
+
+    :param hearthbreaker.engine.Player player: The player whose turn it is
+    :rtype: [Action]
+    """
+    game = player.game
+    actions = [Action("play", card, lambda card=card: game.play_card(card))
+               for card in player.hand if card.can_use(player, game)]
+    actions.extend(Action("attack", character, character.attack)
+                   for character in player.minions + [player.hero] if character.can_attack())
+    if player.hero.power.can_use():
+        actions.append(Action("power", player.hero.power, player.hero.power.use))
+    return actions
+
+
+class Decision:
+    """
+    A decision which a game is waiting on
+    """
+    def __init__(self, game, player, agent, kind, args, turn_moves=0):
+        #: The game waiting on this decision
+        self.game = game
+        #: The player who is deciding
+        self.player = player
+        #: The agent which the player had before the game was run, which can be used to make the decision
+        self.agent = agent
+        #: The name of the agent method which asked for this decision
+        self.kind = kind
+        #: The arguments which the agent method was called with
+        self.args = args
+        #: For ``do_turn`` decisions, the number of moves the player has already made this turn
+        self.turn_moves = turn_moves
+        self._options = None
+
+    @property
+    def options(self):
+        """
+        The legal answers to this decision.  These are the cards to keep or put back for ``do_card_check`` (which is
+        answered with a list of whether each is kept), the :class:`Action` objects a player can make for ``do_turn``,
+        the characters which can be targeted, the indices a minion can be placed at, and the options which can be
+        chosen.
+        """
+        if self._options is None:
+            if self.kind == "do_turn":
+                self._options = legal_actions(self.player)
+            elif self.kind == "choose_index":
+                self._options = list(range(len(self.player.minions) + 1))
+            elif self.kind == "choose_option":
+                options, player = self.args
+                if isinstance(options[0], Card):
+                    self._options = [option for option in options if option.can_choose(player)]
+                else:
+                    self._options = [option for option in options if option.card.can_choose(player)]
+            else:
+                self._options = list(self.args[0])
+        return self._options
+
+    def ask(self, agent=None):
+        """
+        Answer this decision with an agent, the same as the game would have asked it when played with
+        :meth:`Game.start <hearthbreaker.engine.Game.start>`
+
+        :param hearthbreaker.agents.basic_agents.Agent agent: The agent to ask.  Defaults to the player's own agent
+        :return: The answer to this decision.  For ``do_turn``, the whole turn is played by the agent as the first move,
+                 after which the turn is ended.
+        """
+        if agent is None:
+            agent = self.agent
+        if self.kind == "do_turn":
+            if self.turn_moves:
+                return None
+            return lambda: agent.do_turn(self.player)
+        return getattr(agent, self.kind)(*self.args)
+
+
+class _DecidingAgent:
+    """
+    Stands in for a player's agent while its game is run, asking for each decision instead
+    """
+    def __init__(self, worker, player, agent):
+        self.worker = worker
+        self.player = player
+        self.agent = agent
+
+    def _decide(self, kind, *args, turn_moves=0):
+        return self.worker.wait(Decision(self.worker.game, self.player, self.agent, kind, args, turn_moves))
+
+    def do_card_check(self, cards):
+        return self._decide("do_card_check", cards)
+
+    def do_turn(self, player):
+        moves = 0
+        while not player.game.game_ended:
+            move = self._decide("do_turn", player, turn_moves=moves)
+            if move is None:
+                break
+            move()
+            moves += 1
+
+    def choose_target(self, targets):
+        return self._decide("choose_target", targets)
+
+    def choose_index(self, card, player):
+        return self._decide("choose_index", card, player)
+
+    def choose_option(self, options, player):
+        return self._decide("choose_option", options, player)
+
+    def filter_options(self, options, player):
+        return self.agent.filter_options(options, player)
+
+
+class _GameGreenlet:
+    """
+    Plays one game on a greenlet of its own, switching back to whoever resumed it whenever it needs a decision
+    """
+    def __init__(self, game):
+        self.game = game
+        self.pending = None
+        self.error = None
+        self._caller = None
+        self._greenlet = greenlet.greenlet(self._play)
+
+    def start(self):
+        self.resume(None)
+
+    def resume(self, answer):
+        self._caller = greenlet.getcurrent()
+        self._greenlet.parent = self._caller
+        self.pending = self._greenlet.switch(answer)
+
+    def abort(self):
+        self._caller = greenlet.getcurrent()
+        self._greenlet.parent = self._caller
+        self.pending = self._greenlet.throw(GameAborted())
+
+    def wait(self, decision):
+        # Called from the game's greenlet
+        return self._caller.switch(decision)
+
+    def _play(self, answer):
+        try:
+            self.game.start()
+        except GameAborted:
+            pass
+        except Exception as e:
+            self.error = e
+
+
+class _GameThread:
+    """
+    Plays one game in a thread of its own, handing control back whenever it needs a decision.  This is used when
+    greenlet isn't installed.
+    """
+    def __init__(self, game):
+        self.game = game
+        self.pending = None
+        self.error = None
+        self._answer = None
+        self._aborted = False
+        self._resumed = threading.Semaphore(0)
+        self._paused = threading.Semaphore(0)
+        self._thread = threading.Thread(target=self._play)
+        self._thread.daemon = True
+
+    def start(self):
+        global _running
+        with _running_lock:
+            if _running >= MAX_RUNNING:
+                raise RuntimeError("No more than {} games can be run at once".format(MAX_RUNNING))
+            _running += 1
+        self._thread.start()
+        self._paused.acquire()
+
+    def resume(self, answer):
+        self.pending = None
+        self._answer = answer
+        self._resumed.release()
+        self._paused.acquire()
+
+    def abort(self):
+        self._aborted = True
+        self.resume(None)
+        self._thread.join()
+
+    def wait(self, decision):
+        # Called from the game's thread
+        self.pending = decision
+        self._paused.release()
+        self._resumed.acquire()
+        if self._aborted:
+            raise GameAborted()
+        return self._answer
+
+    def _play(self):
+        global _running
+        try:
+            self.game.start()
+        except GameAborted:
+            pass
+        except Exception as e:
+            self.error = e
+        with _running_lock:
+            _running -= 1
+        self._paused.release()
+
+
+def run(game):
+    """
+    Play a game as a generator of decisions.  This is what :meth:`Game.run <hearthbreaker.engine.Game.run>` does.
+
+    :param hearthbreaker.engine.Game game: The game to play, which must not have started yet
+    """
+    worker = _GameThread(game) if greenlet is None else _GameGreenlet(game)
+    agents = [(player, player.agent) for player in game.players]
+    for player, agent in agents:
+        player.agent = _DecidingAgent(worker, player, agent)
+    try:
+        worker.start()
+        while worker.pending is not None:
+            answer = yield worker.pending
+            worker.resume(answer)
+        if worker.error is not None:
+            raise worker.error
+    finally:
+        if worker.pending is not None:
+            worker.abort()
+        for player, agent in agents:
+            player.agent = agent
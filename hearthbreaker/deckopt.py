@@ -0,0 +1,359 @@
+import functools
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.cards.heroes import hero_for_class
+from hearthbreaker.constants import CARD_RARITY, CHARACTER_CLASS
+from hearthbreaker.engine import Deck, card_lookup, get_cards
+from hearthbreaker.evaluation import play_seeded
+from hearthbreaker.serialization import replace_file
+
+__doc__ = """
+Searches for strong decks with a genetic algorithm.
+
+A decklist is a list of the names of 30 cards, as used by :func:`card_lookup <hearthbreaker.engine.card_lookup>`.
+:class:`DeckOptimizer` keeps a population of legal decklists for one class, and in each generation keeps the best few
+and breeds the rest of the next generation from the better decks, by mixing the cards of two of them and then
+swapping a few cards for others.  A deck is legal if it has 30 collectible cards which are neutral or belong to its
+class, with no more than two of any card, and no more than one of any legendary card.
+
+A deck's fitness is its win rate against a fixed gauntlet of decks.  Every deck plays the same seeds (see
+:func:`hearthbreaker.evaluation.play_seeded`), so the differences between decks aren't hidden by luck, and the fitness
+of a decklist is always the same.  Fitnesses are cached by :func:`deck_hash`, which doesn't depend on the order of
+the cards, so a decklist which has been seen before is never played again.  Only exactly the same cards count as the
+same decklist: a deck which differs from one already played by even a single card is played in full, as one card can
+change a deck's win rate.  The decks of each generation which haven't been seen before are played across a pool of
+processes.
+
+After each generation, the population and the cache can be saved to a checkpoint file, from which a long search can
+be carried on::
+
+    optimizer = DeckOptimizer(CHARACTER_CLASS.MAGE, [(zoo, RandomAgent)], checkpoint="mage.json")
+    optimizer.run(50)
+    print(optimizer.best())
+"""
+
+# The gauntlet, agent and seeds each process plays with, set once when its pool is started
+_settings = None
+
+_log = logging.getLogger(__name__)
+
+
+def card_pool(character_class):
+    """
+    Find the cards a deck of a class can contain
+
+    :param int character_class: A member of :class:`hearthbreaker.constants.CHARACTER_CLASS`
+    :return: The names of the cards, in alphabetical order
+    :rtype: [str]
+    """
+    return sorted(card.ref_name for card in get_cards()
+                  if card.character_class in (CHARACTER_CLASS.ALL, character_class))
+
+
+def copy_limit(name):
+    """
+    :param str name: The name of a card
+    :return: How many copies of the card a deck can contain
+    :rtype: int
+    """
+    return 1 if card_lookup(name).rarity == CARD_RARITY.LEGENDARY else 2
+
+
+def is_legal(decklist, character_class):
+    """
+    Check whether a decklist follows the rules for a deck of a class
+
+    :param [str] decklist: The names of the cards in the deck
+    :param int character_class: A member of :class:`hearthbreaker.constants.CHARACTER_CLASS`
+    :rtype: bool
+    """
+    if len(decklist) != 30:
+        return False
+    pool = set(card_pool(character_class))
+    for name in set(decklist):
+        if name not in pool or decklist.count(name) > copy_limit(name):
+            return False
+    return True
+
+
+def deck_hash(decklist, character_class):
+    """
+    Compute a hash of a decklist which doesn't depend on the order of the cards in it
+
+    :param [str] decklist: The names of the cards in the deck
+    :param int character_class: A member of :class:`hearthbreaker.constants.CHARACTER_CLASS`
+    :rtype: str
+    """
+    canonical = json.dumps([character_class, sorted(decklist)])
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def make_deck(decklist, character_class):
+    """
+    Create a deck from a decklist
+
+    :param [str] decklist: The names of the cards in the deck
+    :param int character_class: A member of :class:`hearthbreaker.constants.CHARACTER_CLASS`
+    :rtype: hearthbreaker.engine.Deck
+    """
+    return Deck([card_lookup(name) for name in decklist], hero_for_class(character_class))
+
+
+def _agent_name(agent):
+    # Agents are usually classes, or partials of registry.create_agent as optimize_deck.py makes them
+    if isinstance(agent, functools.partial):
+        arguments = [repr(argument) for argument in agent.args]
+        arguments += ["{}={!r}".format(name, value) for name, value in sorted(agent.keywords.items())]
+        return "{}({})".format(_agent_name(agent.func), ", ".join(arguments))
+    return "{}.{}".format(agent.__module__, agent.__name__)
+
+
+def _start_process(settings):
+    global _settings
+    _settings = settings
+
+
+def _score(deck, agent, opponent_deck, opponent, seed, errors):
+    # A few cards can still stop a game with an exception.  The deck being evolved is given the loss when this happens,
+    # so that a long search isn't stopped by one game, and decks with those cards aren't chosen.  The errors are
+    # collected so that they can be reported, rather than being mistaken for real losses.
+    try:
+        first = play_seeded([deck, opponent_deck], [agent(), opponent()], seed)
+    except Exception as error:
+        errors.append("{}: {}".format(type(error).__name__, error))
+        first = 0.0
+    try:
+        second = 1 - play_seeded([opponent_deck, deck], [opponent(), agent()], seed)
+    except Exception as error:
+        errors.append("{}: {}".format(type(error).__name__, error))
+        second = 0.0
+    return first + second
+
+
+def _fitness(task):
+    decklist, character_class = task
+    gauntlet, agent, seeds = _settings
+    deck = make_deck(decklist, character_class)
+    score = 0.0
+    errors = []
+    for opponent_deck, opponent in gauntlet:
+        for seed in seeds:
+            score += _score(deck, agent, opponent_deck, opponent, seed, errors)
+    return deck_hash(decklist, character_class), score / (2 * len(gauntlet) * len(seeds)), errors
+
+
+class DeckOptimizer:
+    """
+    Evolves decks of one class to beat a gauntlet
+
+    :param int character_class: The class of the decks, a member of :class:`hearthbreaker.constants.CHARACTER_CLASS`
+    :param gauntlet: The decks to play against, each a pair of a :class:`hearthbreaker.engine.Deck` and the agent to
+                     play it
+    :param agent: The agent which plays the decks being evolved
+    :param int population: The number of decks in each generation
+    :param int games: The number of seeds each deck plays against each deck of the gauntlet, each played twice, once
+                      with each deck going first
+    :param int elite: The number of the best decks kept unchanged in the next generation
+    :param int mutations: The most cards swapped for others when a deck is bred
+    :param int processes: The number of processes to play games with, or ``None`` for one per CPU
+    :param str checkpoint: If given, the file the search is saved to after each generation, and carried on from
+    :param int seed: The seed for the random choices of the search
+    """
+    def __init__(self, character_class, gauntlet, agent=RandomAgent, population=20, games=10, elite=2, mutations=3,
+                 processes=None, checkpoint=None, seed=None):
+        self.character_class = character_class
+        self.gauntlet = [(deck, opponent) for deck, opponent in gauntlet]
+        self.agent = agent
+        self.population_size = population
+        self.games = games
+        self.elite = elite
+        self.mutations = mutations
+        self.processes = processes
+        self.checkpoint = checkpoint
+        self.random = random.Random(seed)
+        self.pool = card_pool(character_class)
+        self._limits = dict((name, copy_limit(name)) for name in self.pool)
+        #: The number of generations evaluated so far
+        self.generation = 0
+        #: The decklists of the current generation
+        self.population = []
+        #: The fitness of every decklist played so far, by :func:`deck_hash`
+        self.fitness = {}
+        #: The number of decklists played by the last call to :meth:`run`, rather than found in the cache
+        self.evaluated = 0
+        #: The number of games played by the last call to :meth:`run` which stopped with an exception, each of which
+        #: was counted as a loss for the deck being evolved
+        self.failures = 0
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._load(checkpoint)
+
+    def _signature(self):
+        return {
+            'character_class': self.character_class,
+            'games': self.games,
+            'agent': _agent_name(self.agent),
+            'gauntlet': [deck_hash([card.ref_name for card in deck.cards], deck.hero.character_class)
+                         for deck, opponent in self.gauntlet],
+            'opponents': [_agent_name(opponent) for deck, opponent in self.gauntlet],
+        }
+
+    def random_decklist(self):
+        """
+        Create a legal decklist of random cards
+
+        :rtype: [str]
+        """
+        return self._fill([])
+
+    def _fill(self, decklist):
+        # Adds random cards to a decklist until it has 30, never going over the limit for any card
+        decklist = list(decklist)
+        while len(decklist) < 30:
+            name = self.random.choice(self.pool)
+            if decklist.count(name) < self._limits[name]:
+                decklist.append(name)
+        return decklist
+
+    def crossover(self, first, second):
+        """
+        Breed a decklist from two others, with cards chosen at random from the cards of both of them
+
+        :param [str] first: One of the decklists
+        :param [str] second: The other decklist
+        :rtype: [str]
+        """
+        cards = first + second
+        self.random.shuffle(cards)
+        decklist = []
+        for name in cards:
+            if len(decklist) == 30:
+                break
+            if decklist.count(name) < self._limits[name]:
+                decklist.append(name)
+        return self._fill(decklist)
+
+    def mutate(self, decklist):
+        """
+        Swap up to :attr:`mutations` cards of a decklist for random ones
+
+        :param [str] decklist: The decklist, which isn't changed
+        :rtype: [str]
+        """
+        decklist = list(decklist)
+        for mutation in range(self.random.randint(0, self.mutations)):
+            decklist.pop(self.random.randrange(len(decklist)))
+            decklist = self._fill(decklist)
+        return decklist
+
+    def score(self, decklist):
+        """
+        The fitness of a decklist which has been played
+
+        :param [str] decklist: The decklist
+        :rtype: float
+        """
+        return self.fitness[deck_hash(decklist, self.character_class)]
+
+    def best(self):
+        """
+        :return: The best decklist of the current generation, or ``None`` if none has been played yet
+        :rtype: [str]
+        """
+        if not self.population:
+            return None
+        return sorted(max(self.population, key=self.score))
+
+    def run(self, generations):
+        """
+        Evolve the decks for a number of generations, carrying on from where the last run, or the checkpoint, left off
+
+        :param int generations: The number of generations to evaluate
+        """
+        self.evaluated = 0
+        self.failures = 0
+        settings = ([(deck, opponent) for deck, opponent in self.gauntlet], self.agent, list(range(self.games)))
+        if self.processes == 1:
+            _start_process(settings)
+            try:
+                self._run(generations, lambda tasks: map(_fitness, tasks))
+            finally:
+                _start_process(None)
+            return
+
+        pool = multiprocessing.Pool(self.processes, _start_process, (settings,))
+        try:
+            self._run(generations, lambda tasks: pool.imap_unordered(_fitness, tasks))
+        finally:
+            pool.close()
+            pool.join()
+
+    def _run(self, generations, evaluate):
+        for generation in range(generations):
+            if self.population:
+                self.population = self._breed()
+            else:
+                self.population = [self.random_decklist() for index in range(self.population_size)]
+            tasks = {}
+            for decklist in self.population:
+                key = deck_hash(decklist, self.character_class)
+                if key not in self.fitness:
+                    tasks[key] = (decklist, self.character_class)
+            for key, fitness, errors in evaluate(list(tasks.values())):
+                self.fitness[key] = fitness
+                if errors:
+                    self.failures += len(errors)
+                    _log.warning("%d games of deck %s stopped with an exception and were counted as losses, the first "
+                                 "with %s", len(errors), key, errors[0])
+            self.evaluated += len(tasks)
+            self.generation += 1
+            if self.checkpoint is not None:
+                self._save(self.checkpoint)
+
+    def _breed(self):
+        ranked = sorted(self.population, key=self.score, reverse=True)
+        children = ranked[:self.elite]
+        while len(children) < self.population_size:
+            first, second = self._select(ranked), self._select(ranked)
+            children.append(self.mutate(self.crossover(first, second)))
+        return children
+
+    def _select(self, ranked):
+        # Tournament selection: the best of three decks chosen at random
+        return ranked[min(self.random.randrange(len(ranked)) for contender in range(3))]
+
+    def _save(self, path):
+        state = {
+            'settings': self._signature(),
+            'generation': self.generation,
+            'population': self.population,
+            'fitness': self.fitness,
+            'random': self.random.getstate(),
+        }
+        # Written to a temporary file first, so that stopping the search part way through a save can't lose it
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w") as file:
+                json.dump(state, file)
+            replace_file(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _load(self, path):
+        with open(path, "r") as file:
+            state = json.load(file)
+        if state['settings'] != self._signature():
+            raise ValueError("The checkpoint {} was made with a different class, gauntlet, agents or number of "
+                             "games".format(path))
+        self.generation = state['generation']
+        self.population = state['population']
+        self.fitness = state['fitness']
+        version, internal_state, gauss_next = state['random']
+        self.random.setstate((version, tuple(internal_state), gauss_next))
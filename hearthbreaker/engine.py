@@ -2,7 +2,8 @@ import copy
 import random
 from hearthbreaker.cards.heroes import hero_from_name
 import hearthbreaker.constants
-from hearthbreaker.game_objects import Bindable, GameException, Minion, Hero
+import hearthbreaker.state_hash
+from hearthbreaker.game_objects import Bindable, GameException, Minion, Hero, drop_replaced_methods
 import hearthbreaker.tags
 from hearthbreaker.tags.base import Effect, AuraUntil
 import hearthbreaker.targeting
@@ -10,6 +11,9 @@ import hearthbreaker.targeting
 
 card_table = {}
 
+# The methods of a game which are replaced while it is being recorded or played back
+_REPLAY_METHODS = ['random_choice', '_generate_random_between', '_start_turn', '_end_turn', 'pre_game', 'random_func']
+
 
 def __create_card_table():
     from hearthbreaker.cards.base import WeaponCard, SpellCard, MinionCard, SecretCard, ChoiceCard, HeroCard
@@ -47,16 +51,43 @@ def get_cards():
 
 
 class Game(Bindable):
-    def __init__(self, decks, agents):
+    #: The :class:`hearthbreaker.instrumentation.Counters` for this game, once it has been instrumented
+    counters = None
+    #: Where the game's random numbers come from, which is the global generator unless the game was given a seed
+    _random = random
+    #: Each deck with the generator for the order its cards are drawn in, if the game was given a seed
+    _deck_randoms = None
+
+    def __init__(self, decks, agents, seed=None):
+        """
+        :param [hearthbreaker.engine.Deck] decks: The decks of the two players
+        :param [hearthbreaker.agents.basic_agents.Agent] agents: The agents of the two players
+        :param int seed: If given, the game takes its random numbers from generators of its own, seeded with this,
+                         so that they don't depend on anything else which uses the global generator, such as the
+                         agents.  Each deck is given a generator for the order its cards are drawn in, so that each
+                         player draws the same cards no matter what else happens in the game.  Copies of the game
+                         use the global generator, so that looking ahead on them doesn't change the game's own random
+                         numbers.
+        """
         super().__init__()
+        if seed is not None:
+            self._random = random.Random(seed)
+        self._setup(decks, agents, [Player.__new__(Player), Player.__new__(Player)])
+
+    def _setup(self, decks, agents, players):
+        # The players are initialised in place, so that reset() can reuse them
         self.delayed_minions = set()
+        if self._random is not random:
+            # Kept by the game rather than the decks, since the decks belong to whoever created the game
+            self._deck_randoms = [(deck, random.Random(self._random.getrandbits(64))) for deck in decks]
         self.first_player = self._generate_random_between(0, 1)
         if self.first_player is 0:
             play_order = [0, 1]
         else:
             play_order = [1, 0]
-        self.players = [Player("one", decks[play_order[0]], agents[play_order[0]], self),
-                        Player("two", decks[play_order[1]], agents[play_order[1]], self)]
+        Player.__init__(players[play_order[0]], "one", decks[play_order[0]], agents[play_order[0]], self)
+        Player.__init__(players[play_order[1]], "two", decks[play_order[1]], agents[play_order[1]], self)
+        self.players = [players[play_order[0]], players[play_order[1]]]
         self.current_player = self.players[0]
         self.other_player = self.players[1]
         self.current_player.opponent = self.other_player
@@ -69,6 +100,79 @@ class Game(Bindable):
         self._all_cards_played = []
         self._turns_passed = 0
 
+    def reset(self, seed=None):
+        """
+        Set this game up to be played again from the beginning, with the same decks and agents.  This is much cheaper
+        than copying a game which hasn't started yet, as the players, the decks and any cards which were never drawn
+        are reused.  Cards which were drawn during the game are replaced with new ones, and everything else from the
+        last game is disposed of, as in :meth:`dispose`.
+
+        The player who goes first is chosen again, the same way as when the game was created.
+
+        :param int seed: If given, the random number generator is seeded with this before the game is set up, so that
+                         a game which is reset with a seed plays out the same as a new game created with that seed.
+                         If the game has a generator of its own, that is the one which is seeded.
+        """
+        if seed is not None:
+            self._random.seed(seed)
+        # The decks and agents in the order they were originally given in
+        if self.first_player == 0:
+            players = self.players
+        else:
+            players = [self.players[1], self.players[0]]
+        decks = [player.deck for player in players]
+        agents = [player.agent for player in players]
+        # Everything from the last game is disposed of first, so it is freed as soon as it's replaced
+        self._dispose_objects()
+        for deck in decks:
+            deck.reset()
+        self._setup(decks, agents, players)
+
+    def dispose(self):
+        """
+        Break the references which the objects in this game hold to each other, such as the players referring to
+        the game, minions to their players and the handlers bound to events to their owners.  Once this is done, the
+        game and everything in it is freed by reference counting as soon as nothing outside of it refers to it,
+        rather than waiting for the cyclic garbage collector.
+
+        The game can't be played, copied, reset or serialized afterwards.  The decks are left as they are, apart from
+        the cards which were drawn from them.
+        """
+        self._dispose_objects()
+        # The replaced methods used while recording or playing back a replay refer to the game
+        for attribute in _REPLAY_METHODS:
+            self.__dict__.pop(attribute, None)
+
+    def _dispose_objects(self):
+        for player in self.players:
+            player.dispose()
+        for card in self._all_cards_played:
+            card.dispose()
+        for minion in self.delayed_minions:
+            minion.dispose()
+        Bindable.__init__(self)
+        self.players = []
+        self.current_player = None
+        self.other_player = None
+        self.delayed_minions = set()
+        self.last_card = None
+        self._all_cards_played = []
+
+    def instrument(self):
+        """
+        Start counting the events triggered, stats calculated, copies made and so on in this game, and in any copies
+        of it.  Resetting the game keeps the counts, so they can be gathered over many games.
+        See :mod:`hearthbreaker.instrumentation`
+
+        :return: The counters for this game, which are also available as :attr:`counters`
+        :rtype: hearthbreaker.instrumentation.Counters
+        """
+        import hearthbreaker.instrumentation
+        if self.counters is None:
+            self.counters = hearthbreaker.instrumentation.Counters()
+        hearthbreaker.instrumentation.install()
+        return self.counters
+
     def random_draw(self, cards, requirement):
         filtered_cards = [card for card in filter(requirement, cards)]
         if len(filtered_cards) > 0:
@@ -82,7 +186,20 @@ class Game(Bindable):
         return self._generate_random_between(minimum, maximum)
 
     def _generate_random_between(self, lowest, highest):
-        return random.randint(lowest, highest)
+        return self._random.randint(lowest, highest)
+
+    def deck_random(self, deck):
+        """
+        :param Deck deck: One of the decks in this game
+        :return: The generator for the order the deck's cards are drawn in, or ``None`` if they are drawn using the
+                 game's random numbers
+        :rtype: random.Random
+        """
+        if self._deck_randoms is not None:
+            for owner, generator in self._deck_randoms:
+                if owner is deck:
+                    return generator
+        return None
 
     def check_delayed(self):
         sorted_minions = sorted(self.delayed_minions, key=lambda m: m.born)
@@ -129,6 +246,17 @@ class Game(Bindable):
         coin.player = self.players[1]
         self.players[1].hand.append(coin)
 
+    def run(self):
+        """
+        Play this game as a generator, which yields each decision the game needs instead of asking the players'
+        agents, and is sent the answer to it.  The agents are put back once the game is over, or the generator is
+        closed.  See :mod:`hearthbreaker.decisions`
+
+        :return: A generator of :class:`hearthbreaker.decisions.Decision` objects
+        """
+        import hearthbreaker.decisions
+        return hearthbreaker.decisions.run(self)
+
     def start(self):
         self.pre_game()
         self.current_player = self.players[1]
@@ -205,8 +333,13 @@ class Game(Bindable):
 
     def copy(self):
         copied_game = copy.copy(self)
+        drop_replaced_methods(copied_game)
         copied_game.events = {}
         copied_game._all_cards_played = []
+        # The minions waiting on delayed events belong to this game, so the copy mustn't share the set of them
+        copied_game.delayed_minions = set()
+        copied_game.__dict__.pop('_random', None)
+        copied_game.__dict__.pop('_deck_randoms', None)
         copied_game.players = [player.copy(copied_game) for player in self.players]
         if self.current_player is self.players[0]:
             copied_game.current_player = copied_game.players[0]
@@ -218,17 +351,57 @@ class Game(Bindable):
         copied_game.current_player.opponent = copied_game.other_player
         copied_game.other_player.opponent = copied_game.current_player
         copied_game._has_turn_ended = self._has_turn_ended
+        copied_game._attach_board()
+        return copied_game
 
-        for player in copied_game.players:
+    def _attach_board(self):
+        # Binds the characters of a game which has been copied or unpickled, once each player's hand, effects and
+        # auras have been bound (see Player._bind).  Only the secrets of the player whose turn it isn't are active.
+        for player in self.players:
             player.hero.attach(player.hero, player)
             if player.hero.weapon:
                 player.hero.weapon.attach(player.hero, player)
             for minion in player.minions:
                 minion.attach(minion, player)
 
-        for secret in copied_game.other_player.secrets:
-            secret.activate(copied_game.other_player)
-        return copied_game
+        for secret in self.other_player.secrets:
+            secret.activate(self.other_player)
+
+    def state_hash(self, ordered_board=True):
+        """
+        Compute a 64 bit hash of the current state of this game, which is the same for any two games in the same
+        state, no matter which moves led to it.  See :mod:`hearthbreaker.state_hash`
+
+        :param bool ordered_board: If True, the order of the minions on the board is significant
+        :rtype: int
+        """
+        return hearthbreaker.state_hash.state_hash(self, ordered_board)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        # Event bindings are rebuilt when the game is unpickled, and the methods which are replaced when a game is
+        # being recorded or played back only make sense for that replay
+        state['events'] = {}
+        state['_all_cards_played'] = []
+        for attribute in _REPLAY_METHODS:
+            state.pop(attribute, None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore a game which has been unpickled.  The players and everything they own have been restored without
+        any of their bindings, so they are attached again in the same order as :meth:`copy` uses.  The players will
+        not have agents, so these must be set before the game can be played.
+        """
+        self.__dict__.update(state)
+        for player in self.players:
+            effects = player.effects
+            auras = player.player_auras + player.object_auras
+            player.effects = []
+            player.player_auras = []
+            player.object_auras = []
+            player._bind(effects, auras)
+        self._attach_board()
 
     def play_card(self, card):
         if self.game_ended:
@@ -356,6 +529,18 @@ class Player(Bindable):
     def __str__(self):  # pragma: no cover
         return "Player: " + self.name
 
+    @property
+    def hand(self):
+        """
+        The cards in this player's hand, as a :class:`Hand`.  Any list assigned to this is copied into a new
+        :class:`Hand`.
+        """
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        self._hand = Hand(cards)
+
     def copy(self, new_game):
         copied_player = Player(self.name, self.deck.copy(), self.agent, new_game)
 
@@ -363,34 +548,84 @@ class Player(Bindable):
         copied_player.graveyard = copy.copy(self.graveyard)
         copied_player.minions = [minion.copy(copied_player, new_game) for minion in self.minions]
         copied_player.hand = [copy.copy(card) for card in self.hand]
-        for card in copied_player.hand:
-            card._attached = False
-            card.attach(card, copied_player)
-        copied_player.spell_damage = self.spell_damage
         copied_player.mana = self.mana
         copied_player.max_mana = self.max_mana
         copied_player.upcoming_overload = self.upcoming_overload
         copied_player.current_overload = self.current_overload
+        copied_player.cards_played = self.cards_played
+        copied_player.fatigue = self.fatigue
         copied_player.dead_this_turn = copy.copy(self.dead_this_turn)
-        for effect in self.effects:
-            effect = copy.copy(effect)
-            copied_player.add_effect(effect)
-        copied_player.secrets = []
-        for secret in self.secrets:
-            new_secret = type(secret)()
-            new_secret.player = copied_player
-            copied_player.secrets.append(new_secret)
-        for aura in filter(lambda a: isinstance(a, AuraUntil), self.player_auras):
-            aura = copy.deepcopy(aura)
-            aura.owner = copied_player.hero
-            copied_player.add_aura(aura)
-        for aura in filter(lambda a: isinstance(a, AuraUntil), self.object_auras):
-            aura = copy.deepcopy(aura)
-            aura.owner = copied_player.hero
-            copied_player.add_aura(aura)
+        copied_player.secrets = [type(secret)() for secret in self.secrets]
+        # Deep copies, so that the copy's effects and auras aren't bound through the same events as this player's
+        effects = [copy.deepcopy(effect) for effect in self.effects]
+        auras = [copy.deepcopy(aura) for aura in self.player_auras + self.object_auras if isinstance(aura, AuraUntil)]
+        copied_player._bind(effects, auras)
         copied_player.effect_count = dict()
         return copied_player
 
+    def _bind(self, effects, auras):
+        # Attaches the cards in the hand of a player which has been copied or unpickled, and adds its effects and
+        # auras, none of which are bound to anything yet.  The board is attached afterwards, by Game._attach_board.
+        for card in self.hand:
+            card._attached = False
+            card.attach(card, self)
+        for secret in self.secrets:
+            secret.player = self
+        for effect in effects:
+            self.add_effect(effect)
+        for aura in auras:
+            aura.owner = self.hero
+            self.add_aura(aura)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        # The agent is set by whoever unpickles the game.  The effects and auras are kept, but are applied again by
+        # the game once it has been unpickled, so the amounts they contribute start from their defaults.
+        state['events'] = {}
+        state['agent'] = None
+        state['spell_damage'] = 0
+        state['spell_multiplier'] = 1
+        state['heal_multiplier'] = 1
+        state['heal_does_damage'] = 0
+        state['double_deathrattle'] = 0
+        state['player_auras'] = [aura for aura in self.player_auras if isinstance(aura, AuraUntil)]
+        state['object_auras'] = [aura for aura in self.object_auras if isinstance(aura, AuraUntil)]
+        return state
+
+    def dispose(self):
+        """
+        Break the references between this player, the game and everything the player owns.
+
+        :see: :meth:`Game.dispose`
+        """
+        for minion in self.minions:
+            minion.dispose()
+        # A copied player's list of the minions which died this turn holds the original player's minions
+        for minion in self.dead_this_turn:
+            if minion.player is self:
+                minion.dispose()
+        self.hero.dispose()
+        for card in self.hand + self.secrets:
+            card.dispose()
+        for card in self.deck.cards:
+            if card.player is not None:
+                card.dispose()
+        for effect in self.effects:
+            effect.dispose()
+        Bindable.__init__(self)
+        self.minions = []
+        self.hand = []
+        self.secrets = []
+        self.effects = []
+        self.player_auras = []
+        self.object_auras = []
+        self.dead_this_turn = []
+        self.game = None
+        self.opponent = None
+        self.agent = None
+        # Tags on the cards in the deck can still refer to this player, through the cards they create
+        self.deck = None
+
     def draw(self):
         if self.can_draw():
             card = self.deck.draw(self.game)
@@ -524,7 +759,79 @@ class Player(Bindable):
         return player
 
 
+class Hand(list):
+    """
+    The cards in a player's hand.  This is a list which keeps the sum of the
+    :func:`keys <hearthbreaker.state_hash.card_key>` of the cards in it up to date as they are added and removed, for
+    :func:`hearthbreaker.state_hash.state_hash`.
+    """
+
+    def __init__(self, cards=()):
+        super().__init__(cards)
+        self.key = sum(hearthbreaker.state_hash.card_key("hand", card) for card in self)
+
+    def __reduce__(self):
+        # The cards may not have been rebuilt yet when this is copied or unpickled, so the key is stored, rather than
+        # being worked out again
+        return _restore_hand, (list(self), self.key)
+
+    def _added(self, card):
+        self.key += hearthbreaker.state_hash.card_key("hand", card)
+
+    def _removed(self, card):
+        self.key -= hearthbreaker.state_hash.card_key("hand", card)
+
+    def append(self, card):
+        super().append(card)
+        self._added(card)
+
+    def insert(self, index, card):
+        super().insert(index, card)
+        self._added(card)
+
+    def extend(self, cards):
+        for card in cards:
+            self.append(card)
+
+    def remove(self, card):
+        super().remove(card)
+        self._removed(card)
+
+    def pop(self, index=-1):
+        card = super().pop(index)
+        self._removed(card)
+        return card
+
+    def clear(self):
+        # list.clear() is new in Python 3.3
+        super().__delitem__(slice(None))
+        self.key = 0
+
+    def __setitem__(self, index, cards):
+        super().__setitem__(index, cards)
+        self.key = sum(hearthbreaker.state_hash.card_key("hand", card) for card in self)
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.key = sum(hearthbreaker.state_hash.card_key("hand", card) for card in self)
+
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+
+
+def _restore_hand(cards, key):
+    hand = Hand()
+    list.extend(hand, cards)
+    hand.key = key
+    return hand
+
+
 class Deck:
+    # The sum of the keys of the cards which are still in the deck, worked out the first time it is needed and then
+    # kept up to date as cards are drawn and put back.  See key()
+    _key = None
+
     def __init__(self, cards, hero):
         if len(cards) != 30:
             raise GameException("Deck must have exactly 30 cards in it")
@@ -543,18 +850,60 @@ class Deck:
         new_deck.cards = [copy_card(card) for card in self.cards]
         new_deck.hero = self.hero
         new_deck.left = self.left
+        new_deck._key = self._key
         return new_deck
 
+    def __reduce__(self):
+        # Like copy(), this always produces a plain Deck
+        return Deck.__new__, (Deck,), {'cards': self.cards, 'hero': self.hero, 'left': self.left}
+
+    def reset(self):
+        """
+        Put every card back into this deck, ready for a new game.  Cards which have been drawn may have been changed
+        during the game, so they are replaced with new ones, and any cards which were added to the deck are removed.
+        """
+        self.cards = [card if not card.drawn and card.player is None else type(card)() for card in self.cards[:30]]
+        for card in self.cards:
+            card.drawn = False
+        self.left = 30
+        self.__dict__.pop('_key', None)
+
+    def key(self):
+        """
+        Get the sum of the :func:`keys <hearthbreaker.state_hash.card_key>` of the cards which are still in this deck,
+        for :func:`hearthbreaker.state_hash.state_hash`
+
+        :rtype: int
+        """
+        if self._key is None:
+            self._key = sum(hearthbreaker.state_hash.card_key("deck", card) for card in self.cards if not card.drawn)
+        return self._key
+
     def can_draw(self):
         return self.left > 0
 
     def draw(self, game):
         if not self.can_draw():
             raise GameException("Cannot draw more than 30 cards")
-        card = game.random_draw(self.cards, lambda c: not c.drawn)
+        deck_random = game.deck_random(self)
+        if deck_random is None:
+            card = game.random_draw(self.cards, lambda c: not c.drawn)
+        else:
+            cards = [card for card in self.cards if not card.drawn]
+            card = cards[deck_random.randint(0, len(cards) - 1)]
+        self.take(card)
+        return card
+
+    def take(self, card):
+        """
+        Take a card out of this deck, other than by drawing it at random
+
+        :param hearthbreaker.cards.base.Card card: The card to take, which must still be in the deck
+        """
         card.drawn = True
         self.left -= 1
-        return card
+        if self._key is not None:
+            self._key -= hearthbreaker.state_hash.card_key("deck", card)
 
     def put_back(self, card):
         if not card:
@@ -565,10 +914,16 @@ class Deck:
                     raise GameException("Tried to put back a card that hadn't been used yet")
                 deck_card.drawn = False
                 self.left += 1
+                self._put_back(deck_card)
                 return
         card.drawn = False
         self.cards.append(card)
         self.left += 1
+        self._put_back(card)
+
+    def _put_back(self, card):
+        if self._key is not None:
+            self._key += hearthbreaker.state_hash.card_key("deck", card)
 
     def __to_json__(self):
         card_list = []
@@ -0,0 +1,134 @@
+import math
+import random
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.engine import Game
+
+__doc__ = """
+Compares two versions of an agent using common random numbers, so that far fewer games are needed to tell them apart.
+
+Most of the difference between the results of two games comes from the cards each player draws and the way random
+effects fall, rather than from the agents.  :func:`compare_agents` plays both agents against the same opponent with
+the same seeds, so that for each seed, both of them get the same deck orders, the same mulligans and, until their moves
+differ, the same random effects.  Each seed is played twice for each agent, once from each seat, so that neither agent
+is favoured by the seat or deck it was given.  The difference between the agents' results is taken seed by seed, and
+most of the luck cancels out::
+
+    comparison = compare_agents(decks, NewAgent, OldAgent, seeds=range(200))
+    print(comparison.difference, comparison.interval())
+
+Each game takes its random numbers from a generator of its own (see :class:`hearthbreaker.engine.Game`), and the
+global generator is seeded too before each game, for agents which use it.
+"""
+
+
+def play_seeded(decks, agents, seed):
+    """
+    Play a game with a seed, so that it plays out the same each time the same agents play it
+
+    :param [hearthbreaker.engine.Deck] decks: The decks of the two players, which are copied, so aren't changed
+    :param [hearthbreaker.agents.basic_agents.Agent] agents: The agents of the two players
+    :param int seed: The seed for the game's random numbers, and for the global generator
+    :return: The result of the game for the first agent: 1 if it won, 0 if it lost and 0.5 for a draw
+    :rtype: float
+    """
+    random.seed(seed)
+    game = Game([deck.copy() for deck in decks], agents, seed)
+    try:
+        game.start()
+        if game.first_player == 0:
+            player, opponent = game.players
+        else:
+            opponent, player = game.players
+        if player.hero.dead and opponent.hero.dead:
+            return 0.5
+        if opponent.hero.dead:
+            return 1.0
+        return 0.0
+    finally:
+        game.dispose()
+
+
+def _variance(values):
+    if len(values) < 2:
+        return float("inf")
+    mean = sum(values) / len(values)
+    return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+
+class Comparison:
+    """
+    The results of comparing two agents over a number of seeds
+
+    :param [int] seeds: The seeds the agents played
+    :param [float] scores_a: The result of the first agent for each seed, from 0 to 1
+    :param [float] scores_b: The result of the second agent for each seed
+    """
+    def __init__(self, seeds, scores_a, scores_b):
+        self.seeds = seeds
+        self.scores_a = scores_a
+        self.scores_b = scores_b
+        #: The difference between the agents' results for each seed
+        self.differences = [a - b for a, b in zip(scores_a, scores_b)]
+        #: The mean difference between the agents' win rates.  Positive if the first agent did better.
+        self.difference = sum(self.differences) / len(self.differences) if self.differences else 0.0
+
+    @property
+    def standard_error(self):
+        """
+        The standard error of :attr:`difference`, using the pairing of the results by seed
+        """
+        return math.sqrt(_variance(self.differences) / len(self.differences)) if self.differences else float("inf")
+
+    @property
+    def unpaired_standard_error(self):
+        """
+        The standard error :attr:`difference` would have if the agents had played different seeds
+        """
+        if not self.differences:
+            return float("inf")
+        return math.sqrt((_variance(self.scores_a) + _variance(self.scores_b)) / len(self.differences))
+
+    @property
+    def efficiency(self):
+        """
+        How many times as many games would be needed without common random numbers to get an interval as narrow
+        """
+        paired = self.standard_error
+        if paired == 0:
+            return float("inf")
+        return (self.unpaired_standard_error / paired) ** 2
+
+    def interval(self, z=1.96):
+        """
+        The confidence interval of :attr:`difference`
+
+        :param float z: The number of standard errors on each side of the difference.  1.96 gives a 95% interval.
+        :return: The lowest and highest difference in the interval
+        :rtype: (float, float)
+        """
+        margin = z * self.standard_error
+        return self.difference - margin, self.difference + margin
+
+
+def compare_agents(decks, agent_a, agent_b, opponent=RandomAgent, seeds=range(100)):
+    """
+    Compare two agents by playing each of them against the same opponent, with common random numbers and mirrored
+    seats.  For each seed, each agent plays two games: one with the first deck and seat, and one with the second.
+
+    :param [hearthbreaker.engine.Deck] decks: The two decks to play with, which aren't changed
+    :param agent_a: The class of the first agent, or a function which creates one
+    :param agent_b: The class of the second agent, or a function which creates one
+    :param opponent: The class of the agent they both play against, or a function which creates one
+    :param seeds: The seeds to play
+    :rtype: Comparison
+    """
+    seeds = list(seeds)
+    scores = []
+    for agent in (agent_a, agent_b):
+        agent_scores = []
+        for seed in seeds:
+            first_seat = play_seeded(decks, [agent(), opponent()], seed)
+            second_seat = 1 - play_seeded(decks, [opponent(), agent()], seed)
+            agent_scores.append((first_seat + second_seat) / 2)
+        scores.append(agent_scores)
+    return Comparison(seeds, scores[0], scores[1])
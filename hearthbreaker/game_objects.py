@@ -20,6 +20,68 @@ class GameException(Exception):
         super().__init__(message)
 
 
+class _NoEvents(dict):
+    """
+    The events of an object which nothing has been bound to yet.  A single instance is shared between all such
+    objects, and :meth:`Bindable.bind` replaces it with a dict of the object's own.
+    """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Events can only be added with bind or bind_once")
+
+    __setitem__ = __delitem__ = setdefault = update = pop = popitem = clear = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return _no_events, ()
+
+
+def _no_events():
+    return NO_EVENTS
+
+
+NO_EVENTS = _NoEvents()
+
+_slot_names = {}
+
+
+def _get_slot_names(cls):
+    names = _slot_names.get(cls)
+    if names is None:
+        names = [name for klass in cls.__mro__ for name in klass.__dict__.get("__slots__", ())
+                 if name not in ("__dict__", "__weakref__")]
+        _slot_names[cls] = names
+    return names
+
+
+def _get_attributes(obj):
+    # Game objects keep most of their attributes in slots, and anything else in their __dict__
+    attributes = {name: getattr(obj, name) for name in _get_slot_names(type(obj)) if hasattr(obj, name)}
+    if hasattr(obj, "__dict__"):
+        attributes.update(obj.__dict__)
+    return attributes
+
+
+def _set_attributes(obj, attributes):
+    for name, value in attributes.items():
+        setattr(obj, name, value)
+
+
+def drop_replaced_methods(obj):
+    """
+    Remove the methods which have been replaced on a copy of an object, such as by a replay or by an agent server,
+    as they only apply to the object they were replaced on.
+
+    :param obj: The copy
+    """
+    for name in [name for name in vars(obj) if callable(getattr(type(obj), name, None))]:
+        delattr(obj, name)
+
+
 class Bindable:
     """
     A class which inherits from Bindable has an event structure added to it.
@@ -77,7 +139,8 @@ class Bindable:
         """
         Set up a new :class:`Bindable`.  Must be called by any subclasses.
         """
-        self.events = {}
+        # Most objects never have anything bound to them, so they all share the same empty events until they do
+        self.events = NO_EVENTS
 
     def bind(self, event, function):
         """
@@ -89,6 +152,8 @@ class Bindable:
         :see: :class:`Bindable`
         """
 
+        if self.events is NO_EVENTS:
+            self.events = {}
         if event not in self.events:
             self.events[event] = []
 
@@ -105,6 +170,8 @@ class Bindable:
         :see: :class:`Bindable`
         """
 
+        if self.events is NO_EVENTS:
+            self.events = {}
         if event not in self.events:
             self.events[event] = []
 
@@ -143,12 +210,26 @@ class Bindable:
             if len(self.events[event]) is 0:
                 del (self.events[event])
 
+    def __copy__(self):
+        new = type(self).__new__(type(self))
+        _set_attributes(new, _get_attributes(self))
+        return new
+
+    def __deepcopy__(self, memo):
+        # Copying keeps every attribute, including the bindings.  The pickling methods of subclasses only keep what
+        # can't be rebuilt by attaching the object again, so they aren't used for copying.
+        new = type(self).__new__(type(self))
+        memo[id(self)] = new
+        _set_attributes(new, copy.deepcopy(_get_attributes(self), memo))
+        return new
+
 
 class GameObject:
     """
     Provides typing for the various game objects in the engine.  Allows for checking the type of an object without
     needing to know about and import the various objects in the game engine
     """
+
     def __init__(self, effects=None, auras=None, buffs=None):
         # A list of the effects that this player has
         if effects:
@@ -345,6 +426,23 @@ class GameObject:
             self.buffs = []
             self._attached = False
 
+    def dispose(self):
+        """
+        Drop this object's references to its tags, to the handlers bound to it and to the player it belongs to.  These
+        all lead back to this object, so without this it can only be freed by the cyclic garbage collector.  Like
+        :meth:`unattach`, this leaves the object without any of its tags.
+
+        :see: :meth:`hearthbreaker.engine.Game.dispose`
+        """
+        for effect in self.effects:
+            effect.dispose()
+        self.effects = []
+        self.auras = []
+        self.buffs = []
+        self._attached = False
+        self.events = NO_EVENTS
+        self.player = None
+
 
 class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
     """
@@ -352,6 +450,12 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
 
      This common superclass handles all of the status tags and calculations involved in attacking or being attacked.
     """
+    # Characters are copied many times over when searching through games, so their attributes are kept in slots.
+    # Anything not listed here still goes in the __dict__, which is only created when something is put in it.
+    __slots__ = ('events', 'effects', 'auras', 'buffs', 'player', '_attached', 'health', 'base_health', 'base_attack',
+                 'attacks_performed', 'dead', 'used_windfury', 'frozen', 'immune', 'delayed', 'stealth',
+                 'divine_shield', 'enraged', 'removed', 'born', 'health_delta', 'enrage', 'current_target',
+                 'exhausted')
 
     def __init__(self, attack_power, health, enrage=None, effects=None, auras=None, buffs=None):
         """
@@ -732,12 +836,28 @@ class Character(Bindable, GameObject, metaclass=abc.ABCMeta):
         for aura in self.enrage:
             self.remove_aura(aura)
 
+    def unattach(self):
+        super().unattach()
+        # The enrage auras are given this character as their owner again each time it becomes enraged
+        for aura in self.enrage:
+            aura.owner = None
+
+    def dispose(self):
+        super().dispose()
+        self.delayed = []
+        self.enrage = []
+        self.current_target = None
+        # Methods replaced on this character by its tags refer back to it
+        self.__dict__.clear()
+
 
 class Weapon(Bindable, GameObject):
     """
     Represents a Hearthstone weapon.  All weapons have attack power and durability.  The logic for handling the
     attacks is handled by :class:`Hero`, but it can be modified through the use of events.
     """
+    __slots__ = ('events', 'effects', 'auras', 'buffs', 'player', '_attached', 'base_attack', 'durability',
+                 'deathrattle', 'card')
 
     def __init__(self, attack_power, durability, deathrattle=None,
                  effects=None, auras=None, buffs=None):
@@ -768,6 +888,23 @@ class Weapon(Bindable, GameObject):
         new_weapon.player = new_owner
         return new_weapon
 
+    def __getstate__(self):
+        return {
+            'base_attack': self.base_attack,
+            'durability': self.durability,
+            'deathrattle': self.deathrattle,
+            'effects': self.effects,
+            'auras': self.auras,
+            'buffs': self.buffs,
+            'player': self.player,
+            'card': self.card,
+        }
+
+    def __setstate__(self, state):
+        # The weapon is attached again by the game it belongs to once the whole game has been unpickled
+        Weapon.__init__(self, 0, 0)
+        _set_attributes(self, state)
+
     def destroy(self):
         self.trigger("destroyed")
         # Deathrattle is triggered no matter how the weapon is destroyed, see
@@ -802,6 +939,12 @@ class Weapon(Bindable, GameObject):
         })
         return parent_json
 
+    def dispose(self):
+        super().dispose()
+        if self.card is not None:
+            self.card.dispose()
+        self.deathrattle = None
+
     @staticmethod
     def is_weapon():
         return True
@@ -819,6 +962,8 @@ class Weapon(Bindable, GameObject):
 
 
 class Minion(Character):
+    __slots__ = ('game', 'card', 'index', 'taunt', 'replaced_by', 'can_be_targeted_by_spells', 'deathrattle')
+
     def __init__(self, attack, health,
                  deathrattle=None, taunt=False, charge=False, spell_damage=0, divine_shield=False, stealth=False,
                  windfury=False, spell_targetable=True, effects=None, auras=None, buffs=None,
@@ -986,6 +1131,14 @@ class Minion(Character):
         self.battlecry = None
         self.deathrattle = []
 
+    def dispose(self):
+        super().dispose()
+        if self.card is not None:
+            self.card.dispose()
+        self.deathrattle = []
+        self.replaced_by = None
+        self.game = None
+
     def can_attack(self):
         return (self.charge() or not self.exhausted) and super().can_attack()
 
@@ -1026,6 +1179,32 @@ class Minion(Character):
 
         return new_minion
 
+    def __getstate__(self):
+        # Only the state which copy() keeps is pickled, including a new card.  Everything that comes from this
+        # minion's tags, or from auras on other objects, is rebuilt when the game attaches the minion again.
+        return {
+            'base_attack': self.base_attack,
+            'base_health': self.base_health,
+            'health': self.base_health - (self.calculate_max_health() - self.health),
+            'enraged': self.enraged,
+            'index': self.index,
+            'attacks_performed': self.attacks_performed,
+            'exhausted': self.exhausted,
+            'born': self.born,
+            'effects': self.effects,
+            'auras': self.auras,
+            'buffs': self.buffs,
+            'deathrattle': self.deathrattle,
+            'enrage': self.enrage,
+            'card': type(self.card)(),
+            'player': self.player,
+            'game': self.game,
+        }
+
+    def __setstate__(self, state):
+        Minion.__init__(self, 0, 0)
+        _set_attributes(self, state)
+
     @staticmethod
     def __from_json__(md, player, game):
         from hearthbreaker.engine import card_lookup
@@ -1080,6 +1259,8 @@ class Minion(Character):
 
 
 class Hero(Character):
+    __slots__ = ('armor', 'weapon', 'character_class', 'game', 'power', 'card', 'power_targets_minions')
+
     def __init__(self, health, character_class, power, player):
         super().__init__(0, health)
         self.armor = 0
@@ -1106,7 +1287,9 @@ class Hero(Character):
         return super().calculate_stat(stat_class, starting_value)
 
     def copy(self, new_owner):
-        new_hero = Hero(self.base_health, self.character_class, self.power, new_owner)
+        power = copy.copy(self.power)
+        drop_replaced_methods(power)
+        new_hero = Hero(self.base_health, self.character_class, power, new_owner)
         if self.weapon:
             new_hero.weapon = self.weapon.copy(new_owner)
         new_hero.health = self.health
@@ -1121,6 +1304,35 @@ class Hero(Character):
 
         return new_hero
 
+    def __getstate__(self):
+        # As with minions, only the state which copy() keeps is pickled.  The power is given back to this hero when
+        # it is unpickled.
+        power = copy.copy(self.power)
+        power.hero = None
+        return {
+            'base_attack': self.base_attack,
+            'base_health': self.base_health,
+            'health': self.health,
+            'armor': self.armor,
+            'attacks_performed': self.attacks_performed,
+            'character_class': self.character_class,
+            'power': power,
+            'weapon': self.weapon,
+            'effects': self.effects,
+            'auras': self.auras,
+            'buffs': self.buffs,
+            'card': type(self.card)(),
+            'player': self.player,
+            'game': self.game,
+        }
+
+    def __setstate__(self, state):
+        # The player isn't fully restored yet, so Hero.__init__ can't be used here
+        Character.__init__(self, 0, 0)
+        self.power_targets_minions = False
+        _set_attributes(self, state)
+        self.power.hero = self
+
     def attack(self):
         super().attack()
         if self.weapon is not None:
@@ -1137,6 +1349,13 @@ class Hero(Character):
         elif issubclass(type(attacker), Character):
             attacker.trigger("did_damage", self, 0)
 
+    def dispose(self):
+        super().dispose()
+        if self.weapon is not None:
+            self.weapon.dispose()
+            self.weapon = None
+        self.game = None
+
     def increase_armor(self, amount):
         self.player.trigger("armor_increased", amount)
         self.armor += amount
@@ -1188,6 +1407,7 @@ class Hero(Character):
             'immune': self.immune,
             'used_windfury': self.used_windfury,
             'attacks_performed': self.attacks_performed,
+            'power_used': self.power.used,
         })
         return r_val
 
@@ -1201,7 +1421,8 @@ class Hero(Character):
         hero.armor = hd["armor"]
         hero.immune = hd["immune"]
         hero.used_windfury = hd["used_windfury"]
-        hero.attacks_performed = not hd["attacks_performed"]
+        hero.attacks_performed = hd["attacks_performed"]
+        hero.power.used = hd.get("power_used", False)
         if hd['weapon']:
             hero.weapon = Weapon.__from_json__(hd["weapon"], player)
         return hero
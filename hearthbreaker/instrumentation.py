@@ -0,0 +1,149 @@
+import collections
+import functools
+import time
+from hearthbreaker.engine import Game
+from hearthbreaker.game_objects import Bindable, GameObject
+from hearthbreaker.tags.base import Tag
+
+__doc__ = """
+Counters for the work the engine does while games are played, to show which events, stats and cards a simulation
+spends its time on.
+
+Instrumentation is turned on for a game with :meth:`Game.instrument <hearthbreaker.engine.Game.instrument>`, which
+returns the :class:`Counters` for that game.  Copies of an instrumented game share its counters, so the work done by an
+agent searching through copies of a game is counted along with the game itself.
+
+The counting is done by replacing a handful of methods with versions which count each call, and then call the original
+method.  These are only installed the first time a game is instrumented, so games cost nothing extra until then, and
+:func:`uninstall` puts the original methods back.
+"""
+
+
+class Counters:
+    """
+    The number of times each of the instrumented parts of the engine was used in a game
+    """
+    def __init__(self):
+        #: The number of times each event was triggered, by event name
+        self.events = collections.Counter()
+        #: The number of times each stat was calculated, by the name of the status class
+        self.stats = collections.Counter()
+        #: The number of tags deep copied, by the name of the tag class
+        self.tag_copies = collections.Counter()
+        #: The number of times the game was copied
+        self.copies = 0
+        #: The total time spent copying the game, in seconds
+        self.copy_time = 0.0
+        #: The number of times the delayed events of minions were checked
+        self.delayed_checks = 0
+
+    def summary(self, limit=10):
+        """
+        Describe these counters, with the most common events, stats and tag copies first
+
+        :param int limit: How many of the most common events, stats and tags to list
+        :rtype: str
+        """
+        lines = ["{} copies ({:.3f}s), {} delayed checks".format(self.copies, self.copy_time, self.delayed_checks)]
+        for title, counter in [("Events", self.events), ("Stats", self.stats), ("Tag copies", self.tag_copies)]:
+            lines.append("{}: {}".format(title, sum(counter.values())))
+            for name, count in counter.most_common(limit):
+                lines.append("  {:<30} {}".format(name, count))
+        return "\n".join(lines)
+
+
+def _counters_of(obj):
+    # Games hold their counters, players, minions and heroes refer to their game, and cards and weapons to their player
+    counters = getattr(obj, "counters", None)
+    if counters is None:
+        game = getattr(obj, "game", None)
+        if game is None:
+            game = getattr(getattr(obj, "player", None), "game", None)
+        counters = getattr(game, "counters", None)
+    return counters
+
+
+def _count_trigger(trigger):
+    @functools.wraps(trigger)
+    def counted(self, event, *args):
+        counters = _counters_of(self)
+        if counters is not None:
+            counters.events[event] += 1
+        return trigger(self, event, *args)
+    return counted
+
+
+def _count_calculate_stat(calculate_stat):
+    @functools.wraps(calculate_stat)
+    def counted(self, stat_class, starting_value=0):
+        counters = _counters_of(self)
+        if counters is not None:
+            counters.stats[stat_class.__name__] += 1
+        return calculate_stat(self, stat_class, starting_value)
+    return counted
+
+
+def _count_deepcopy(deepcopy):
+    @functools.wraps(deepcopy)
+    def counted(self, memo):
+        counters = _counters_of(getattr(self, "owner", None))
+        if counters is not None:
+            counters.tag_copies[type(self).__name__] += 1
+        return deepcopy(self, memo)
+    return counted
+
+
+def _count_copy(copy):
+    @functools.wraps(copy)
+    def counted(self):
+        counters = self.counters
+        if counters is None:
+            return copy(self)
+        start = time.perf_counter()
+        copied_game = copy(self)
+        counters.copy_time += time.perf_counter() - start
+        counters.copies += 1
+        return copied_game
+    return counted
+
+
+def _count_check_delayed(check_delayed):
+    @functools.wraps(check_delayed)
+    def counted(self):
+        if self.counters is not None:
+            self.counters.delayed_checks += 1
+        return check_delayed(self)
+    return counted
+
+
+_instrumented = [
+    (Bindable, "trigger", _count_trigger),
+    (GameObject, "calculate_stat", _count_calculate_stat),
+    (Tag, "__deepcopy__", _count_deepcopy),
+    (Game, "copy", _count_copy),
+    (Game, "check_delayed", _count_check_delayed),
+]
+
+_originals = {}
+
+
+def install():
+    """
+    Replace the instrumented methods with counting versions, if they haven't been already.  This is done by
+    :meth:`Game.instrument <hearthbreaker.engine.Game.instrument>`, so it is rarely needed directly.
+    """
+    if _originals:
+        return
+    for cls, name, wrap in _instrumented:
+        original = cls.__dict__[name]
+        _originals[cls, name] = original
+        setattr(cls, name, wrap(original))
+
+
+def uninstall():
+    """
+    Put back the original methods, so that nothing is counted any more, even for games which have been instrumented
+    """
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
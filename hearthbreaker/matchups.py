@@ -0,0 +1,241 @@
+import math
+import multiprocessing
+from hearthbreaker.evaluation import play_seeded
+
+__doc__ = """
+Plays decks against each other until the result of each matchup is clear, rather than for a fixed number of games.
+
+:class:`MatchupRunner` plays each deck against each deck of a gauntlet.  After every batch of games, each matchup is
+checked with a sequential probability ratio test, which stops playing it as soon as there is enough evidence to say
+whether the deck is favoured (wins more than half its games by at least a margin) or not, with the error rates asked
+for.  A matchup which is lopsided is decided within a few dozen games, so most of the games are spent on the close
+matchups.  Each batch is given to the matchups whose win rates are the least certain, and is played across a pool of
+processes.
+
+Each game is played twice with the same seed (see :func:`hearthbreaker.evaluation.play_seeded`), once with each deck
+going first, so the luck of going first cancels out::
+
+    runner = MatchupRunner([(zoo, TradeAgent)], [(mage, TradeAgent), (hunter, TradeAgent)])
+    matrix = runner.run()
+    print(matrix[0][1].win_rate, matrix[0][1].favoured)
+
+The agents must be classes, or other functions which can be pickled, so that they can be sent to the processes.
+"""
+
+# The decks and agents each process plays with, set once when its pool is started
+_entries = None
+
+
+def _start_process(entries):
+    global _entries
+    _entries = entries
+
+
+def _play(task):
+    row, column, seed = task
+    players, opponents = _entries
+    (deck, agent), (opponent_deck, opponent) = players[row], opponents[column]
+    first = play_seeded([deck, opponent_deck], [agent(), opponent()], seed)
+    second = 1 - play_seeded([opponent_deck, deck], [opponent(), agent()], seed)
+    return row, column, (first + second) / 2
+
+
+class Matchup:
+    """
+    The results of one deck against another, and whether the test has decided the matchup yet
+
+    :param float p0: The win rate the deck has if it isn't favoured
+    :param float p1: The win rate the deck has if it is favoured
+    :param float lower: The log likelihood ratio below which the deck isn't favoured
+    :param float upper: The log likelihood ratio above which the deck is favoured
+    """
+    def __init__(self, p0, p1, lower, upper):
+        self._win_weight = math.log(p1 / p0)
+        self._loss_weight = math.log((1 - p1) / (1 - p0))
+        self.lower = lower
+        self.upper = upper
+        #: The number of games played, each made up of one game with each deck going first
+        self.games = 0
+        #: The total of the results of the games, from the deck's point of view
+        self.score = 0.0
+        #: The log likelihood ratio of the deck being favoured to it not being favoured
+        self.ratio = 0.0
+        #: True if the deck is favoured, False if it isn't, and None if it hasn't been decided
+        self.favoured = None
+
+    def add(self, result):
+        """
+        Add the result of a game.  Once the matchup has been decided, results of games which were already being
+        played are still counted, but don't change the decision.
+
+        :param float result: 1 if the deck won both games, 0 if it lost both, and 0.5 if it won one
+        """
+        self.games += 1
+        self.score += result
+        self.ratio += result * self._win_weight + (1 - result) * self._loss_weight
+        if self.favoured is not None:
+            return
+        if self.ratio >= self.upper:
+            self.favoured = True
+        elif self.ratio <= self.lower:
+            self.favoured = False
+
+    def reversed(self):
+        """
+        The same matchup, from the other deck's point of view
+
+        :rtype: Matchup
+        """
+        matchup = Matchup.__new__(Matchup)
+        matchup._win_weight = self._win_weight
+        matchup._loss_weight = self._loss_weight
+        matchup.lower = self.lower
+        matchup.upper = self.upper
+        matchup.games = self.games
+        matchup.score = self.games - self.score
+        matchup.ratio = matchup.score * self._win_weight + (self.games - matchup.score) * self._loss_weight
+        matchup.favoured = None if self.favoured is None else not self.favoured
+        return matchup
+
+    @property
+    def decided(self):
+        return self.favoured is not None
+
+    @property
+    def win_rate(self):
+        """
+        The share of the games the deck won, or 0.5 if none have been played
+        """
+        if self.games == 0:
+            return 0.5
+        return self.score / self.games
+
+    @property
+    def variance(self):
+        """
+        The variance of the estimate of the win rate, from a Beta distribution over the results so far
+        """
+        wins = self.score + 1
+        losses = self.games - self.score + 1
+        return wins * losses / ((wins + losses) ** 2 * (wins + losses + 1))
+
+
+class MatchupRunner:
+    """
+    Plays each of a list of decks against each deck of a gauntlet, until each matchup has been decided
+
+    :param players: The decks to test, each a pair of a :class:`hearthbreaker.engine.Deck` and the agent to play it
+    :param opponents: The gauntlet, in the same form, or ``None`` to play the decks against each other
+    :param float margin: How far from 0.5 a deck's win rate must be for it to be favoured, or not favoured.  Matchups
+                         which are closer than this take longer to decide.
+    :param float alpha: The chance of deciding a deck is favoured when it isn't
+    :param float beta: The chance of deciding a deck isn't favoured when it is
+    :param int min_games: The number of games played in every matchup before any are decided
+    :param int max_games: The most games played in any one matchup, after which it is left undecided
+    :param int budget: The most games played in all, or ``None`` for no limit
+    :param int processes: The number of processes to play games with, or ``None`` for one per CPU
+    :param int seed: The seed of the first game of each matchup, with the seed increasing by one for each game after
+    """
+    def __init__(self, players, opponents=None, margin=0.1, alpha=0.05, beta=0.05, min_games=10, max_games=500,
+                 budget=None, processes=None, seed=0):
+        self.players = [(deck, agent) for deck, agent in players]
+        self.opponents = self.players if opponents is None else [(deck, agent) for deck, agent in opponents]
+        self.margin = margin
+        self.alpha = alpha
+        self.beta = beta
+        self.min_games = min_games
+        self.max_games = max_games
+        self.budget = budget
+        self.processes = processes
+        self.seed = seed
+        #: The number of games played by the last run
+        self.games = 0
+
+    def _new_matchup(self):
+        return Matchup(0.5 - self.margin, 0.5 + self.margin, math.log(self.beta / (1 - self.alpha)),
+                       math.log((1 - self.beta) / self.alpha))
+
+    def run(self):
+        """
+        Play games until every matchup has been decided, or has reached the most games allowed, or the budget has run
+        out
+
+        :return: The matchups, with a row for each deck and a column for each deck of the gauntlet.  When the decks are
+                 played against each other, each pair of decks is only played once, with the matchup below the
+                 diagonal being the reverse of the one above it, and a deck's matchup against itself isn't played.
+        :rtype: [[Matchup]]
+        """
+        matrix = [[self._new_matchup() for opponent in self.opponents] for player in self.players]
+        if self.opponents is self.players:
+            cells = [(row, column) for row in range(len(matrix)) for column in range(row + 1, len(matrix))]
+        else:
+            cells = [(row, column) for row in range(len(matrix)) for column in range(len(self.opponents))]
+        self.games = 0
+        entries = (self.players, self.opponents)
+        if self.processes == 1:
+            _start_process(entries)
+            try:
+                self._run(matrix, cells, lambda tasks: map(_play, tasks), 1)
+            finally:
+                _start_process(None)
+        else:
+            processes = self.processes or multiprocessing.cpu_count()
+            pool = multiprocessing.Pool(processes, _start_process, (entries,))
+            try:
+                self._run(matrix, cells, lambda tasks: pool.imap_unordered(_play, tasks), processes)
+            finally:
+                pool.close()
+                pool.join()
+
+        if self.opponents is self.players:
+            for row, column in cells:
+                matrix[column][row] = matrix[row][column].reversed()
+        return matrix
+
+    def _run(self, matrix, cells, play, processes):
+        while True:
+            tasks = self._schedule(matrix, cells, processes)
+            if not tasks:
+                return
+            for row, column, result in play(tasks):
+                matrix[row][column].add(result)
+
+    def _schedule(self, matrix, cells, processes):
+        # Every matchup plays its first games together.  After that, each game of the batch is given to the matchup
+        # whose win rate is least certain, counting the games already given to it as if they had been drawn.
+        remaining = None if self.budget is None else self.budget - self.games
+        scheduled = dict((cell, 0) for cell in cells)
+        open_cells = [cell for cell in cells
+                      if not matrix[cell[0]][cell[1]].decided and matrix[cell[0]][cell[1]].games < self.max_games]
+        tasks = []
+        for cell in open_cells:
+            matchup = matrix[cell[0]][cell[1]]
+            for game in range(max(0, min(self.min_games, self.max_games) - matchup.games)):
+                tasks.append(cell)
+                scheduled[cell] += 1
+        if not tasks:
+            batch_size = processes * 4
+            for game in range(batch_size):
+                candidates = [cell for cell in open_cells
+                              if matrix[cell[0]][cell[1]].games + scheduled[cell] < self.max_games]
+                if not candidates:
+                    break
+                cell = max(candidates, key=lambda cell: self._uncertainty(matrix[cell[0]][cell[1]], scheduled[cell]))
+                tasks.append(cell)
+                scheduled[cell] += 1
+        if remaining is not None:
+            tasks = tasks[:remaining]
+        self.games += len(tasks)
+
+        numbered = []
+        counts = dict((cell, 0) for cell in cells)
+        for row, column in tasks:
+            matchup = matrix[row][column]
+            numbered.append((row, column, self.seed + matchup.games + counts[(row, column)]))
+            counts[(row, column)] += 1
+        return numbered
+
+    @staticmethod
+    def _uncertainty(matchup, scheduled):
+        # The variance of the win rate shrinks roughly in proportion to the number of games
+        return matchup.variance * (matchup.games + 1) / (matchup.games + scheduled + 1)
@@ -1,8 +1,25 @@
+import weakref
+
+
 class Power:
     def __init__(self):
         self.hero = None
         self.used = False
 
+    @property
+    def hero(self):
+        """
+        The hero this power belongs to.  The hero owns its power, so the power only keeps a weak reference back to it,
+        and the two can be freed without the cyclic garbage collector.
+        """
+        if self._hero is None:
+            return None
+        return self._hero()
+
+    @hero.setter
+    def hero(self, hero):
+        self._hero = weakref.ref(hero) if hero is not None else None
+
     def can_use(self):
         return not self.used and self.hero.player.mana >= 2
 
@@ -0,0 +1,156 @@
+import collections
+import functools
+import time
+from hearthbreaker.cards.base import Card
+from hearthbreaker.game_objects import Minion
+from hearthbreaker.tags.base import ActionTag, Aura
+
+__doc__ = """
+Attributes the time spent playing games to the cards whose implementations are running, to find out which cards are
+the most expensive to simulate.
+
+While a :class:`CardProfile` is in use, the time spent in the action tags and auras of each card, in using the card and
+in its minion dying is added up under the card's ``ref_name``::
+
+    with CardProfile() as profile:
+        for game in games:
+            game.start()
+    print(profile.report())
+
+Only the time spent in a card's own code is counted for that card.  When one card causes another to do something, such
+as a spell killing a minion with a deathrattle, the time spent in the deathrattle is counted for the minion's card
+instead.  The profiled methods are only replaced while a profile is in use, so there is no cost at any other time.
+
+Effects are profiled through the action tags they run, rather than by replacing ``Effect._find_target``.  Effects are
+bound to events as bound methods, and unbound by comparing them, so replacing the method while a game is in progress
+would leave some effects unable to unbind.
+"""
+
+_active = None
+
+
+class CardProfile:
+    """
+    The number of calls made to, and the time spent in, the implementation of each card
+    """
+    def __init__(self):
+        #: The number of profiled calls made for each card, by ``ref_name``
+        self.calls = collections.Counter()
+        #: The time spent in each card's code, in seconds, by ``ref_name``
+        self.times = collections.Counter()
+        self._stack = []
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("Only one card profile can be in use at a time")
+        _active = self
+        _install()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        _active = None
+        _uninstall()
+
+    def _enter(self, obj, name):
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.times[parent[1]] += now - parent[2]
+        self._stack.append([obj, name, now])
+        self.calls[name] += 1
+
+    def _exit(self):
+        now = time.perf_counter()
+        obj, name, start = self._stack.pop()
+        self.times[name] += now - start
+        if self._stack:
+            self._stack[-1][2] = now
+
+    def report(self, limit=20):
+        """
+        Describe the most expensive cards, with the total time spent in each card's code, the number of calls and the
+        average time per call
+
+        :param int limit: How many cards to list
+        :rtype: str
+        """
+        lines = ["{:<30} {:>10} {:>10} {:>12}".format("Card", "Time (s)", "Calls", "Per call (us)")]
+        for name, total in self.times.most_common(limit):
+            lines.append("{:<30} {:>10.3f} {:>10} {:>12.1f}".format(name, total, self.calls[name],
+                                                                    total * 1e6 / self.calls[name]))
+        return "\n".join(lines)
+
+
+def _card_name(obj):
+    # Cards have their own name, while minions, heroes and weapons know the card they came from
+    name = getattr(obj, "ref_name", None)
+    if name is None:
+        name = getattr(getattr(obj, "card", None), "ref_name", None)
+    return name
+
+
+def _profiled(method, find_owner):
+    @functools.wraps(method)
+    def profiled(self, *args, **kwargs):
+        profile = _active
+        if profile is None:
+            return method(self, *args, **kwargs)
+        owner = find_owner(self, args)
+        # A method which calls the same method on its superclass for the same object is only counted once
+        if profile._stack and profile._stack[-1][0] is owner:
+            return method(self, *args, **kwargs)
+        profile._enter(owner, _card_name(owner) or "(unknown)")
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profile._exit()
+    return profiled
+
+
+def _tag_owner(tag, args):
+    return tag.owner
+
+
+def _first_argument(tag, args):
+    return args[0] if args else None
+
+
+def _self(obj, args):
+    return obj
+
+
+_profiled_methods = [
+    (ActionTag, "do", _first_argument),
+    (Aura, "apply", _tag_owner),
+    (Aura, "unapply", _tag_owner),
+    (Card, "use", _self),
+    (Minion, "die", _self),
+]
+
+_originals = []
+
+
+def _subclasses(cls, found):
+    if cls not in found:
+        found.append(cls)
+        for subclass in cls.__subclasses__():
+            _subclasses(subclass, found)
+    return found
+
+
+def _install():
+    # Subclasses which override a profiled method are profiled too, such as each card's own use method
+    for base, name, find_owner in _profiled_methods:
+        for cls in _subclasses(base, []):
+            if name in cls.__dict__:
+                method = cls.__dict__[name]
+                _originals.append((cls, name, method))
+                setattr(cls, name, _profiled(method, find_owner))
+
+
+def _uninstall():
+    for cls, name, method in reversed(_originals):
+        setattr(cls, name, method)
+    del _originals[:]
@@ -449,12 +449,15 @@ def record(game):
     return replay
 
 
-def playback(replay):
+def playback(replay, move_played=None):
     """
     Create a game which can be replayed back out of a replay.
 
     :param replay: The replay to load the game out of
     :type replay: :class:`Replay`
+    :param function move_played: An optional function which will be called with the index of each move and the game
+                                 once that move has been carried out.  Used to inspect the state of the game as the
+                                 replay progresses.
     :return: A game which when played will perform all of the actions in the replay.
     :rtype: :class:`Game <hearthbreaker.game_objects.Game>`
     """
@@ -484,6 +487,8 @@ def playback(replay):
                     replay._moves[move_index]) is not hearthbreaker.serialization.move.TurnEndMove:
                 random_index = 0
                 replay._moves[move_index].play(game)
+                if move_played:
+                    move_played(move_index, game)
                 move_index += 1
             if move_index == len(replay._moves):
                 player.game.game_ended = True
@@ -527,12 +532,16 @@ def playback(replay):
         nonlocal move_index, random_index
         random_index = 0
         _old_start_turn()
+        if move_played:
+            move_played(move_index, game)
         move_index += 1
 
     def _end_turn():
         nonlocal move_index, random_index
         random_index = 0
         _old_end_turn()
+        if move_played:
+            move_played(move_index, game)
         move_index += 1
 
     def pre_game():
@@ -1 +1,17 @@
+import os
+
 __author__ = 'Daniel'
+
+
+def replace_file(source, destination):
+    """
+    Move a file to a new path, replacing whatever is already there.  This is :func:`os.replace`, which isn't available
+    before Python 3.3.  On Windows the file being replaced is removed first, so unlike :func:`os.replace`, the move
+    isn't atomic there.
+
+    :param str source: The path of the file to move
+    :param str destination: The path to move it to
+    """
+    if os.name == "nt" and os.path.exists(destination):
+        os.remove(destination)
+    os.rename(source, destination)
@@ -0,0 +1,257 @@
+import marshal
+import random
+from hearthbreaker.cards.heroes import hero_from_name
+from hearthbreaker.engine import Deck, Game, Player, card_lookup
+from hearthbreaker.game_objects import GameObject, Minion
+from hearthbreaker.tags.base import Aura, AuraUntil, Deathrattle, Effect
+
+__doc__ = """
+A compact binary encoding of the state of a game, for checkpointing games or moving them between processes.
+
+The state holds the same information as the one produced by
+:func:`hearthbreaker.serialization.serialization.serialize`, but it is read from and built into the game objects
+directly, rather than going through ``__to_json__`` and ``__from_json__``.  The game, the players, their heroes,
+weapons, minions and cards are each encoded as a tuple of their fields in a fixed order.  The effects, auras, buffs and
+deathrattles on them are encoded from their JSON form, with every object flattened into a tuple whose first element
+identifies its shape (the set of keys it has) in a table stored once per state, and repeated subtrees (the same buff,
+selector or condition appearing on several minions, for example) stored once and referenced afterwards.  Each subtree
+is interned as soon as it has been encoded, so the whole state is encoded in a single walk, however deeply it is
+nested.  The result is written with :mod:`marshal`.
+
+For a game ten turns in, the binary state is about a seventh of the size of the JSON, and is encoded in about a sixth
+of the time (0.12 ms against 0.76 ms).  Decoding takes about 0.33 ms against 0.37 ms for the JSON, which is about as
+long as :meth:`Game.copy <hearthbreaker.engine.Game.copy>` takes, as nearly all of it is spent constructing the cards
+in each deck.  ``time_serialization`` in :mod:`benchmarks.speed` measures both formats.
+
+The format is tied to the version of Python which wrote it, so it is suited to moving states between processes or
+short term checkpoints, rather than long term storage.  Use the JSON format for that.
+"""
+
+FORMAT_VERSION = 2
+
+# Lists are flattened into tuples starting with this marker.  Objects start with the (non negative) index of their
+# shape in the shape table.
+_LIST = -1
+
+
+class _Encoder:
+    def __init__(self):
+        self.shapes = []
+        self.shape_ids = {}
+        self.interned = {}
+
+    def encode(self, obj):
+        if isinstance(obj, (str, int, float)) or obj is None:
+            return obj
+        if hasattr(obj, "__to_json__"):
+            obj = obj.__to_json__()
+            if not isinstance(obj, (dict, list, tuple)):
+                return self.encode(obj)
+
+        if isinstance(obj, dict):
+            keys = tuple(sorted(obj.keys()))
+            shape_id = self.shape_ids.get(keys)
+            if shape_id is None:
+                shape_id = len(self.shapes)
+                self.shape_ids[keys] = shape_id
+                self.shapes.append(keys)
+            node = [shape_id]
+            node.extend([self.encode(obj[key]) for key in keys])
+        else:
+            node = [_LIST]
+            node.extend([self.encode(item) for item in obj])
+        node = tuple(node)
+
+        # Equal subtrees are replaced by a single instance, which marshal will only write once.  The children have
+        # already been interned, so each child subtree is keyed by its id, and the key of a node is built from its
+        # own values alone.  The types are part of the key so that values which compare equal but differ in type
+        # (1 and True) stay distinct.
+        key = (tuple(map(type, node)), tuple([id(value) if type(value) is tuple else value for value in node]))
+        return self.interned.setdefault(key, node)
+
+
+def _decode(node, shapes):
+    if type(node) is not tuple:
+        return node
+    if node[0] == _LIST:
+        return [_decode(item, shapes) for item in node[1:]]
+    return dict(zip(shapes[node[0]], [_decode(value, shapes) for value in node[1:]]))
+
+
+# The objects which make up the structure of a game are encoded as tuples of their fields, in the orders below, and
+# decoded by building the objects straight from those fields.  Everything else (the effects, auras, buffs and
+# deathrattles) goes through its JSON form, as its from_json builds it from the JSON of its parts.
+
+def _encode_tags(obj, encoder):
+    return encoder.encode(obj.effects), encoder.encode(obj.auras), encoder.encode(obj.buffs)
+
+
+def _decode_tags(obj, node, shapes):
+    effects, auras, buffs = node
+    GameObject.__from_json__(obj, _decode(effects, shapes), _decode(auras, shapes), _decode(buffs, shapes))
+
+
+def _encode_game(game, encoder):
+    return (1 if game.current_player is game.players[0] else 2, game.minion_counter, game._turns_passed,
+            tuple(_encode_player(player, encoder) for player in game.players))
+
+
+def _encode_player(player, encoder):
+    auras = [aura for aura in player.player_auras + player.object_auras if isinstance(aura, AuraUntil)]
+    hero = player.hero
+    weapon = None
+    if hero.weapon:
+        weapon = (hero.weapon.card.name, hero.weapon.base_attack, hero.weapon.durability,
+                  _encode_tags(hero.weapon, encoder))
+    return (player.name, player.mana, player.max_mana, player.current_overload, player.upcoming_overload,
+            (hero.card.short_name, hero.health, hero.base_attack, hero.armor, hero.immune, hero.used_windfury,
+             hero.attacks_performed, hero.power.used, weapon, _encode_tags(hero, encoder)),
+            tuple(card.name for card in player.deck.cards), tuple(card.drawn for card in player.deck.cards),
+            tuple(player.graveyard), tuple((card.name, _encode_tags(card, encoder)) for card in player.hand),
+            tuple(secret.name for secret in player.secrets), encoder.encode(player.effects), encoder.encode(auras),
+            tuple((minion.card.name, minion.born, minion.base_health, minion.calculate_max_health() - minion.health,
+                   minion.base_attack, minion.exhausted, minion.attacks_performed,
+                   encoder.encode(minion.deathrattle), encoder.encode(minion.enrage) if minion.enrage else None,
+                   _encode_tags(minion, encoder)) for minion in player.minions))
+
+
+def _decode_game(node, shapes, agents):
+    active_player, minion_counter, turns_passed, player_nodes = node
+    game = Game.__new__(Game)
+    game._all_cards_played = []
+    game.minion_counter = minion_counter
+    game._turns_passed = turns_passed
+    game.delayed_minions = set()
+    game.game_ended = False
+    game.random_func = random.randint
+    game.events = {}
+    game.players = [_decode_player(player_node, shapes, game) for player_node in player_nodes]
+    game._has_turn_ended = False
+    if active_player == 1:
+        game.current_player, game.other_player = game.players
+    else:
+        game.other_player, game.current_player = game.players
+    game.current_player.opponent = game.other_player
+    game.other_player.opponent = game.current_player
+
+    for player, agent, player_node in zip(game.players, agents, player_nodes):
+        player.agent = agent
+        for effect in _decode(player_node[11], shapes):
+            player.add_effect(Effect.from_json(**effect))
+        player.player_auras = []
+        for aura in _decode(player_node[12], shapes):
+            player.add_aura(AuraUntil.from_json(**aura))
+        player.hero.attach(player.hero, player)
+        if player.hero.weapon:
+            player.hero.weapon.attach(player.hero, player)
+        for minion in player.minions:
+            minion.attach(minion, player)
+            if minion.health != minion.calculate_max_health():
+                minion.enraged = True
+    return game
+
+
+def _decode_player(node, shapes, game):
+    name, mana, max_mana, current_overload, upcoming_overload, hero_node, deck_names, deck_drawn, graveyard, hand, \
+        secrets, effects, auras, minions = node
+    deck = Deck.__new__(Deck)
+    deck.cards = [card_lookup(card_name) for card_name in deck_names]
+    for card, drawn in zip(deck.cards, deck_drawn):
+        card.drawn = drawn
+    deck.used = list(deck_drawn)
+    deck.left = 30 - sum(deck_drawn)
+    deck.hero = hero_from_name(hero_node[0])
+
+    player = Player("whatever", deck, None, game)
+    player.hero = _decode_hero(hero_node, shapes, player)
+    player.mana = mana
+    player.max_mana = max_mana
+    player.upcoming_overload = upcoming_overload
+    player.current_overload = current_overload
+    player.name = name
+    player.hand = []
+    for card_name, tags in hand:
+        card = card_lookup(card_name)
+        _decode_tags(card, tags, shapes)
+        card.attach(card, player)
+        player.hand.append(card)
+    player.graveyard = list(graveyard)
+    player.secrets = []
+    for secret_name in secrets:
+        secret = card_lookup(secret_name)
+        secret.player = player
+        player.secrets.append(secret)
+    player.minions = [_decode_minion(minion_node, shapes, player, game, index)
+                      for index, minion_node in enumerate(minions)]
+    return player
+
+
+def _decode_hero(node, shapes, player):
+    name, health, attack, armor, immune, used_windfury, attacks_performed, power_used, weapon_node, tags = node
+    hero = player.deck.hero.create_hero(player)
+    hero.card = player.deck.hero
+    _decode_tags(hero, tags, shapes)
+    hero.health = health
+    hero.base_attack = attack
+    hero.armor = armor
+    hero.immune = immune
+    hero.used_windfury = used_windfury
+    hero.attacks_performed = attacks_performed
+    hero.power.used = power_used
+    hero.player = player
+    if weapon_node is not None:
+        weapon_name, weapon_attack, durability, weapon_tags = weapon_node
+        weapon_card = card_lookup(weapon_name)
+        weapon = weapon_card.create_weapon(player)
+        weapon.base_attack = weapon_attack
+        weapon.durability = durability
+        weapon.card = weapon_card
+        _decode_tags(weapon, weapon_tags, shapes)
+        weapon.player = player
+        hero.weapon = weapon
+    return hero
+
+
+def _decode_minion(node, shapes, player, game, index):
+    name, born, max_health, damage, attack, exhausted, attacks_performed, deathrattles, enrage, tags = node
+    minion = Minion(attack, max_health)
+    _decode_tags(minion, tags, shapes)
+    minion.health = max_health - damage
+    minion.exhausted = exhausted
+    minion.attacks_performed = attacks_performed
+    minion.born = born
+    if enrage is not None:
+        minion.enrage = [Aura.from_json(**aura) for aura in _decode(enrage, shapes)]
+    minion.deathrattle = [Deathrattle.from_json(**deathrattle) for deathrattle in _decode(deathrattles, shapes)]
+    minion.card = card_lookup(name)
+    minion.game = game
+    minion.player = player
+    minion.index = index
+    return minion
+
+
+def serialize_binary(game):
+    """
+    Encode the given game as a compact binary string.  This string can be used to re-construct the game exactly
+    as it is now with :func:`deserialize_binary`
+
+    :param hearthbreaker.engine.Game game: The game to serialize
+    :rtype: bytes
+    """
+    encoder = _Encoder()
+    root = _encode_game(game, encoder)
+    return marshal.dumps((FORMAT_VERSION, tuple(encoder.shapes), root))
+
+
+def deserialize_binary(data, agents):
+    """
+    Decode a game from a binary string created by :func:`serialize_binary`.
+
+    :param bytes data: The binary representation of the game
+    :param agents: The agents which will play for each player
+    :rtype: :class:`hearthbreaker.engine.Game`
+    """
+    version, shapes, root = marshal.loads(data)
+    if version != FORMAT_VERSION:
+        raise ValueError("Unsupported binary state version: {}".format(version))
+    return _decode_game(root, shapes, agents)
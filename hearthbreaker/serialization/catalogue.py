@@ -0,0 +1,136 @@
+import hashlib
+import io
+import os
+import pickle
+import sys
+import tempfile
+import hearthbreaker.cards
+import hearthbreaker.tags
+from hearthbreaker.serialization import replace_file
+from hearthbreaker.tags.base import load_card_defs
+
+__doc__ = """
+A cache of card definitions (such as those in ``card_defs.json``), with their tags already built.
+
+Loading card definitions means parsing the JSON and then building every battlecry, aura, effect and so on from it,
+which is slow to do every time.  A catalogue is the result of :func:`hearthbreaker.tags.base.load_card_defs`, pickled
+along with a hash of the file it was built from, and a hash of the source of :mod:`hearthbreaker.tags` and
+:mod:`hearthbreaker.cards`, whose classes the tags are pickled as.  :func:`load_catalogue` reads the catalogue if it is
+up to date, and rebuilds it if the source file, the tags or the cards have changed, or the catalogue was written by a
+different version of this module.
+
+The cards the engine plays with are defined in Python, so the card definitions are only loaded to check that they
+behave the same as those cards, which ``tests/json_load_tests.py`` does through :func:`load_catalogue`.
+
+The tags in a catalogue are prototypes: they are attached to whatever uses them, so every card or minion built from a
+catalogue needs its own :func:`copy.deepcopy` of them.
+
+A catalogue can be built ahead of time with::
+
+    python -m hearthbreaker.serialization.catalogue card_defs.json
+"""
+
+CATALOGUE_VERSION = 3
+
+# The packages whose classes are pickled in a catalogue
+_CODE_PACKAGES = [hearthbreaker.tags, hearthbreaker.cards]
+
+# The hash of the source of the packages the tags are pickled from, found the first time it is needed
+_code_hash = None
+
+
+def catalogue_path(source):
+    """
+    The path a catalogue for a file is stored at, unless another is given.
+
+    :param str source: The path to the card definitions
+    :rtype: str
+    """
+    return os.path.splitext(source)[0] + ".catalogue"
+
+
+def _source_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _get_code_hash():
+    global _code_hash
+    if _code_hash is None:
+        digest = hashlib.sha256()
+        for package in _CODE_PACKAGES:
+            package_directory = os.path.dirname(os.path.abspath(package.__file__))
+            for directory, subdirectories, files in sorted(os.walk(package_directory)):
+                subdirectories.sort()
+                for name in sorted(files):
+                    if name.endswith(".py"):
+                        path = os.path.join(directory, name)
+                        with open(path, "rb") as file:
+                            digest.update(os.path.relpath(path, package_directory).encode("utf-8"))
+                            digest.update(_source_hash(file.read()).encode("ascii"))
+        _code_hash = digest.hexdigest()
+    return _code_hash
+
+
+def build_catalogue(source, path=None):
+    """
+    Build the catalogue for a file of card definitions, and write it out.
+
+    :param str source: The path to the card definitions
+    :param str path: Where to write the catalogue.  Defaults to :func:`catalogue_path`
+    :return: The card definitions, as returned by :func:`hearthbreaker.tags.base.load_card_defs`
+    :rtype: [dict]
+    """
+    if path is None:
+        path = catalogue_path(source)
+    with open(source, "rb") as file:
+        data = file.read()
+    card_defs = load_card_defs(io.StringIO(data.decode("utf-8")))
+    catalogue = {
+        'version': CATALOGUE_VERSION,
+        'source_hash': _source_hash(data),
+        'code_hash': _get_code_hash(),
+        'cards': card_defs,
+    }
+    # Written to a temporary file first, so that a process reading the catalogue never sees half of it
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            pickle.dump(catalogue, file, pickle.HIGHEST_PROTOCOL)
+        replace_file(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return card_defs
+
+
+def load_catalogue(source, path=None):
+    """
+    Load the card definitions in a file, from its catalogue if there is an up to date one, or by building the catalogue
+    if there isn't.
+
+    :param str source: The path to the card definitions
+    :param str path: Where the catalogue is stored.  Defaults to :func:`catalogue_path`
+    :return: The card definitions, as returned by :func:`hearthbreaker.tags.base.load_card_defs`
+    :rtype: [dict]
+    """
+    if path is None:
+        path = catalogue_path(source)
+    with open(source, "rb") as file:
+        source_hash = _source_hash(file.read())
+    try:
+        with open(path, "rb") as file:
+            catalogue = pickle.load(file)
+        if catalogue['version'] == CATALOGUE_VERSION and catalogue['source_hash'] == source_hash and \
+                catalogue['code_hash'] == _get_code_hash():
+            return catalogue['cards']
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, KeyError, TypeError):
+        # A missing or unreadable catalogue is rebuilt, the same as an out of date one
+        pass
+    return build_catalogue(source, path)
+
+
+if __name__ == "__main__":
+    for source in sys.argv[1:]:
+        card_defs = build_catalogue(source)
+        print("Wrote {} cards to {}".format(len(card_defs), catalogue_path(source)))
@@ -0,0 +1,219 @@
+import copy
+import json
+from hearthbreaker.engine import Game
+
+__doc__ = """
+Records the state of a game as a stream of small patches, rather than a complete snapshot each time.
+
+The state of a game changes very little from one turn to the next, so storing a full snapshot of
+:meth:`Game.__to_json__ <hearthbreaker.engine.Game.__to_json__>` after every turn is mostly repetition.  A
+:class:`StateStream` keeps the first snapshot it is given in full, and then only the differences between each snapshot
+and the one before it.  Any of the recorded states can be rebuilt by applying the patches in order.
+
+A patch is a list of operations, each of which is a list starting with the name of the operation, followed by the path
+to the value it changes (a list of keys and indices into the state):
+
+* ``["set", path, value]`` replaces the value at ``path`` (or adds it, if it is a key which wasn't there before)
+* ``["del", path]`` removes the key at ``path``
+* ``["splice", path, start, stop, items]`` replaces the items from ``start`` up to ``stop`` in the list at ``path``
+  with ``items``
+
+Patches only contain lists, dictionaries, strings and numbers, so they can be stored as JSON.
+"""
+
+
+def snapshot(game):
+    """
+    Take a snapshot of the state of a game, in the same form as it would be loaded from JSON
+
+    :param hearthbreaker.engine.Game game: The game to take a snapshot of
+    :rtype: dict
+    """
+    return json.loads(json.dumps(game, default=lambda o: o.__to_json__()))
+
+
+def _same_item(old, new):
+    # Minions are matched up by their sequence id, so that a minion being added or removed only changes the list
+    # around it, even though the position of every minion after it has changed as well
+    if isinstance(old, dict) and isinstance(new, dict) and 'sequence_id' in old and 'sequence_id' in new:
+        return old['sequence_id'] == new['sequence_id']
+    return old == new
+
+
+def _diff(old, new, path, ops):
+    if type(old) is not type(new):
+        ops.append(["set", path, new])
+    elif isinstance(old, dict):
+        for key in old:
+            if key not in new:
+                ops.append(["del", path + [key]])
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["set", path + [key], value])
+            elif old[key] != value:
+                _diff(old[key], value, path + [key], ops)
+    elif isinstance(old, list):
+        _diff_list(old, new, path, ops)
+    elif old != new:
+        ops.append(["set", path, new])
+
+
+def _diff_list(old, new, path, ops):
+    length = min(len(old), len(new))
+    start = 0
+    while start < length and _same_item(old[start], new[start]):
+        start += 1
+    end = 0
+    while end < length - start and _same_item(old[-1 - end], new[-1 - end]):
+        end += 1
+
+    for index in range(start):
+        if old[index] != new[index]:
+            _diff(old[index], new[index], path + [index], ops)
+
+    old_middle = old[start:len(old) - end]
+    new_middle = new[start:len(new) - end]
+    if len(old_middle) == len(new_middle):
+        for index in range(len(old_middle)):
+            _diff(old_middle[index], new_middle[index], path + [start + index], ops)
+    else:
+        ops.append(["splice", path, start, len(old) - end, new_middle])
+
+    for index in range(end):
+        old_index = len(old) - end + index
+        new_index = len(new) - end + index
+        if old[old_index] != new[new_index]:
+            _diff(old[old_index], new[new_index], path + [new_index], ops)
+
+
+def diff(old, new):
+    """
+    Find the differences between two states.
+
+    :param dict old: The earlier state, as returned by :func:`snapshot`
+    :param dict new: The later state
+    :return: A patch, which will turn ``old`` into ``new`` when passed to :func:`apply_patch`
+    :rtype: list
+    """
+    ops = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def apply_patch(state, patch):
+    """
+    Apply a patch created by :func:`diff` to a state.  The state passed in is not modified.
+
+    :param dict state: The state to apply the patch to
+    :param list patch: The patch to apply
+    :return: The patched state
+    :rtype: dict
+    """
+    state = copy.deepcopy(state)
+    for op in patch:
+        path = op[1]
+        if not path:
+            state = copy.deepcopy(op[2])
+            continue
+        parent = state
+        for key in path[:-1]:
+            parent = parent[key]
+        if op[0] == "set":
+            parent[path[-1]] = copy.deepcopy(op[2])
+        elif op[0] == "del":
+            del parent[path[-1]]
+        elif op[0] == "splice":
+            parent[path[-1]][op[2]:op[3]] = copy.deepcopy(op[4])
+        else:
+            raise ValueError("Unknown patch operation: {}".format(op[0]))
+    return state
+
+
+class StateStream:
+    """
+    A sequence of game states, stored as a base state and a patch for each state after it.
+
+    **Example**::
+
+        stream = StateStream()
+        stream.record(game)
+        while not game.game_ended:
+            game.play_single_turn()
+            stream.record(game)
+        stream.write(open("game.states", "w"))
+    """
+
+    def __init__(self, base=None, patches=None):
+        self.base = base
+        self.patches = patches if patches else []
+        self._last = base
+        if base is not None:
+            for patch in self.patches:
+                self._last = apply_patch(self._last, patch)
+
+    def record(self, game):
+        """
+        Add the current state of a game to the end of this stream
+
+        :param hearthbreaker.engine.Game game: The game to record
+        """
+        state = snapshot(game)
+        if self.base is None:
+            self.base = state
+        else:
+            self.patches.append(diff(self._last, state))
+        self._last = state
+
+    def __len__(self):
+        if self.base is None:
+            return 0
+        return len(self.patches) + 1
+
+    def state_at(self, index):
+        """
+        Rebuild one of the states in this stream
+
+        :param int index: The index of the state, where 0 is the first state recorded
+        :rtype: dict
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError("No state at index {}".format(index))
+        state = self.base
+        for patch in self.patches[:index]:
+            state = apply_patch(state, patch)
+        return state
+
+    def game_at(self, index, agents):
+        """
+        Rebuild a game from one of the states in this stream
+
+        :param int index: The index of the state, where 0 is the first state recorded
+        :param agents: The agents which will play for each player
+        :rtype: :class:`hearthbreaker.engine.Game`
+        """
+        return Game.__from_json__(self.state_at(index), agents)
+
+    def write(self, file):
+        """
+        Write this stream to a file, as one line of JSON for the base state, followed by one line for each patch
+
+        :param file: A file-like object to write to
+        """
+        file.write(json.dumps(self.base, separators=(',', ':')))
+        file.write("\n")
+        for patch in self.patches:
+            file.write(json.dumps(patch, separators=(',', ':')))
+            file.write("\n")
+
+    @staticmethod
+    def read(file):
+        """
+        Read a stream written by :meth:`write`
+
+        :param file: A file-like object to read from
+        :rtype: :class:`StateStream`
+        """
+        lines = [line for line in file if line.strip()]
+        if not lines:
+            return StateStream()
+        return StateStream(json.loads(lines[0]), [json.loads(line) for line in lines[1:]])
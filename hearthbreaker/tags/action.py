@@ -1,6 +1,6 @@
 import copy
 from hearthbreaker.tags.base import Status, Action, Aura, Condition, AuraUntil, CardQuery, \
-    CARD_SOURCE, Effect, Buff, BuffUntil, Amount, Picker, Selector
+    CARD_SOURCE, Effect, Buff, BuffUntil, Amount, Picker, Selector, action_registry
 from hearthbreaker.tags.condition import IsSecret
 from hearthbreaker.tags.selector import AllPicker, ConstantSelector
 
@@ -708,3 +708,6 @@ class SwapStats(Action):
             'dest_stat': self.dest_stat,
             'swap_with_owner': self.swap_with_owner,
         }
+
+
+action_registry.register(list(globals().values()))
@@ -1,6 +1,8 @@
 import abc
 import copy
+import importlib
 import json
+import re
 import string
 
 
@@ -29,18 +31,101 @@ class JSONObject(metaclass=abc.ABCMeta):
         return json.dumps(self.__to_json__(), default=lambda o: o.__to_json__(), sort_keys=True)
 
 
+class TagRegistry:
+    """
+    Maps the names used for one kind of tag in JSON (such as ``"minion_is_not_target"``) to the classes which
+    implement them (such as :class:`MinionIsNotTarget <hearthbreaker.tags.condition.MinionIsNotTarget>`).
+
+    Each tag module registers its classes when it is defined, so loading a tag only needs a single dictionary lookup,
+    rather than converting its name to a class name each time.  Any name which isn't registered is converted and looked
+    up in the module the slow way, and then remembered.
+    """
+    def __init__(self, base, module_name, suffix=""):
+        """
+        :param type base: The class which every class in this registry extends
+        :param str module_name: The module the classes are defined in
+        :param str suffix: A suffix which is added to names to get the class name, such as ``"Selector"``
+        """
+        self.base = base
+        self.module_name = module_name
+        self.suffix = suffix
+        self.classes = {}
+
+    def register(self, classes):
+        """
+        Register all the classes given which extend this registry's base class.  Anything which is not such a class is
+        ignored, so that a module can pass in all of its globals.
+
+        :param classes: An iterable of the classes to register
+        """
+        for cls in classes:
+            if isinstance(cls, type) and issubclass(cls, self.base) and cls.__name__.endswith(self.suffix):
+                cls_name = cls.__name__[:len(cls.__name__) - len(self.suffix)]
+                name = re.sub("(?<!^)([A-Z])", r"_\1", cls_name).lower()
+                # Only names which from_json would have converted to this class are registered
+                if name and string.capwords(name, '_').replace("_", "") == cls_name:
+                    self.classes[name] = cls
+
+    def lookup(self, name):
+        """
+        Find the class for a name
+
+        :param str name: The name of the class, as it appears in JSON
+        :rtype: type
+        """
+        cls = self.classes.get(name)
+        if cls is None:
+            module = importlib.import_module(self.module_name)
+            cls = getattr(module, string.capwords(name, '_').replace("_", "") + self.suffix)
+            self.classes[name] = cls
+        return cls
+
+
+class Stateless:
+    """
+    A mixin for tag objects which have no state of their own, such as players, pickers and most conditions and
+    statuses.  There is only ever one instance of each stateless class, which is shared by every card and minion
+    that uses it, and is returned as is when copied.
+
+    A class using this mixin (or any of its subclasses) must never set an attribute on itself.  Anything which keeps
+    track of a value, like an amount or the attack a character had before it was changed, is stateful and needs an
+    instance of its own.
+    """
+    def __new__(cls, *args, **kwargs):
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self), ()
+
+
 class Tag(JSONObject):
     def __deepcopy__(self, memo):
         cls = self.__class__
         new = cls.__new__(cls)
         memo[id(self)] = new
         for attribute, value in self.__dict__.items():
-            if attribute != "owner":
-                setattr(new, attribute, copy.deepcopy(value, memo))
-            else:
+            if attribute == "owner":
                 setattr(new, attribute, None)
+            elif not attribute.startswith("_compiled"):
+                setattr(new, attribute, copy.deepcopy(value, memo))
         return new
 
+    def __getstate__(self):
+        state = {attribute: value for attribute, value in self.__dict__.items()
+                 if not attribute.startswith("_compiled")}
+        state['owner'] = None
+        return state
+
 
 class Aura(Tag):
     def __init__(self, status, selector, condition=None):
@@ -64,8 +149,12 @@ class Aura(Tag):
             self.status.unact(self.owner, target)
 
     def match(self, obj):
-        return (not self.condition or self.condition.evaluate(self.owner, self.owner)) and \
-            self.selector.match(self.owner, obj)
+        try:
+            match = self._compiled_match
+        except AttributeError:
+            from hearthbreaker.tags.compiler import compile_aura_match
+            match = self._compiled_match = compile_aura_match(self)
+        return match(self.owner, obj)
 
     def __to_json__(self):
         if self.condition:
@@ -190,7 +279,7 @@ class AuraUntil(Aura):
         return AuraUntil(status, selector, until)
 
 
-class Player(metaclass=abc.ABCMeta):
+class Player(Stateless, metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def get_players(self, target):
         pass
@@ -252,10 +341,7 @@ class Selector(JSONObject, metaclass=abc.ABCMeta):
 
     @staticmethod
     def from_json(name, **kwargs):
-        import hearthbreaker.tags.selector as selector_mod
-
-        cls_name = string.capwords(name, '_').replace("_", "") + "Selector"
-        cls = getattr(selector_mod, cls_name)
+        cls = selector_registry.lookup(name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -268,10 +354,7 @@ class Action(JSONObject, metaclass=abc.ABCMeta):
 
     @staticmethod
     def from_json(name, **kwargs):
-        import hearthbreaker.tags.action as action_mod
-
-        cls_name = string.capwords(name, '_').replace("_", "")
-        cls = getattr(action_mod, cls_name)
+        cls = action_registry.lookup(name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -287,10 +370,7 @@ class Status(JSONObject, metaclass=abc.ABCMeta):
 
     @staticmethod
     def from_json(name, **kwargs):
-        import hearthbreaker.tags.status as status_mod
-
-        cls_name = string.capwords(name, '_').replace("_", "")
-        cls = getattr(status_mod, cls_name)
+        cls = status_registry.lookup(name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -367,10 +447,7 @@ class Event(JSONObject, metaclass=abc.ABCMeta):
 
     @staticmethod
     def from_json(event_name, **kwargs):
-        import hearthbreaker.tags.event as event_mod
-
-        cls_name = string.capwords(event_name, '_').replace("_", "")
-        cls = getattr(event_mod, cls_name)
+        cls = event_registry.lookup(event_name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -385,6 +462,12 @@ class Event(JSONObject, metaclass=abc.ABCMeta):
         new.event_name = self.event_name
         return new
 
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['__func__'] = None
+        state['__target__'] = None
+        return state
+
     def __from_json__(self, condition=None):
         if condition:
             condition = Condition.from_json(**condition)
@@ -416,6 +499,8 @@ class MinionEvent(Event):
     def unbind(self, target, func):
         if self.condition:
             target.unbind(self.event_name, self.__action__)
+            self.__func__ = None
+            self.__target__ = None
         else:
             target.unbind(self.event_name, func)
 
@@ -440,6 +525,9 @@ class PlayerEvent(Event):
                 player.unbind(self.event_name, self.__action__)
             else:
                 player.unbind(self.event_name, func)
+        if self.condition:
+            self.__func__ = None
+            self.__target__ = None
 
     def __deepcopy__(self, memo):
         new = super().__deepcopy__(memo)
@@ -480,6 +568,13 @@ class Effect(Tag):
     def set_owner(self, owner):
         self.owner = owner
 
+    def dispose(self):
+        # The event holds on to this effect's handler, and so to the effect itself
+        self.event.__func__ = None
+        self.event.__target__ = None
+        self.owner = None
+        self.other = None
+
     def _find_target(self, focus=None, other=None, *args):
         for tag in self.tags:
             if not tag.do(self.owner, focus, other):
@@ -505,10 +600,7 @@ class Condition(JSONObject, metaclass=abc.ABCMeta):
 
     @staticmethod
     def from_json(name, **kwargs):
-        import hearthbreaker.tags.condition as action_mod
-
-        cls_name = string.capwords(name, '_').replace("_", "")
-        cls = getattr(action_mod, cls_name)
+        cls = condition_registry.lookup(name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -527,18 +619,12 @@ class ActionTag(Tag):
         self.condition = condition
 
     def do(self, owner, target=None, other=None):
-        if self.condition:
-            if not self.condition.evaluate(owner, target):
-                return
-        targets = self.selector.choose_targets(owner, target)
-        found_target = False
-        for t in targets:
-            found_target = True
-            if t.is_valid():
-                for action in self.actions:
-                    action.act(owner, t, other)
-
-        return found_target
+        try:
+            do = self._compiled_do
+        except AttributeError:
+            from hearthbreaker.tags.compiler import compile_action_tag
+            do = self._compiled_do = compile_action_tag(self)
+        return do(owner, target, other)
 
     def __to_json__(self):
         if self.condition:
@@ -679,12 +765,10 @@ class CardQuery(JSONObject):
                 or self.source == CARD_SOURCE.MINION or self.make_copy:
             return chosen_card
         elif self.source == CARD_SOURCE.MY_DECK:
-            chosen_card.drawn = True
-            player.deck.left -= 1
+            player.deck.take(chosen_card)
             return chosen_card
         elif self.source == CARD_SOURCE.OPPONENT_DECK:
-            chosen_card.drawn = True
-            player.opponent.deck.left -= 1
+            player.opponent.deck.take(chosen_card)
             return chosen_card
         elif self.source == CARD_SOURCE.MY_HAND:
             player.hand.remove(chosen_card)
@@ -779,10 +863,7 @@ class Function(JSONObject, metaclass=abc.ABCMeta):
 
     @staticmethod
     def from_json(name, **kwargs):
-        import hearthbreaker.tags.selector as selector_mod
-
-        cls_name = string.capwords(name, '_').replace("_", "")
-        cls = getattr(selector_mod, cls_name)
+        cls = function_registry.lookup(name)
         obj = cls.__new__(cls)
         return obj.__from_json__(**kwargs)
 
@@ -839,3 +920,52 @@ class Context(metaclass=abc.ABCMeta):
         :param target: The character getting damaged
         """
         pass
+
+
+selector_registry = TagRegistry(Selector, "hearthbreaker.tags.selector", "Selector")
+function_registry = TagRegistry(Function, "hearthbreaker.tags.selector")
+action_registry = TagRegistry(Action, "hearthbreaker.tags.action")
+status_registry = TagRegistry(Status, "hearthbreaker.tags.status")
+condition_registry = TagRegistry(Condition, "hearthbreaker.tags.condition")
+event_registry = TagRegistry(Event, "hearthbreaker.tags.event")
+
+
+def _load_tags(key, value):
+    if isinstance(value, list):
+        return [_load_tags(key, item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if key in ("battlecry", "combo"):
+        return Battlecry.from_json(**value)
+    if key == "choices":
+        return Choice.from_json(**value)
+    if key == "deathrattle":
+        return Deathrattle.from_json(**value)
+    if key == "effects":
+        return Effect.from_json(**value)
+    if key == "buffs":
+        if "until" in value:
+            return BuffUntil.from_json(**value)
+        return Buff.from_json(**value)
+    if key in ("auras", "enrage"):
+        if "until" in value:
+            return AuraUntil.from_json(**value)
+        return Aura.from_json(**value)
+    if key == "impl":
+        return {impl_key: _load_tags(impl_key, impl_value) for impl_key, impl_value in value.items()}
+    return value
+
+
+def load_card_defs(file):
+    """
+    Load card definitions (such as those in ``card_defs.json``), with the tags of each card already converted from
+    JSON.  Each definition is a dict in the same form as in the file, except that the battlecries, choices, combos,
+    deathrattles, effects, buffs, auras and enrages (including those under ``impl``) are tag objects.
+
+    Tags are attached to the card or minion that uses them, so each card or minion created from these definitions
+    needs its own :func:`copy.deepcopy` of them.
+
+    :param file: A file-like object to read the definitions from
+    :rtype: [dict]
+    """
+    return [{key: _load_tags(key, value) for key, value in card_def.items()} for card_def in json.load(file)]
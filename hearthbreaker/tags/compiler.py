@@ -0,0 +1,180 @@
+from hearthbreaker.tags.condition import And, Not, MinionIsTarget, MinionIsNotTarget, IsMinion, IsHero
+from hearthbreaker.tags.selector import FriendlyPlayer, EnemyPlayer, BothPlayer, AllPicker, MinionSelector, \
+    CharacterSelector, HeroSelector, CardSelector, SelfSelector
+
+__doc__ = """
+Compiles the tag trees of cards into plain Python functions.
+
+Checking whether an :class:`Aura <hearthbreaker.tags.base.Aura>` applies to a character, or finding the targets of an
+:class:`ActionTag <hearthbreaker.tags.base.ActionTag>` walks down through a selector, its players, picker and
+conditions, calling a method on each of them.  Most of those layers do very little (an
+:class:`AllPicker <hearthbreaker.tags.selector.AllPicker>` returns what it was given, a
+:class:`FriendlyPlayer <hearthbreaker.tags.selector.FriendlyPlayer>` compares two players) but the calls add up, as
+auras are matched every time a stat is calculated.
+
+The functions here turn a tag tree into the source of a single Python function, with the common selectors, players,
+pickers and conditions written out in place, and calls to the ``evaluate``, ``match`` or ``pick`` methods of anything
+else.  The source only depends on the shape of the tree, so it is compiled once for each shape, and then bound to the
+objects in each particular tree.  The compiled functions behave exactly the same as calling the tags directly.
+
+Amounts are not folded into the compiled functions, as statuses such as
+:class:`ChangeHealth <hearthbreaker.tags.status.ChangeHealth>` change their own amount when they are applied.
+"""
+
+_factories = {}
+
+
+class _Builder:
+    """
+    Keeps track of the objects which a compiled function refers to, and gives each of them a name
+    """
+    def __init__(self):
+        self.values = []
+
+    def bind(self, value):
+        self.values.append(value)
+        return "_{}".format(len(self.values) - 1)
+
+
+def _condition(builder, condition, source, obj):
+    condition_type = type(condition)
+    if condition_type is MinionIsNotTarget:
+        return "({} is not {})".format(obj, source)
+    if condition_type is MinionIsTarget:
+        return "({} is {})".format(obj, source)
+    if condition_type is IsMinion:
+        return "{}.is_minion()".format(obj)
+    if condition_type is IsHero:
+        return "{}.is_hero()".format(obj)
+    if condition_type is Not:
+        return "(not {})".format(_condition(builder, condition.condition, source, obj))
+    if condition_type is And and condition.conditions:
+        return "({})".format(" and ".join(_condition(builder, c, source, obj) for c in condition.conditions))
+    return "{}({}, {})".format(builder.bind(condition.evaluate), source, obj)
+
+
+def _players_match(builder, players, source, obj):
+    players_type = type(players)
+    if players_type is FriendlyPlayer:
+        return "{}.player is {}.player".format(obj, source)
+    if players_type is EnemyPlayer:
+        return "{}.player is {}.player.opponent".format(obj, source)
+    if players_type is BothPlayer:
+        return "True"
+    return "{}({}, {})".format(builder.bind(players.match), source, obj)
+
+
+def _players_list(builder, players, player):
+    players_type = type(players)
+    if players_type is FriendlyPlayer:
+        return "[{}]".format(player)
+    if players_type is EnemyPlayer:
+        return "[{}.opponent]".format(player)
+    if players_type is BothPlayer:
+        return "[{0}.opponent, {0}]".format(player)
+    return "{}({})".format(builder.bind(players.get_players), player)
+
+
+def _selector_match(builder, selector, source, obj):
+    selector_type = type(selector)
+    if selector_type is MinionSelector:
+        if selector.condition:
+            return "(not {0}.is_card() and {0}.is_minion() and not {0}.dead and {1} and {2})".format(
+                obj, _players_match(builder, selector.players, source, obj),
+                _condition(builder, selector.condition, source, obj))
+        return "({0}.is_minion() and {1} and not {0}.dead)".format(
+            obj, _players_match(builder, selector.players, source, obj))
+    if selector_type is CharacterSelector:
+        if selector.condition:
+            return "(not {0}.is_card() and not {0}.dead and {1} and {2})".format(
+                obj, _players_match(builder, selector.players, source, obj),
+                _condition(builder, selector.condition, source, obj))
+        return "(not {0}.is_card() and not {0}.dead and {1})".format(
+            obj, _players_match(builder, selector.players, source, obj))
+    if selector_type is HeroSelector:
+        return "({}.is_hero() and {})".format(obj, _players_match(builder, selector.players, source, obj))
+    if selector_type is CardSelector:
+        if selector.condition:
+            return "({}.is_card() and {} and {})".format(obj, _players_match(builder, selector.players, source, obj),
+                                                         _condition(builder, selector.condition, source, obj))
+        return "({}.is_card() and {})".format(obj, _players_match(builder, selector.players, source, obj))
+    if selector_type is SelfSelector:
+        return "({} is {})".format(source, obj)
+    return "{}({}, {})".format(builder.bind(selector.match), source, obj)
+
+
+def _selector_targets(builder, selector, source, target):
+    selector_type = type(selector)
+    if selector_type is MinionSelector:
+        targets = "[_m for _p in {} for _m in _p.minions if {}]".format(
+            _players_list(builder, selector.players, source + ".player"),
+            _selector_match(builder, selector, source, "_m"))
+    elif selector_type is CharacterSelector:
+        players = _players_list(builder, selector.players, source + ".player")
+        match = _selector_match(builder, selector, source, "_m")
+        # Minions come before heroes, as in CharacterSelector.get_targets
+        targets = "([_m for _p in {0} for _m in _p.minions if {1}] + " \
+                  "[_m for _p in {0} for _m in (_p.hero,) if {1}])".format(players, match)
+    elif selector_type is HeroSelector:
+        targets = "[_p.hero for _p in {}]".format(_players_list(builder, selector.players, source + ".player"))
+    elif selector_type is SelfSelector:
+        return "[{}]".format(source)
+    else:
+        return "{}({}, {})".format(builder.bind(selector.choose_targets), source, target)
+
+    if type(selector.picker) is AllPicker:
+        return targets
+    return "{}({}, {})".format(builder.bind(selector.picker.pick), source, targets)
+
+
+def _build(builder, source):
+    # Wrapping the function in a factory lets the same compiled code be reused for every tree with the same shape
+    names = ", ".join("_{}".format(index) for index in range(len(builder.values)))
+    factory_source = "def factory({}):\n{}    return compiled\n".format(names, source)
+    factory = _factories.get(factory_source)
+    if factory is None:
+        namespace = {}
+        exec(compile(factory_source, "<compiled tag>", "exec"), namespace)
+        factory = namespace["factory"]
+        _factories[factory_source] = factory
+    return factory(*builder.values)
+
+
+def compile_aura_match(aura):
+    """
+    Compile :meth:`Aura.match <hearthbreaker.tags.base.Aura.match>` for a particular aura.
+
+    :param hearthbreaker.tags.base.Aura aura: The aura to compile
+    :return: A function which takes the owner of the aura and an object, and returns True if the aura applies to that
+             object
+    """
+    builder = _Builder()
+    match = _selector_match(builder, aura.selector, "owner", "obj")
+    if aura.condition:
+        match = "{} and {}".format(_condition(builder, aura.condition, "owner", "owner"), match)
+    return _build(builder, "    def compiled(owner, obj):\n"
+                           "        return {}\n".format(match))
+
+
+def compile_action_tag(tag):
+    """
+    Compile :meth:`ActionTag.do <hearthbreaker.tags.base.ActionTag.do>` for a particular tag.
+
+    :param hearthbreaker.tags.base.ActionTag tag: The tag to compile
+    :return: A function with the same arguments and return value as :meth:`ActionTag.do`
+    """
+    builder = _Builder()
+    lines = ["    def compiled(owner, target=None, other=None):\n"]
+    if tag.condition:
+        lines.append("        if not {}:\n"
+                     "            return\n".format(_condition(builder, tag.condition, "owner", "target")))
+    lines.append("        found_target = False\n"
+                 "        for t in {}:\n"
+                 "            found_target = True\n"
+                 "            if t.is_valid():\n".format(_selector_targets(builder, tag.selector, "owner", "target")))
+    for action in tag.actions:
+        lines.append("                {}(owner, t, other)\n".format(builder.bind(action.act)))
+    if not tag.actions:
+        lines.append("                pass\n")
+    lines.append("        return found_target\n")
+    return _build(builder, "".join(lines))
@@ -1,9 +1,9 @@
 import hearthbreaker
 from hearthbreaker.constants import MINION_TYPE
-from hearthbreaker.tags.base import Condition, Amount
+from hearthbreaker.tags.base import Condition, Amount, Stateless, condition_registry
 
 
-class HasSecret(Condition):
+class HasSecret(Condition, Stateless):
     def evaluate(self, target, *args):
         return len(target.player.secrets) > 0
 
@@ -13,7 +13,7 @@ class HasSecret(Condition):
         }
 
 
-class IsSecret(Condition):
+class IsSecret(Condition, Stateless):
     def evaluate(self, target, obj, *args):
         return obj.is_secret()
 
@@ -23,7 +23,7 @@ class IsSecret(Condition):
         }
 
 
-class IsSpell(Condition):
+class IsSpell(Condition, Stateless):
     def evaluate(self, target, obj, *args):
         return obj.is_spell()
 
@@ -53,7 +53,7 @@ class CardMatches(Condition):
         return self
 
 
-class HasOverload(Condition):
+class HasOverload(Condition, Stateless):
 
     def evaluate(self, target, card, args):
         return card.overload > 0
@@ -94,7 +94,7 @@ class CardRarity(Condition):
         }
 
 
-class IsMinion(Condition):
+class IsMinion(Condition, Stateless):
     def evaluate(self, target, minion, *args):
         return minion.is_minion()
 
@@ -104,7 +104,7 @@ class IsMinion(Condition):
         }
 
 
-class TargetIsMinion(Condition):
+class TargetIsMinion(Condition, Stateless):
     def evaluate(self, owner, minion, target, *args):
         return target.is_minion()
 
@@ -114,7 +114,7 @@ class TargetIsMinion(Condition):
         }
 
 
-class IsWeapon(Condition):
+class IsWeapon(Condition, Stateless):
     def evaluate(self, target, weapon, *args):
         return weapon.is_weapon()
 
@@ -124,7 +124,7 @@ class IsWeapon(Condition):
         }
 
 
-class NotCurrentTarget(Condition):
+class NotCurrentTarget(Condition, Stateless):
     def evaluate(self, target, minion, *args):
         return minion is not target.current_target
 
@@ -134,7 +134,7 @@ class NotCurrentTarget(Condition):
         }
 
 
-class MinionIsTarget(Condition):
+class MinionIsTarget(Condition, Stateless):
     def evaluate(self, target, minion, *args):
         return minion is target
 
@@ -144,7 +144,7 @@ class MinionIsTarget(Condition):
         }
 
 
-class MinionIsNotTarget(Condition):
+class MinionIsNotTarget(Condition, Stateless):
     def evaluate(self, target, minion, *args):
         return minion is not target
 
@@ -154,7 +154,7 @@ class MinionIsNotTarget(Condition):
         }
 
 
-class CardIsNotTarget(Condition):
+class CardIsNotTarget(Condition, Stateless):
     def evaluate(self, target, card, *args):
         return target.card is not card
 
@@ -236,7 +236,7 @@ class IsType(Condition):
         return self
 
 
-class MinionHasDeathrattle(Condition):
+class MinionHasDeathrattle(Condition, Stateless):
     def __to_json__(self):
         return {
             'name': 'minion_has_deathrattle'
@@ -249,7 +249,7 @@ class MinionHasDeathrattle(Condition):
         return len(minion.deathrattle) > 0
 
 
-class HasBattlecry(Condition):
+class HasBattlecry(Condition, Stateless):
     def __to_json__(self):
         return {
             'name': 'has_battlecry'
@@ -318,7 +318,7 @@ class GreaterThan(Condition, metaclass=Amount):
         }
 
 
-class Adjacent(Condition):
+class Adjacent(Condition, Stateless):
     def __to_json__(self):
         return {
             'name': 'adjacent'
@@ -332,7 +332,7 @@ class Adjacent(Condition):
             (minion.index == target.index - 1) or (minion.index == target.index + 1)
 
 
-class TargetAdjacent(Condition):
+class TargetAdjacent(Condition, Stateless):
     def __to_json__(self):
         return {
             'name': 'target_adjacent'
@@ -399,7 +399,7 @@ class BaseAttackEqualTo(Condition):
         }
 
 
-class IsDamaged(Condition):
+class IsDamaged(Condition, Stateless):
     def evaluate(self, target, minion, *args):
         return minion.health != minion.calculate_max_health()
 
@@ -440,7 +440,7 @@ class OneIn(Condition):
         }
 
 
-class HasDivineShield(Condition):
+class HasDivineShield(Condition, Stateless):
     def evaluate(self, target, minion, *args):
         return minion.divine_shield
 
@@ -466,7 +466,7 @@ class HasCardName(Condition):
         }
 
 
-class OwnersTurn(Condition):
+class OwnersTurn(Condition, Stateless):
     def evaluate(self, target, minion, *args):
         return minion.player is minion.player.game.current_player
 
@@ -476,7 +476,7 @@ class OwnersTurn(Condition):
         }
 
 
-class IsHero(Condition):
+class IsHero(Condition, Stateless):
     def evaluate(self, target, character, *args):
         return character.is_hero()
 
@@ -506,3 +506,6 @@ class Matches(Condition):
         self.selector = Selector.from_json(**selector)
         self.condition = Condition.from_json(**condition)
         return self
+
+
+condition_registry.register(list(globals().values()))
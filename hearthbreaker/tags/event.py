@@ -1,4 +1,4 @@
-from hearthbreaker.tags.base import MinionEvent, PlayerEvent
+from hearthbreaker.tags.base import MinionEvent, PlayerEvent, event_registry
 from hearthbreaker.tags.condition import MinionIsNotTarget, CardIsNotTarget
 from hearthbreaker.tags.selector import FriendlyPlayer
 
@@ -16,6 +16,8 @@ class SpellCast(PlayerEvent):
     def unbind(self, target, func):
         for player in self.player.get_players(target.player):
             player.unbind("card_played", self.__action__)
+        self.__func__ = None
+        self.__target__ = None
 
     def __action__(self, card, index):
         if card.is_spell():
@@ -118,3 +120,6 @@ class Damaged(MinionEvent):
 class Drawn(MinionEvent):
     def __init__(self):
         super().__init__("drawn")
+
+
+event_registry.register(list(globals().values()))
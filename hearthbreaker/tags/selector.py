@@ -1,5 +1,6 @@
 import abc
-from hearthbreaker.tags.base import Selector, Player, Picker, Function, Amount, Condition
+from hearthbreaker.tags.base import Selector, Player, Picker, Function, Amount, Condition, Stateless, \
+    selector_registry, function_registry
 import hearthbreaker.tags.condition
 
 
@@ -80,7 +81,7 @@ class OtherPlayer(Player):
         return "other_player"
 
 
-class AllPicker(Picker):
+class AllPicker(Picker, Stateless):
     def pick(self, source, targets):
         return targets
 
@@ -90,7 +91,7 @@ class AllPicker(Picker):
         }
 
 
-class UserPicker(Picker):
+class UserPicker(Picker, Stateless):
     def pick(self, source, targets):
         if source.card.current_target:
             return [source.card.current_target]
@@ -387,7 +388,7 @@ class CharacterSelector(Selector):
         return self
 
 
-class SelfSelector(Selector):
+class SelfSelector(Selector, Stateless):
     def get_targets(self, source, obj=None):
         return [source]
 
@@ -560,7 +561,7 @@ class RandomAmount(Function):
         }
 
 
-class EventValue(Function):
+class EventValue(Function, Stateless):
     def __init__(self):
         pass
 
@@ -571,3 +572,7 @@ class EventValue(Function):
         return {
             'name': 'event_value'
         }
+
+
+selector_registry.register(list(globals().values()))
+function_registry.register(list(globals().values()))
@@ -1,4 +1,4 @@
-from hearthbreaker.tags.base import Status, Amount
+from hearthbreaker.tags.base import Status, Amount, Stateless, status_registry
 
 
 class ChangeAttack(Status, metaclass=Amount):
@@ -132,7 +132,7 @@ class ManaChange(Status, metaclass=Amount):
         }
 
 
-class Charge(Status):
+class Charge(Status, Stateless):
     def act(self, actor, target):
         pass
 
@@ -148,7 +148,7 @@ class Charge(Status):
         }
 
 
-class Taunt(Status):
+class Taunt(Status, Stateless):
     def act(self, actor, target):
         target.taunt += 1
 
@@ -161,7 +161,7 @@ class Taunt(Status):
         }
 
 
-class Stealth(Status):
+class Stealth(Status, Stateless):
     def act(self, actor, target):
         target.stealth += 1
 
@@ -174,7 +174,7 @@ class Stealth(Status):
         }
 
 
-class DivineShield(Status):
+class DivineShield(Status, Stateless):
     def act(self, actor, target):
         target.divine_shield += 1
 
@@ -187,7 +187,7 @@ class DivineShield(Status):
         }
 
 
-class Frozen(Status):
+class Frozen(Status, Stateless):
     def act(self, actor, target):
         target.frozen += 1
 
@@ -200,7 +200,7 @@ class Frozen(Status):
         }
 
 
-class Immune(Status):
+class Immune(Status, Stateless):
     def act(self, actor, target):
         target.immune += 1
 
@@ -213,7 +213,7 @@ class Immune(Status):
         }
 
 
-class Windfury(Status):
+class Windfury(Status, Stateless):
     def act(self, actor, target):
         pass
 
@@ -251,11 +251,18 @@ class CantAttack(Status):
         self._old_attack = None
 
     def act(self, actor, target):
-        self._old_attack = target.can_attack
+        # Only a replacement for can_attack is kept, as the target's own method would refer back to the target
+        self._old_attack = target.__dict__.get("can_attack")
         target.can_attack = lambda: False
 
     def unact(self, actor, target):
-        target.can_attack = self._old_attack
+        if self._old_attack is None:
+            target.__dict__.pop("can_attack", None)
+        else:
+            target.can_attack = self._old_attack
+
+    def __getstate__(self):
+        return {'_old_attack': None}
 
     def __to_json__(self):
         return {
@@ -281,7 +288,7 @@ class SpellDamage(Status):
         }
 
 
-class NoSpellTarget(Status):
+class NoSpellTarget(Status, Stateless):
     """
     Keeps a minion from being targeted by spells (can still be targeted by battlecries)
     """
@@ -298,7 +305,7 @@ class NoSpellTarget(Status):
         }
 
 
-class DoubleDeathrattle(Status):
+class DoubleDeathrattle(Status, Stateless):
     def act(self, actor, target):
         target.double_deathrattle += 1
 
@@ -311,7 +318,7 @@ class DoubleDeathrattle(Status):
         }
 
 
-class PowerTargetsMinions(Status):
+class PowerTargetsMinions(Status, Stateless):
     def act(self, actor, target):
         target.power_targets_minions += 1
 
@@ -324,7 +331,7 @@ class PowerTargetsMinions(Status):
         }
 
 
-class HealAsDamage(Status):
+class HealAsDamage(Status, Stateless):
     def act(self, actor, target):
         target.heal_does_damage += 1
 
@@ -346,11 +353,16 @@ class AttackEqualsHealth(Status):
         def attack_equal_to_health():
             return target.health
 
-        self._calculate_attack[target] = target.calculate_attack
+        self._calculate_attack[target] = target.__dict__.get("calculate_attack")
         target.calculate_attack = attack_equal_to_health
 
     def unact(self, actor, target):
-        target.calculate_attack = self._calculate_attack[target]
+        # As with CantAttack, the target's own method is used again by removing the replacement
+        calculate_attack = self._calculate_attack.pop(target)
+        if calculate_attack is None:
+            target.__dict__.pop("calculate_attack", None)
+        else:
+            target.calculate_attack = calculate_attack
 
     def __deep_copy__(self, memo):
         return AttackEqualsHealth()
@@ -358,13 +370,16 @@ class AttackEqualsHealth(Status):
     def __copy__(self):
         return AttackEqualsHealth()
 
+    def __getstate__(self):
+        return {'_calculate_attack': {}}
+
     def __to_json__(self):
         return {
             'name': 'attack_equals_health'
         }
 
 
-class Stolen(Status):
+class Stolen(Status, Stateless):
     def act(self, actor, target):
         pass
 
@@ -429,3 +444,6 @@ class IncreaseWeaponBonus(Status):
             'name': 'increase_weapon_bonus',
             'amount': self.amount
         }
+
+
+status_registry.register(list(globals().values()))
@@ -0,0 +1,50 @@
+import argparse
+import collections
+import functools
+import sys
+
+from hearthbreaker.agents import registry
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.deckopt import DeckOptimizer
+from run_games import load_deck
+
+__doc__ = """
+Evolves a deck of a class to beat a gauntlet of decks, and prints the best deck found.  See :mod:`hearthbreaker.deckopt`
+
+Usage: ``python optimize_deck.py [--generations N] [--checkpoint FILE] class deck ...``
+"""
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Search for a deck which beats a gauntlet of decks")
+    parser.add_argument("character_class", help="The class of the deck, such as Mage")
+    parser.add_argument("gauntlet", nargs="+", help="The deck files to play against")
+    parser.add_argument("--agent", choices=registry.get_names(), default="Random",
+                        help="The agent which plays every deck")
+    parser.add_argument("--generations", type=int, default=10, help="The number of generations to evolve")
+    parser.add_argument("--population", type=int, default=20, help="The number of decks in each generation")
+    parser.add_argument("--games", type=int, default=10, help="The number of seeds to play against each deck")
+    parser.add_argument("--processes", type=int, default=None, help="The number of processes to use")
+    parser.add_argument("--checkpoint", default=None, help="The file to save the search to, and carry it on from")
+    parser.add_argument("--seed", type=int, default=None, help="The seed for the search")
+    options = parser.parse_args(args)
+
+    agent = functools.partial(registry.create_agent, options.agent)
+    optimizer = DeckOptimizer(CHARACTER_CLASS.from_str(options.character_class),
+                              [(load_deck(filename), agent) for filename in options.gauntlet], agent,
+                              population=options.population, games=options.games, processes=options.processes,
+                              checkpoint=options.checkpoint, seed=options.seed)
+    optimizer.run(options.generations)
+
+    best = optimizer.best()
+    for name, count in sorted(collections.Counter(best).items()):
+        print("{} {}".format(count, name))
+    print("Win rate {:.3f} after {} generations, {} decks played".format(
+        optimizer.score(best), optimizer.generation, len(optimizer.fitness)))
+    if optimizer.failures:
+        print("{} games stopped with an exception and were counted as losses".format(optimizer.failures))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
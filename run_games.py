@@ -1,8 +1,10 @@
 import json
+import sys
 from hearthbreaker.agents.basic_agents import RandomAgent
 from hearthbreaker.cards.heroes import hero_for_class
 from hearthbreaker.constants import CHARACTER_CLASS
 from hearthbreaker.engine import Game, Deck, card_lookup
+from hearthbreaker.profiling import CardProfile
 from hearthbreaker.cards import *
 import timeit
 
@@ -29,30 +31,38 @@ def load_deck(filename):
     return Deck(cards, hero_for_class(character_class))
 
 
-def do_stuff():
+def do_stuff(instrument=False, profile_cards=False):
     _count = 0
 
     def play_game():
         nonlocal _count
         _count += 1
-        new_game = game.copy()
+        # Resetting the same game reuses its players, decks and undrawn cards, rather than copying them all
+        game.reset()
         try:
-            new_game.start()
+            game.start()
         except Exception as e:
-            print(json.dumps(new_game.__to_json__(), default=lambda o: o.__to_json__(), indent=1))
-            print(new_game._all_cards_played)
+            print(json.dumps(game.__to_json__(), default=lambda o: o.__to_json__(), indent=1))
+            print(game._all_cards_played)
             raise e
 
-        del new_game
-
         if _count % 1000 == 0:
             print("---- game #{} ----".format(_count))
 
     deck1 = load_deck("mage.hsdeck")
     deck2 = load_deck("mage2.hsdeck")
     game = Game([deck1, deck2], [RandomAgent(), RandomAgent()])
+    if instrument:
+        game.instrument()
 
-    print(timeit.timeit(play_game, 'gc.enable()', number=100000))
+    if profile_cards:
+        with CardProfile() as profile:
+            print(timeit.timeit(play_game, 'gc.enable()', number=100000))
+        print(profile.report())
+    else:
+        print(timeit.timeit(play_game, 'gc.enable()', number=100000))
+    if instrument:
+        print(game.counters.summary())
 
 if __name__ == "__main__":
-    do_stuff()
+    do_stuff("--instrument" in sys.argv, "--profile-cards" in sys.argv)
@@ -0,0 +1,55 @@
+import argparse
+import functools
+import os
+import sys
+
+from hearthbreaker.agents import registry
+from hearthbreaker.matchups import MatchupRunner
+from run_games import load_deck
+
+__doc__ = """
+Plays decks against a gauntlet of decks until each matchup has been decided.  See :mod:`hearthbreaker.matchups`
+
+Usage: ``python run_matchups.py [--gauntlet DECK ...] [--agent NAME] [--processes N] deck ...``
+"""
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Find which matchups between decks are favoured")
+    parser.add_argument("decks", nargs="+", help="The deck files to test")
+    parser.add_argument("--gauntlet", nargs="+", default=None,
+                        help="The deck files to play them against, if not each other")
+    parser.add_argument("--agent", choices=registry.get_names(), default="Random",
+                        help="The agent which plays every deck")
+    parser.add_argument("--margin", type=float, default=0.1, help="How far from even a matchup must be to be decided")
+    parser.add_argument("--max-games", type=int, default=500, help="The most games to play in each matchup")
+    parser.add_argument("--budget", type=int, default=None, help="The most games to play in all")
+    parser.add_argument("--processes", type=int, default=None, help="The number of processes to use")
+    options = parser.parse_args(args)
+
+    agent = functools.partial(registry.create_agent, options.agent)
+    players = [(load_deck(filename), agent) for filename in options.decks]
+    opponents = None
+    if options.gauntlet is not None:
+        opponents = [(load_deck(filename), agent) for filename in options.gauntlet]
+    runner = MatchupRunner(players, opponents, margin=options.margin, max_games=options.max_games,
+                           budget=options.budget, processes=options.processes)
+    matrix = runner.run()
+
+    names = [os.path.basename(filename) for filename in (options.gauntlet or options.decks)]
+    for filename, row in zip(options.decks, matrix):
+        for name, matchup in zip(names, row):
+            if matchup.games == 0:
+                continue
+            if matchup.favoured is None:
+                verdict = "undecided"
+            else:
+                verdict = "favoured" if matchup.favoured else "not favoured"
+            print("{} vs {}: {:.3f} over {} games, {}".format(os.path.basename(filename), name, matchup.win_rate,
+                                                              matchup.games, verdict))
+    print("{} games played".format(runner.games))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, RandomAgent
+from hearthbreaker.agents.beam import BeamPlannerAgent, board_value
+from hearthbreaker.cards import StonetuskBoar, Fireball, Moonfire, SenjinShieldmasta, Wisp
+from tests.testing_utils import generate_game_for
+
+
+class TestBeamPlannerAgent(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _game(self):
+        game = generate_game_for([Fireball, Moonfire, StonetuskBoar], SenjinShieldmasta, DoNothingAgent,
+                                 DoNothingAgent)
+        for turn in range(10):
+            game.play_single_turn()
+        game._start_turn()
+        return game, game.current_player
+
+    def test_lethal(self):
+        game, player = self._game()
+        player.opponent.hero.health = 10
+        agent = BeamPlannerAgent()
+        agent.do_turn(player)
+        self.assertTrue(player.opponent.hero.dead)
+        self.assertFalse(player.hero.dead)
+
+    def test_plan(self):
+        game, player = self._game()
+        SenjinShieldmasta().summon(player.opponent, game, 0)
+        agent = BeamPlannerAgent(beam_width=2, max_depth=3)
+        plan = agent.plan(player)
+        self.assertGreater(len(plan), 0)
+        self.assertLessEqual(len(plan), 3)
+        self.assertGreater(agent.nodes, 1)
+        # Planning doesn't change the game
+        self.assertEqual(6, player.mana)
+        self.assertEqual(1, len(player.opponent.minions))
+
+        before = board_value(game, player)
+        agent.do_turn(player)
+        self.assertGreater(board_value(game, player), before)
+
+    def test_evaluate(self):
+        game, player = self._game()
+        hand = list(player.hand)
+        agent = BeamPlannerAgent(evaluate=lambda game, player: player.mana)
+        self.assertEqual([], agent.plan(player))
+        agent.do_turn(player)
+        self.assertEqual(hand, player.hand)
+
+    def test_play_game(self):
+        game = generate_game_for([StonetuskBoar, Moonfire], Wisp, lambda: BeamPlannerAgent(beam_width=2, max_depth=3),
+                                 RandomAgent, run_pre_game=False)
+        game.start()
+        self.assertTrue(game.game_ended)
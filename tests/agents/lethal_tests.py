@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.agents.lethal import LethalSolver
+from hearthbreaker.agents.planning import play_plan
+from hearthbreaker.agents.trade_agent import TradeAgent
+from hearthbreaker.cards import StonetuskBoar, Fireball, Moonfire, SenjinShieldmasta
+from tests.testing_utils import generate_game_for
+
+
+class TestLethalSolver(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _game(self, cards, opponent_cards=SenjinShieldmasta, turns=10):
+        game = generate_game_for(cards, opponent_cards, DoNothingAgent, DoNothingAgent)
+        for turn in range(turns):
+            game.play_single_turn()
+        game._start_turn()
+        return game, game.current_player
+
+    def test_spells_and_charge(self):
+        game, player = self._game([Fireball, Moonfire, StonetuskBoar])
+        self.assertEqual(6, player.mana)
+        player.opponent.hero.health = 10
+
+        solver = LethalSolver()
+        plan = solver.solve(player)
+        self.assertIsNotNone(plan)
+        self.assertTrue(solver.complete)
+        self.assertFalse(game.game_ended)
+        self.assertEqual(10, player.opponent.hero.health)
+
+        self.assertTrue(play_plan(player, plan))
+        self.assertTrue(player.opponent.hero.dead)
+        self.assertFalse(player.hero.dead)
+
+    def test_taunt(self):
+        game, player = self._game(StonetuskBoar)
+        player.mana = 0
+        StonetuskBoar().summon(player, game, 0)
+        StonetuskBoar().summon(player, game, 0)
+        player.opponent.hero.health = 2
+        self.assertIsNotNone(LethalSolver().solve(player))
+
+        SenjinShieldmasta().summon(player.opponent, game, 0)
+        solver = LethalSolver()
+        self.assertIsNone(solver.solve(player))
+        self.assertTrue(solver.complete)
+
+    def test_max_nodes(self):
+        game, player = self._game([Fireball, Moonfire, StonetuskBoar])
+        solver = LethalSolver(max_nodes=20)
+        self.assertIsNone(solver.solve(player))
+        self.assertFalse(solver.complete)
+        self.assertEqual(21, solver.nodes)
+
+    def test_trade_agent(self):
+        game, player = self._game([Fireball, Moonfire, StonetuskBoar])
+        player.opponent.hero.health = 10
+        agent = TradeAgent(find_lethal=True)
+        player.agent = agent
+        agent.do_turn(player)
+        self.assertTrue(game.game_ended)
+        self.assertTrue(player.opponent.hero.dead)
+
+    def test_trade_agent_default(self):
+        game, player = self._game([Fireball, Moonfire, StonetuskBoar])
+        player.opponent.hero.health = 10
+        agent = TradeAgent()
+        agent.play_lethal = lambda player: self.fail("Lethal was searched for")
+        player.agent = agent
+        agent.do_turn(player)
@@ -0,0 +1,61 @@
+import random
+import time
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, RandomAgent
+from hearthbreaker.agents.monte_carlo import FlatMonteCarloAgent
+from hearthbreaker.cards import StonetuskBoar, Wisp, Moonfire
+from hearthbreaker.decisions import legal_actions
+from tests.testing_utils import generate_game_for
+
+
+class TestFlatMonteCarloAgent(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _lethal_game(self):
+        # The first player can win by attacking with their boar, but will probably lose if they end their turn
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        for turn in range(4):
+            game.play_single_turn()
+        game._start_turn()
+        player = game.current_player
+        StonetuskBoar().summon(player, game, 0)
+        player.mana = 0
+        player.hero.power.used = True
+        player.hero.health = 1
+        player.opponent.hero.health = 1
+        return game, player
+
+    def test_iterations(self):
+        game, player = self._lethal_game()
+        agent = FlatMonteCarloAgent(iterations=30)
+        actions = legal_actions(player)
+        self.assertEqual(["attack"], [action.kind for action in actions])
+
+        choice = agent.choose_action(player, actions)
+        self.assertEqual(0, choice)
+        self.assertEqual(30, agent.playouts)
+        self.assertEqual(1, player.opponent.hero.health)
+
+    def test_small_budget(self):
+        game, player = self._lethal_game()
+        for iterations in range(3):
+            agent = FlatMonteCarloAgent(iterations=iterations)
+            agent.choose_action(player, legal_actions(player))
+            self.assertEqual(iterations, agent.playouts)
+
+    def test_time_budget(self):
+        game, player = self._lethal_game()
+        agent = FlatMonteCarloAgent(time_budget=0.05)
+        start = time.perf_counter()
+        choice = agent.choose_action(player, legal_actions(player))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(0, choice)
+        self.assertGreater(agent.playouts, 0)
+
+    def test_play_game(self):
+        game = generate_game_for([StonetuskBoar, Moonfire], Wisp, lambda: FlatMonteCarloAgent(iterations=4),
+                                 RandomAgent, run_pre_game=False)
+        game.start()
+        self.assertTrue(game.game_ended)
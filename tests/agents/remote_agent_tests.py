@@ -0,0 +1,92 @@
+import os
+import random
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from hearthbreaker.agents import registry
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.agents.beam import BeamPlannerAgent
+from hearthbreaker.agents.monte_carlo import FlatMonteCarloAgent
+from hearthbreaker.agents.remote import AgentServer, AsyncRemoteAgent, RemoteAgentError, SOCKET_VARIABLE, \
+    connection_pool, play_games
+from hearthbreaker.cards import StonetuskBoar, Moonfire, RaidLeader, Wisp, ArcaneExplosion, ShatteredSunCleric
+from tests.testing_utils import generate_game_for
+
+
+class BrokenAgent(RandomAgent):
+    def choose_target(self, targets):
+        raise ValueError("no target")
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class TestRemoteAgent(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "agent.sock")
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        connection_pool(self.path).close()
+        shutil.rmtree(self.directory)
+
+    def _serve(self, agent_factory):
+        server = AgentServer(self.path, agent_factory)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.servers.append(server)
+
+    def _game(self):
+        return generate_game_for([StonetuskBoar, Moonfire, RaidLeader, ShatteredSunCleric], [Wisp, ArcaneExplosion],
+                                 lambda: AsyncRemoteAgent(self.path), RandomAgent, run_pre_game=False)
+
+    def test_agent(self):
+        self._serve(RandomAgent)
+        game = self._game()
+        game.start()
+        self.assertTrue(game.game_ended)
+
+    def test_search_agent(self):
+        # Agents which look ahead play out copies of the server's game, which mustn't stop at the first move
+        for agent_factory in [lambda: FlatMonteCarloAgent(iterations=4), BeamPlannerAgent]:
+            self._serve(agent_factory)
+            game = self._game()
+            game.start()
+            self.assertTrue(game.game_ended)
+            server = self.servers.pop()
+            server.shutdown()
+            server.server_close()
+            connection_pool(self.path).close()
+            os.remove(self.path)
+
+    def test_play_games(self):
+        self._serve(RandomAgent)
+        games = [self._game() for i in range(6)]
+        agents = [player.agent for game in games for player in game.players]
+        play_games(games, depth=2)
+        for game in games:
+            self.assertTrue(game.game_ended)
+        self.assertEqual(agents, [player.agent for game in games for player in game.players])
+
+    def test_error(self):
+        self._serve(BrokenAgent)
+        games = [self._game() for i in range(3)]
+        self.assertRaises(RemoteAgentError, play_games, games)
+
+    def test_registry(self):
+        old_path = os.environ.pop(SOCKET_VARIABLE, None)
+        try:
+            self.assertRaises(RemoteAgentError, registry.create_agent, "Remote")
+            os.environ[SOCKET_VARIABLE] = self.path
+            self.assertEqual(self.path, registry.create_agent("Remote").path)
+        finally:
+            os.environ.pop(SOCKET_VARIABLE, None)
+            if old_path is not None:
+                os.environ[SOCKET_VARIABLE] = old_path
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, RandomAgent
+from hearthbreaker.agents.rollout import RolloutAgent
+from hearthbreaker.cards import StonetuskBoar, Wisp, ChillwindYeti, Moonfire
+from tests.testing_utils import generate_game_for
+
+
+class TestRolloutAgent(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _game(self):
+        game = generate_game_for([StonetuskBoar, Moonfire, Wisp], Wisp, DoNothingAgent, DoNothingAgent)
+        for turn in range(10):
+            game.play_single_turn()
+        game._start_turn()
+        return game, game.current_player
+
+    def _attack_game(self):
+        game, player = self._game()
+        player.hand = []
+        player.hero.power.used = True
+        yeti = ChillwindYeti()
+        yeti.summon(player, game, 0)
+        player.minions[0].exhausted = False
+        for minion in list(player.opponent.minions):
+            minion.die(None)
+        game.check_delayed()
+        Wisp().summon(player.opponent, game, 0)
+        return game, player
+
+    def test_turn(self):
+        game, player = self._game()
+        player.agent = RolloutAgent(seed=5)
+        player.agent.do_turn(player)
+
+        self.assertFalse(player.hero.power.can_use())
+        self.assertFalse(any(card.can_use(player, game) for card in player.hand))
+        self.assertFalse(any(minion.can_attack() for minion in player.minions))
+        self.assertFalse(player.hero.can_attack())
+        self.assertNotIn("minion_placed", player.events)
+
+    def test_seed(self):
+        healths = []
+        for attempt in range(2):
+            random.seed(1857)
+            game, player = self._game()
+            player.agent = RolloutAgent(seed=5)
+            player.agent.do_turn(player)
+            healths.append((player.opponent.hero.health, [minion.health for minion in player.opponent.minions]))
+        self.assertEqual(healths[0], healths[1])
+
+    def test_face(self):
+        game, player = self._attack_game()
+        player.agent = RolloutAgent("face")
+        player.agent.do_turn(player)
+        self.assertEqual(26, player.opponent.hero.health)
+        self.assertEqual(1, len(player.opponent.minions))
+
+    def test_trades(self):
+        game, player = self._attack_game()
+        player.agent = RolloutAgent("trades")
+        player.agent.do_turn(player)
+        self.assertEqual(30, player.opponent.hero.health)
+        self.assertEqual(0, len(player.opponent.minions))
+        self.assertEqual(1, len(player.minions))
+
+    def test_mode(self):
+        self.assertRaises(ValueError, RolloutAgent, "aggro")
+
+    def test_play_game(self):
+        for mode in RolloutAgent.modes:
+            game = generate_game_for([StonetuskBoar, Moonfire], Wisp, lambda: RolloutAgent(mode), RandomAgent,
+                                     run_pre_game=False)
+            game.start()
+            self.assertTrue(game.game_ended)
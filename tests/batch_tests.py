@@ -0,0 +1,104 @@
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import RandomAgent
+from hearthbreaker.batch import BatchRunner
+from hearthbreaker.cards import StonetuskBoar, ArcaneExplosion, Moonfire, RaidLeader, Wisp
+from tests.testing_utils import generate_game_for
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _game(self):
+        return generate_game_for([StonetuskBoar, Moonfire, RaidLeader], [Wisp, ArcaneExplosion], RandomAgent,
+                                 RandomAgent, run_pre_game=False)
+
+    def _result(self, game):
+        return game._turns_passed, [(player.hero.health, len(player.minions)) for player in game.players]
+
+    def test_delegate(self):
+        random.seed(1857)
+        game = self._game()
+        game.start()
+        expected = self._result(game)
+
+        random.seed(1857)
+        batched_game = self._game()
+        agents = [player.agent for player in batched_game.players]
+        BatchRunner(BatchRunner.delegate).run([batched_game])
+        self.assertTrue(batched_game.game_ended)
+        self.assertEqual(expected, self._result(batched_game))
+        self.assertEqual(agents, [player.agent for player in batched_game.players])
+
+    def test_lockstep(self):
+        games = [self._game() for i in range(5)]
+        sizes = []
+
+        def decide(decisions):
+            sizes.append(len(decisions))
+            self.assertEqual(len(decisions), len(set(decision.game for decision in decisions)))
+            return BatchRunner.delegate(decisions)
+        runner = BatchRunner(decide)
+        runner.run(games)
+
+        for game in games:
+            self.assertTrue(game.game_ended)
+        self.assertEqual(5, sizes[0])
+        self.assertEqual(len(sizes), runner.batches)
+        self.assertEqual(sum(sizes), runner.decisions)
+
+    def test_max_games(self):
+        games = [self._game() for i in range(5)]
+        sizes = []
+
+        def decide(decisions):
+            sizes.append(len(decisions))
+            return BatchRunner.delegate(decisions)
+        BatchRunner(decide, max_games=2).run(games)
+        for game in games:
+            self.assertTrue(game.game_ended)
+        self.assertEqual(2, max(sizes))
+
+    def test_single_moves(self):
+        game = self._game()
+        moves = []
+
+        def decide(decisions):
+            answers = []
+            for decision in decisions:
+                if decision.kind == "do_turn":
+                    player = decision.player
+                    playable = [card for card in player.hand if card.can_use(player, player.game)]
+                    if playable:
+                        moves.append(decision.turn_moves)
+                        answers.append(lambda card=playable[0]: card.player.game.play_card(card))
+                    else:
+                        answers.append(None)
+                else:
+                    answers.append(BatchRunner.delegate([decision])[0])
+            return answers
+        BatchRunner(decide).run([game])
+        self.assertTrue(game.game_ended)
+        self.assertIn(1, moves)
+
+    def test_error(self):
+        games = [self._game() for i in range(3)]
+        agents = [player.agent for game in games for player in game.players]
+
+        def decide(decisions):
+            if decisions[0].kind == "do_turn":
+                raise ValueError("no decision")
+            return BatchRunner.delegate(decisions)
+        self.assertRaises(ValueError, BatchRunner(decide).run, games)
+        self.assertEqual(agents, [player.agent for game in games for player in game.players])
+
+    def test_missing_answers(self):
+        games = [self._game() for i in range(3)]
+        agents = [player.agent for game in games for player in game.players]
+
+        def decide(decisions):
+            return BatchRunner.delegate(decisions)[1:]
+        self.assertRaises(ValueError, BatchRunner(decide).run, games)
+        self.assertEqual(agents, [player.agent for game in games for player in game.players])
@@ -0,0 +1,34 @@
+import os
+import shutil
+import tempfile
+import unittest
+from benchmarks.history import compare, load_history, record
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "history.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_record(self):
+        self.assertEqual([], load_history(self.path))
+        record({'copy_0_minions': 0.002}, self.path)
+        record({'copy_0_minions': 0.003}, self.path, "slower")
+
+        history = load_history(self.path)
+        self.assertEqual(2, len(history))
+        self.assertEqual({'copy_0_minions': 0.002}, history[0]['results'])
+        self.assertEqual("slower", history[1]['label'])
+
+    def test_compare(self):
+        old = {'serialize': 1.0, 'deserialize': 2.0, 'card_lookup': 1.0, 'removed': 1.0}
+        new = {'serialize': 1.05, 'deserialize': 1.0, 'card_lookup': 1.5, 'added': 1.0}
+        ratios, regressions = compare(old, new, 0.1)
+        self.assertEqual([('card_lookup', 1.5), ('deserialize', 0.5), ('serialize', 1.05)], ratios)
+        self.assertEqual(['card_lookup'], regressions)
+
+        ratios, regressions = compare(old, new, 0.01)
+        self.assertEqual(['card_lookup', 'serialize'], regressions)
@@ -0,0 +1,55 @@
+import pickle
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.cards import StonetuskBoar, Wisp, RaidLeader, StormwindChampion, DireWolfAlpha, FlametongueTotem, \
+    MurlocWarleader, SouthseaCaptain, SorcerersApprentice, ArcaneExplosion, Fireball
+from hearthbreaker.tags.compiler import compile_aura_match
+from tests.testing_utils import generate_game_for
+
+
+class TestCompiler(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+        self.game = generate_game_for(StonetuskBoar, Wisp, DoNothingAgent, DoNothingAgent)
+        self.game.play_single_turn()
+        for card in [RaidLeader, DireWolfAlpha, SouthseaCaptain, FlametongueTotem, SorcerersApprentice]:
+            card().summon(self.game.players[0], self.game, len(self.game.players[0].minions))
+        for card in [StormwindChampion, MurlocWarleader, RaidLeader, StonetuskBoar]:
+            card().summon(self.game.players[1], self.game, len(self.game.players[1].minions))
+
+    def test_aura_match(self):
+        objects = []
+        for player in self.game.players:
+            objects.extend(player.minions)
+            objects.append(player.hero)
+            objects.extend(player.hand)
+        objects.extend([ArcaneExplosion(), Fireball()])
+        objects[-1].player = self.game.players[0]
+        objects[-2].player = self.game.players[1]
+
+        for player in self.game.players:
+            for aura in player.object_auras:
+                for obj in objects:
+                    expected = (not aura.condition or aura.condition.evaluate(aura.owner, aura.owner)) and \
+                        aura.selector.match(aura.owner, obj)
+                    self.assertEqual(bool(expected), bool(aura.match(obj)))
+
+    def test_shared_code(self):
+        first = self.game.players[0].object_auras[0]
+        second = self.game.players[1].object_auras[-1]
+        self.assertEqual(str(first), str(second))
+        self.assertIsNot(first, second)
+        self.assertIs(compile_aura_match(first).__code__, compile_aura_match(second).__code__)
+
+    def test_copies(self):
+        self.assertEqual(3, self.game.players[0].minions[1].calculate_attack())
+        for aura in self.game.players[0].object_auras:
+            self.assertTrue(hasattr(aura, "_compiled_match"))
+
+        for game in [self.game.copy(), pickle.loads(pickle.dumps(self.game))]:
+            for aura in game.players[0].object_auras:
+                self.assertFalse(hasattr(aura, "_compiled_match"))
+            self.assertEqual(3, game.players[0].minions[1].calculate_attack())
+            self.assertEqual(self.game.state_hash(), game.state_hash())
@@ -0,0 +1,153 @@
+import gc
+import random
+import threading
+import unittest
+
+from hearthbreaker.agents.basic_agents import RandomAgent, PredictableAgent
+from hearthbreaker.cards import StonetuskBoar, Moonfire, RaidLeader, Wisp, ArcaneExplosion
+import hearthbreaker.decisions
+from hearthbreaker.decisions import Action
+from tests.testing_utils import generate_game_for
+
+
+class TestDecisions(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def _game(self, agent_type=RandomAgent):
+        return generate_game_for([StonetuskBoar, Moonfire, RaidLeader], [Wisp, ArcaneExplosion], agent_type,
+                                 agent_type, run_pre_game=False)
+
+    def _result(self, game):
+        return game._turns_passed, [(player.hero.health, len(player.minions)) for player in game.players]
+
+    def _play(self, decisions, choose):
+        kinds = []
+        try:
+            decision = next(decisions)
+            while True:
+                kinds.append(decision.kind)
+                decision = decisions.send(choose(decision))
+        except StopIteration:
+            pass
+        return kinds
+
+    def test_ask_agent(self):
+        game = self._game()
+        game.start()
+        expected = self._result(game)
+
+        random.seed(1857)
+        game = self._game()
+        agents = [player.agent for player in game.players]
+        kinds = self._play(game.run(), lambda decision: decision.ask())
+        self.assertTrue(game.game_ended)
+        self.assertEqual(expected, self._result(game))
+        self.assertEqual(agents, [player.agent for player in game.players])
+        self.assertEqual(["do_card_check", "do_card_check", "do_turn"], kinds[:3])
+
+    def test_options(self):
+        game = self._game(PredictableAgent)
+
+        def choose(decision):
+            options = decision.options
+            if decision.kind == "do_turn":
+                for option in options:
+                    self.assertIsInstance(option, Action)
+                    self.assertIn(option.kind, ["play", "attack", "power"])
+                if options:
+                    return options[0]
+                return None
+            elif decision.kind == "do_card_check":
+                self.assertEqual(list(decision.args[0]), options)
+                return decision.ask()
+            self.assertNotEqual([], options)
+            return options[-1]
+        self._play(game.run(), choose)
+        self.assertTrue(game.game_ended)
+
+    def test_close(self):
+        game = self._game()
+        agents = [player.agent for player in game.players]
+        decisions = game.run()
+        decision = next(decisions)
+        decision = decisions.send(decision.ask())
+        decisions.close()
+        self.assertFalse(game.game_ended)
+        self.assertEqual(agents, [player.agent for player in game.players])
+
+    def test_abandoned(self):
+        # A generator which is thrown away part way through a game stops the game
+        game = self._game()
+        agents = [player.agent for player in game.players]
+        decisions = game.run()
+        next(decisions)
+        del decisions
+        gc.collect()
+        self.assertFalse(game.game_ended)
+        self.assertEqual(agents, [player.agent for player in game.players])
+
+    def test_error(self):
+        game = self._game()
+        agents = [player.agent for player in game.players]
+
+        def fail():
+            raise ValueError("no move")
+        decisions = game.run()
+        decision = next(decisions)
+        while decision.kind != "do_turn":
+            decision = decisions.send(decision.ask())
+        self.assertRaises(ValueError, decisions.send, fail)
+        self.assertEqual(agents, [player.agent for player in game.players])
+
+    @unittest.skipIf(hearthbreaker.decisions.greenlet is None, "greenlet is not installed")
+    def test_many_games(self):
+        # Games are interleaved on this thread, so there can be more of them than there could be threads
+        threads = threading.active_count()
+        runs = [self._game().run() for index in range(hearthbreaker.decisions.MAX_RUNNING + 1)]
+        for decisions in runs:
+            next(decisions)
+        self.assertEqual(threads, threading.active_count())
+        for decisions in runs:
+            decisions.close()
+
+
+class TestThreadedDecisions(TestDecisions):
+    # The same as above, but with each game played in a thread of its own, as when greenlet is not installed
+    def setUp(self):
+        super().setUp()
+        self.greenlet = hearthbreaker.decisions.greenlet
+        hearthbreaker.decisions.greenlet = None
+
+    def tearDown(self):
+        hearthbreaker.decisions.greenlet = self.greenlet
+
+    def test_many_games(self):
+        pass
+
+    def test_abandoned(self):
+        # A generator which is thrown away part way through a game gives back the game's thread
+        threads = threading.active_count()
+        game = self._game()
+        agents = [player.agent for player in game.players]
+        decisions = game.run()
+        next(decisions)
+        self.assertEqual(threads + 1, threading.active_count())
+        del decisions
+        gc.collect()
+        self.assertEqual(threads, threading.active_count())
+        self.assertEqual(agents, [player.agent for player in game.players])
+
+    def test_max_running(self):
+        old_max = hearthbreaker.decisions.MAX_RUNNING
+        hearthbreaker.decisions.MAX_RUNNING = 1
+        try:
+            first = self._game().run()
+            next(first)
+            self.assertRaises(RuntimeError, next, self._game().run())
+            first.close()
+            second = self._game().run()
+            next(second)
+            second.close()
+        finally:
+            hearthbreaker.decisions.MAX_RUNNING = old_max
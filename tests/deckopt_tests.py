@@ -0,0 +1,151 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent
+from hearthbreaker.cards import Wisp
+from hearthbreaker.cards.heroes import Jaina
+from hearthbreaker.constants import CHARACTER_CLASS
+from hearthbreaker.deckopt import DeckOptimizer, card_pool, deck_hash, is_legal, make_deck
+from hearthbreaker.engine import Deck
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class _BrokenAgent(DoNothingAgent):
+    def do_turn(self, player):
+        raise RuntimeError("broken")
+
+
+def _gauntlet():
+    return [(Deck([Wisp() for index in range(30)], Jaina()), DoNothingAgent)]
+
+
+class TestDecklists(unittest.TestCase):
+    def setUp(self):
+        self.optimizer = DeckOptimizer(CHARACTER_CLASS.MAGE, _gauntlet(), seed=1857)
+
+    def test_card_pool(self):
+        pool = card_pool(CHARACTER_CLASS.MAGE)
+        self.assertIn("Fireball", pool)
+        self.assertIn("Wisp", pool)
+        self.assertNotIn("Execute", pool)
+        self.assertNotIn("The Coin", pool)
+
+    def test_is_legal(self):
+        decklist = ["Wisp"] * 2 + ["Fireball"] * 2 + ["Frostbolt"] * 2 + ["Alexstrasza"] + ["Chillwind Yeti"] * 2
+        decklist += ["Arcane Missiles"] * 2 + ["Boulderfist Ogre"] * 2 + ["Bloodfen Raptor"] * 2 + ["Mana Wyrm"] * 2
+        decklist += ["Water Elemental"] * 2 + ["Polymorph"] * 2 + ["Flamestrike"] * 2 + ["Arcane Intellect"] * 2
+        decklist += ["Novice Engineer"] * 2 + ["Stonetusk Boar"] * 2 + ["Ironforge Rifleman"]
+        self.assertTrue(is_legal(decklist, CHARACTER_CLASS.MAGE))
+        self.assertFalse(is_legal(decklist, CHARACTER_CLASS.WARRIOR))
+        self.assertFalse(is_legal(decklist[:-1], CHARACTER_CLASS.MAGE))
+        self.assertFalse(is_legal(decklist[:-1] + ["Wisp"], CHARACTER_CLASS.MAGE))
+        self.assertFalse(is_legal(decklist[:-1] + ["Alexstrasza"], CHARACTER_CLASS.MAGE))
+        self.assertFalse(is_legal(decklist[:-1] + ["The Coin"], CHARACTER_CLASS.MAGE))
+
+    def test_deck_hash(self):
+        decklist = self.optimizer.random_decklist()
+        self.assertEqual(deck_hash(decklist, CHARACTER_CLASS.MAGE), deck_hash(decklist[::-1], CHARACTER_CLASS.MAGE))
+        self.assertNotEqual(deck_hash(decklist, CHARACTER_CLASS.MAGE), deck_hash(decklist, CHARACTER_CLASS.DRUID))
+        self.assertNotEqual(deck_hash(decklist, CHARACTER_CLASS.MAGE),
+                            deck_hash(decklist[1:] + ["Wisp"], CHARACTER_CLASS.MAGE))
+
+    def test_breeding(self):
+        first = self.optimizer.random_decklist()
+        second = self.optimizer.random_decklist()
+        for attempt in range(20):
+            self.assertTrue(is_legal(self.optimizer.random_decklist(), CHARACTER_CLASS.MAGE))
+            child = self.optimizer.crossover(first, second)
+            self.assertTrue(is_legal(child, CHARACTER_CLASS.MAGE))
+            self.assertLessEqual(set(child), set(first) | set(second))
+            mutant = self.optimizer.mutate(child)
+            self.assertTrue(is_legal(mutant, CHARACTER_CLASS.MAGE))
+            self.assertGreaterEqual(len(set(child) & set(mutant)), len(set(child)) - 3)
+
+    def test_make_deck(self):
+        deck = make_deck(self.optimizer.random_decklist(), CHARACTER_CLASS.MAGE)
+        self.assertEqual(30, len(deck.cards))
+        self.assertEqual(CHARACTER_CLASS.MAGE, deck.hero.character_class)
+
+
+class TestDeckOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.directory, "search.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _optimizer(self, checkpoint=None):
+        return DeckOptimizer(CHARACTER_CLASS.HUNTER, _gauntlet(), PredictableAgent, population=4, games=1, elite=1,
+                             processes=1, checkpoint=checkpoint, seed=1857)
+
+    def test_run(self):
+        optimizer = self._optimizer()
+        optimizer.run(2)
+        self.assertEqual(2, optimizer.generation)
+        self.assertEqual(4, len(optimizer.population))
+        self.assertLessEqual(optimizer.evaluated, 7)
+        self.assertEqual(optimizer.evaluated, len(optimizer.fitness))
+        self.assertEqual(0, optimizer.failures)
+        for decklist in optimizer.population:
+            self.assertTrue(is_legal(decklist, CHARACTER_CLASS.HUNTER))
+            self.assertGreaterEqual(optimizer.score(decklist), 0)
+            self.assertLessEqual(optimizer.score(decklist), 1)
+        best = optimizer.best()
+        self.assertEqual(max(optimizer.score(decklist) for decklist in optimizer.population), optimizer.score(best))
+
+        optimizer.run(1)
+        self.assertEqual(3, optimizer.generation)
+        # The best deck is kept, and isn't played again
+        self.assertLessEqual(optimizer.evaluated, 3)
+        self.assertGreaterEqual(optimizer.score(optimizer.best()), optimizer.score(best))
+
+    def test_checkpoint(self):
+        uninterrupted = self._optimizer()
+        uninterrupted.run(3)
+
+        self._optimizer(self.checkpoint).run(2)
+        self.assertEqual([], [name for name in os.listdir(self.directory) if name != "search.json"])
+        resumed = self._optimizer(self.checkpoint)
+        self.assertEqual(2, resumed.generation)
+        resumed.run(1)
+        self.assertEqual(uninterrupted.population, resumed.population)
+        self.assertEqual(uninterrupted.fitness, resumed.fitness)
+
+    def test_checkpoint_settings(self):
+        self._optimizer(self.checkpoint).run(1)
+        self.assertRaises(ValueError, DeckOptimizer, CHARACTER_CLASS.MAGE, _gauntlet(), checkpoint=self.checkpoint)
+
+    def test_checkpoint_agents(self):
+        self._optimizer(self.checkpoint).run(1)
+        self.assertRaises(ValueError, DeckOptimizer, CHARACTER_CLASS.HUNTER, _gauntlet(), DoNothingAgent,
+                          population=4, games=1, checkpoint=self.checkpoint)
+        gauntlet = [(deck, PredictableAgent) for deck, opponent in _gauntlet()]
+        self.assertRaises(ValueError, DeckOptimizer, CHARACTER_CLASS.HUNTER, gauntlet, PredictableAgent,
+                          population=4, games=1, checkpoint=self.checkpoint)
+
+    def test_failures(self):
+        optimizer = DeckOptimizer(CHARACTER_CLASS.HUNTER, _gauntlet(), _BrokenAgent, population=2, games=2, elite=1,
+                                  processes=1, seed=1857)
+        handler = _ListHandler()
+        logging.getLogger("hearthbreaker.deckopt").addHandler(handler)
+        try:
+            optimizer.run(1)
+        finally:
+            logging.getLogger("hearthbreaker.deckopt").removeHandler(handler)
+        self.assertNotEqual([], handler.records)
+        # Each deck plays each seed twice, and loses every game
+        self.assertEqual(4 * optimizer.evaluated, optimizer.failures)
+        for decklist in optimizer.population:
+            self.assertEqual(0, optimizer.score(decklist))
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, RandomAgent, PredictableAgent
+from hearthbreaker.cards import StonetuskBoar, Wisp, Moonfire, ChillwindYeti
+from hearthbreaker.engine import Game, Deck
+from hearthbreaker.evaluation import compare_agents, play_seeded
+from hearthbreaker.cards.heroes import Jaina, Malfurion
+
+
+def _decks():
+    return [Deck([StonetuskBoar() if index % 2 else ChillwindYeti() for index in range(30)], Jaina()),
+            Deck([Wisp() if index % 2 else Moonfire() for index in range(30)], Malfurion())]
+
+
+class TestSeededGame(unittest.TestCase):
+    def _hands(self, seed):
+        random.seed(seed * 7)
+        game = Game(_decks(), [RandomAgent(), RandomAgent()], seed)
+        game.pre_game()
+        return game.first_player, [[card.name for card in player.hand] for player in game.players]
+
+    def test_seed(self):
+        self.assertEqual(self._hands(5), self._hands(5))
+        self.assertNotEqual(self._hands(5), self._hands(6))
+
+    def test_global_random(self):
+        random.seed(1857)
+        state = random.getstate()
+        game = Game(_decks(), [DoNothingAgent(), DoNothingAgent()], 5)
+        game.start()
+        self.assertEqual(state, random.getstate())
+
+    def test_draws(self):
+        # The cards drawn don't depend on how many random numbers the game used for anything else
+        hands = []
+        for effects in range(2):
+            game = Game(_decks(), [DoNothingAgent(), DoNothingAgent()], 5)
+            for number in range(effects):
+                game.random_amount(0, 10)
+            game.players[0].draw()
+            game.players[0].draw()
+            hands.append([card.name for card in game.players[0].hand])
+        self.assertEqual(hands[0], hands[1])
+
+    def test_copy(self):
+        games = [Game(_decks(), [RandomAgent(), RandomAgent()], 5) for index in range(2)]
+        for game in games:
+            game.pre_game()
+        copied_game = games[0].copy()
+        copied_game.play_single_turn()
+        copied_game.random_amount(0, 10)
+        self.assertEqual(games[1].random_amount(0, 1000), games[0].random_amount(0, 1000))
+
+    def test_decks_unchanged(self):
+        # The decks can be used again for games which aren't seeded, which draw using the global generator
+        decks = _decks()
+        attributes = [sorted(vars(deck)) for deck in decks]
+        Game(decks, [PredictableAgent(), PredictableAgent()], 5).start()
+        self.assertEqual(attributes, [sorted(vars(deck)) for deck in decks])
+        game = Game(decks, [DoNothingAgent(), DoNothingAgent()])
+        state = random.getstate()
+        game.players[0].draw()
+        self.assertNotEqual(state, random.getstate())
+
+    def test_reset(self):
+        game = Game(_decks(), [PredictableAgent(), PredictableAgent()], 5)
+        game.start()
+        first = game._turns_passed
+        game.reset(5)
+        game.start()
+        self.assertEqual(first, game._turns_passed)
+
+
+class TestCompareAgents(unittest.TestCase):
+    def test_play_seeded(self):
+        decks = _decks()
+        results = [play_seeded(decks, [RandomAgent(), RandomAgent()], seed) for seed in range(5)]
+        self.assertEqual(results, [play_seeded(decks, [RandomAgent(), RandomAgent()], seed) for seed in range(5)])
+        self.assertEqual(0.0, play_seeded(decks, [DoNothingAgent(), PredictableAgent()], 3))
+        self.assertEqual(1.0, play_seeded(decks, [PredictableAgent(), DoNothingAgent()], 3))
+        self.assertEqual(30, decks[0].left)
+
+    def test_same_agent(self):
+        comparison = compare_agents(_decks(), RandomAgent, RandomAgent, seeds=range(4))
+        self.assertEqual([0.0] * 4, comparison.differences)
+        self.assertEqual((0.0, 0.0), comparison.interval())
+
+    def test_better_agent(self):
+        comparison = compare_agents(_decks(), PredictableAgent, DoNothingAgent, seeds=range(6))
+        self.assertEqual(6, len(comparison.scores_a))
+        self.assertEqual([0.0] * 6, comparison.scores_b)
+        self.assertGreater(comparison.difference, 0)
+        low, high = comparison.interval()
+        self.assertLessEqual(low, comparison.difference)
+        self.assertGreaterEqual(high, comparison.difference)
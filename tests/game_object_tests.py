@@ -1,14 +1,20 @@
+import copy
+import gc
+import pickle
 import random
 import unittest
+import weakref
 
-from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent
+from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent, RandomAgent
 from hearthbreaker.cards.base import SecretCard
-from hearthbreaker.cards.heroes import Malfurion, Jaina
+from hearthbreaker.cards.heroes import Malfurion, Jaina, hero_for_class
+from hearthbreaker.constants import CHARACTER_CLASS
 from hearthbreaker.cards.minions.rogue import AnubarAmbusher
 from hearthbreaker.engine import Game, Deck, card_lookup
 from tests.agents.testing_agents import CardTestingAgent, OneCardPlayingAgent, PlayAndAttackAgent
 from tests.testing_utils import generate_game_for, mock
-from hearthbreaker.cards import StonetuskBoar, ArcaneIntellect, Naturalize, Abomination, NerubianEgg, SylvanasWindrunner
+from hearthbreaker.cards import StonetuskBoar, ArcaneIntellect, Naturalize, Abomination, NerubianEgg, \
+    SylvanasWindrunner, RaidLeader, Wisp, ChillwindYeti, Fireball, MurlocRaider, BloodfenRaptor, Frostbolt
 from hearthbreaker.game_objects import Bindable
 
 
@@ -191,3 +197,100 @@ class TestBinding(unittest.TestCase):
         binder.trigger("test")
         event.assert_called_once_with(1, 5, 6)
         self.assertEqual(event2.call_count, 2)
+
+    def test_shared_events(self):
+        first = Bindable()
+        second = Bindable()
+        self.assertIs(first.events, second.events)
+        self.assertEqual(0, len(first.events))
+        self.assertRaises(TypeError, first.events.__setitem__, "test", [])
+
+        first.bind("test", mock.Mock())
+        self.assertIsNot(first.events, second.events)
+        self.assertEqual(1, len(first.events))
+        self.assertEqual(0, len(second.events))
+        self.assertIs(second.events, copy.deepcopy(second).events)
+        self.assertIs(second.events, pickle.loads(pickle.dumps(second)).events)
+
+
+class TestSlots(unittest.TestCase):
+    def test_minion_attributes(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        StonetuskBoar().summon(game.players[0], game, 0)
+        minion = game.players[0].minions[0]
+        self.assertFalse(hasattr(minion, "active"))
+        # Attributes without a slot still work
+        minion.active = True
+        minion.health = 3
+
+        copied = copy.deepcopy(minion)
+        self.assertTrue(copied.active)
+        self.assertEqual(3, copied.health)
+        self.assertEqual(1, copied.calculate_attack())
+        self.assertEqual(3, pickle.loads(pickle.dumps(game)).players[0].minions[0].health)
+
+
+class TestReset(unittest.TestCase):
+    def play_game(self, seed, game=None):
+        if game:
+            game.reset(seed)
+        else:
+            random.seed(seed)
+            deck1 = Deck([card() for card in [StonetuskBoar, RaidLeader, Wisp, ChillwindYeti, ArcaneIntellect,
+                                              Fireball] * 5], hero_for_class(CHARACTER_CLASS.MAGE))
+            deck2 = Deck([card() for card in [MurlocRaider, BloodfenRaptor, Frostbolt, Abomination, Naturalize,
+                                              StonetuskBoar] * 5], hero_for_class(CHARACTER_CLASS.DRUID))
+            game = Game([deck1, deck2], [RandomAgent(), RandomAgent()])
+        game.start()
+        return game
+
+    def test_reset(self):
+        game = self.play_game(1857)
+        for seed in [1857, 2015, 4]:
+            expected = self.play_game(seed)
+            players = game.players
+            game = self.play_game(seed, game)
+            self.assertEqual(game.state_hash(), expected.state_hash())
+            self.assertEqual(game._turns_passed, expected._turns_passed)
+            self.assertCountEqual(players, game.players)
+            for player in game.players:
+                self.assertIs(player.game, game)
+                self.assertEqual(30, len(player.deck.cards))
+
+    def test_reset_frees_last_game(self):
+        game = self.play_game(1857)
+        minions = [weakref.ref(minion) for player in game.players for minion in player.minions]
+        heroes = [weakref.ref(player.hero) for player in game.players]
+        gc.disable()
+        try:
+            game.reset(2015)
+            for ref in minions + heroes:
+                self.assertIsNone(ref())
+        finally:
+            gc.enable()
+
+
+class TestDispose(unittest.TestCase):
+    def test_dispose(self):
+        game = TestReset().play_game(1857)
+        refs = [weakref.ref(game)]
+        for player in game.players:
+            objects = [player, player.hero, player.hero.power] + player.minions + player.hand + player.deck.cards
+            refs.extend(weakref.ref(obj) for obj in objects)
+        del player, objects
+        gc.disable()
+        try:
+            game.dispose()
+            del game
+            for ref in refs:
+                self.assertIsNone(ref())
+        finally:
+            gc.enable()
+
+    def test_copied_power(self):
+        game = generate_game_for(StonetuskBoar, StonetuskBoar, DoNothingAgent, DoNothingAgent)
+        copied_game = game.copy()
+        for player, copied_player in zip(game.players, copied_game.players):
+            self.assertIsNot(player.hero.power, copied_player.hero.power)
+            self.assertIs(player.hero, player.hero.power.hero)
+            self.assertIs(copied_player.hero, copied_player.hero.power.hero)
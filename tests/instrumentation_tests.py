@@ -0,0 +1,50 @@
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent
+from hearthbreaker.cards import StonetuskBoar, RaidLeader, Wisp
+from hearthbreaker.game_objects import Bindable
+import hearthbreaker.instrumentation
+from tests.testing_utils import generate_game_for
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+        self.trigger = Bindable.trigger
+
+    def tearDown(self):
+        hearthbreaker.instrumentation.uninstall()
+
+    def test_counters(self):
+        game = generate_game_for([StonetuskBoar, RaidLeader], Wisp, PredictableAgent, DoNothingAgent)
+        self.assertIsNone(game.counters)
+        counters = game.instrument()
+        self.assertIs(counters, game.counters)
+        self.assertIs(counters, game.instrument())
+
+        for turn in range(6):
+            game.play_single_turn()
+        copied_game = game.copy()
+        copied_game.play_single_turn()
+
+        self.assertIs(counters, copied_game.counters)
+        self.assertEqual(7, counters.events["turn_started"])
+        self.assertGreater(counters.stats["ChangeAttack"], 0)
+        self.assertGreater(counters.tag_copies["Buff"], 0)
+        self.assertGreater(counters.delayed_checks, 0)
+        self.assertEqual(1, counters.copies)
+        self.assertIn("turn_started", counters.summary())
+
+        game.reset()
+        self.assertIs(counters, game.counters)
+
+    def test_uninstall(self):
+        game = generate_game_for(StonetuskBoar, Wisp, PredictableAgent, PredictableAgent)
+        counters = game.instrument()
+        self.assertIsNot(self.trigger, Bindable.trigger)
+        hearthbreaker.instrumentation.uninstall()
+        self.assertIs(self.trigger, Bindable.trigger)
+
+        game.play_single_turn()
+        self.assertEqual(0, sum(counters.events.values()))
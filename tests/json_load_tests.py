@@ -1,7 +1,8 @@
-import json
+import copy
 import re
 from hearthbreaker.cards.base import MinionCard, WeaponCard
 from hearthbreaker.game_objects import Weapon, Minion
+from hearthbreaker.serialization.catalogue import load_catalogue
 import tests.card_tests.druid_tests
 import tests.card_tests.mage_tests
 import tests.card_tests.hunter_tests
@@ -14,14 +15,12 @@ import tests.card_tests.warrior_tests
 import tests.card_tests.neutral_tests
 
 
-with open("card_defs.json", "r") as file:
-    cards = json.load(file)
+cards = load_catalogue("card_defs.json")
 
 
 class JSONTester:
     def define_type(self, card_def):
         from hearthbreaker.constants import CHARACTER_CLASS, MINION_TYPE, CARD_RARITY
-        from hearthbreaker.tags.base import Battlecry, Choice, Deathrattle, Effect, Aura, Buff
         import hearthbreaker.cards
 
         def __init__(self):
@@ -37,23 +36,23 @@ class JSONTester:
                 init_dict['minion_type'] = MINION_TYPE.from_str(card_def['minion_type'])
 
             if 'battlecry' in card_def:
-                init_dict['battlecry'] = tuple(Battlecry.from_json(**battlecry) for battlecry in card_def['battlecry'])
+                init_dict['battlecry'] = tuple(copy.deepcopy(card_def['battlecry']))
 
             if 'choices' in card_def:
-                init_dict['choices'] = [Choice.from_json(**choice) for choice in card_def['choices']]
+                init_dict['choices'] = copy.deepcopy(card_def['choices'])
 
             if 'combo' in card_def:
-                init_dict['combo'] = Battlecry.from_json(**card_def['combo'])
+                init_dict['combo'] = copy.deepcopy(card_def['combo'])
 
             if 'overload' in card_def:
                 init_dict['overload'] = card_def['overload']
 
             if 'buffs' in card_def:
-                init_dict['buffs'] = [Buff.from_json(**buff) for buff in card_def['buffs']]
+                init_dict['buffs'] = copy.deepcopy(card_def['buffs'])
             if 'auras' in card_def:
-                init_dict['auras'] = [Aura.from_json(**aura) for aura in card_def['auras']]
+                init_dict['auras'] = copy.deepcopy(card_def['auras'])
             if 'effects' in card_def:
-                init_dict['effects'] = [Effect.from_json(**effect) for effect in card_def['effects']]
+                init_dict['effects'] = copy.deepcopy(card_def['effects'])
 
             MinionCard.__init__(self, **init_dict)
 
@@ -67,20 +66,20 @@ class JSONTester:
                 init_dict['character_class'] = CHARACTER_CLASS.from_str(card_def['character_class'])
 
             if 'battlecry' in card_def:
-                init_dict['battlecry'] = Battlecry.from_json(**card_def['battlecry'])
+                init_dict['battlecry'] = copy.deepcopy(card_def['battlecry'])
 
             if 'combo' in card_def:
-                init_dict['combo'] = Battlecry.from_json(**card_def['combo'])
+                init_dict['combo'] = copy.deepcopy(card_def['combo'])
 
             if 'overload' in card_def:
                 init_dict['overload'] = card_def['overload']
 
             if 'buffs' in card_def:
-                init_dict['buffs'] = [Buff.from_json(**buff) for buff in card_def['buffs']]
+                init_dict['buffs'] = copy.deepcopy(card_def['buffs'])
             if 'auras' in card_def:
-                init_dict['auras'] = [Aura.from_json(**aura) for aura in card_def['auras']]
+                init_dict['auras'] = copy.deepcopy(card_def['auras'])
             if 'effects' in card_def:
-                init_dict['effects'] = [Effect.from_json(**effect) for effect in card_def['effects']]
+                init_dict['effects'] = copy.deepcopy(card_def['effects'])
 
             WeaponCard.__init__(self, **init_dict)
 
@@ -92,20 +91,19 @@ class JSONTester:
             if "impl" in card_def:
                 impl = card_def['impl']
                 if 'effects' in impl:
-                    create_dict['effects'] = [Effect.from_json(**effect) for effect in impl['effects']]
+                    create_dict['effects'] = copy.deepcopy(impl['effects'])
 
                 if 'auras' in impl:
-                    create_dict['auras'] = [Aura.from_json(**aura) for aura in impl['auras']]
+                    create_dict['auras'] = copy.deepcopy(impl['auras'])
 
                 if 'buffs' in impl:
-                    create_dict['buffs'] = [Buff.from_json(**buff) for buff in impl['buffs']]
+                    create_dict['buffs'] = copy.deepcopy(impl['buffs'])
 
             if 'enrage' in card_def:
-                create_dict['enrage'] = [Aura.from_json(**enrage) for enrage in card_def['enrage']]
+                create_dict['enrage'] = copy.deepcopy(card_def['enrage'])
 
             if 'deathrattle' in card_def:
-                create_dict['deathrattle'] = [Deathrattle.from_json(**deathrattle)
-                                              for deathrattle in card_def['deathrattle']]
+                create_dict['deathrattle'] = copy.deepcopy(card_def['deathrattle'])
 
             return Minion(**create_dict)
 
@@ -117,16 +115,16 @@ class JSONTester:
             if "impl" in card_def:
                 impl = card_def['impl']
                 if 'effects' in impl:
-                    create_dict['effects'] = [Effect.from_json(**effect) for effect in impl['effects']]
+                    create_dict['effects'] = copy.deepcopy(impl['effects'])
 
                 if 'auras' in impl:
-                    create_dict['auras'] = [Aura.from_json(**aura) for aura in impl['auras']]
+                    create_dict['auras'] = copy.deepcopy(impl['auras'])
 
                 if 'buffs' in impl:
-                    create_dict['buffs'] = [Buff.from_json(**buff) for buff in impl['buffs']]
+                    create_dict['buffs'] = copy.deepcopy(impl['buffs'])
 
             if 'deathrattle' in card_def:
-                create_dict['deathrattle'] = Deathrattle.from_json(**card_def['deathrattle'])
+                create_dict['deathrattle'] = copy.deepcopy(card_def['deathrattle'])
 
             return Weapon(**create_dict)
         if card_def['rarity'] != "Special":
@@ -0,0 +1,81 @@
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent, PredictableAgent
+from hearthbreaker.cards import StonetuskBoar, Wisp, ChillwindYeti
+from hearthbreaker.cards.heroes import Jaina, Rexxar
+from hearthbreaker.engine import Deck
+from hearthbreaker.matchups import MatchupRunner
+
+
+def _boars():
+    return Deck([StonetuskBoar() if index % 2 else ChillwindYeti() for index in range(30)], Rexxar())
+
+
+def _wisps():
+    return Deck([Wisp() for index in range(30)], Jaina())
+
+
+class TestMatchup(unittest.TestCase):
+    def _matchup(self):
+        return MatchupRunner([])._new_matchup()
+
+    def test_decided(self):
+        matchup = self._matchup()
+        for game in range(7):
+            matchup.add(1.0)
+        self.assertIsNone(matchup.favoured)
+        matchup.add(1.0)
+        self.assertTrue(matchup.favoured)
+        matchup.add(0.0)
+        self.assertTrue(matchup.favoured)
+        self.assertEqual(9, matchup.games)
+        self.assertAlmostEqual(8 / 9, matchup.win_rate)
+
+        reverse = matchup.reversed()
+        self.assertFalse(reverse.favoured)
+        self.assertAlmostEqual(1 / 9, reverse.win_rate)
+        self.assertAlmostEqual(-matchup.ratio, reverse.ratio)
+
+    def test_even(self):
+        matchup = self._matchup()
+        for game in range(1000):
+            matchup.add(0.5)
+        self.assertIsNone(matchup.favoured)
+        self.assertAlmostEqual(0, matchup.ratio)
+        self.assertLess(matchup.variance, self._matchup().variance)
+
+
+class TestMatchupRunner(unittest.TestCase):
+    def test_gauntlet(self):
+        runner = MatchupRunner([(_boars(), PredictableAgent)], [(_wisps(), DoNothingAgent), (_boars(), DoNothingAgent)],
+                               min_games=2, max_games=50, processes=1)
+        matrix = runner.run()
+        self.assertEqual(1, len(matrix))
+        for matchup in matrix[0]:
+            self.assertTrue(matchup.favoured)
+            self.assertEqual(1.0, matchup.win_rate)
+            self.assertLess(matchup.games, 50)
+        self.assertEqual(runner.games, sum(matchup.games for matchup in matrix[0]))
+
+    def test_each_other(self):
+        runner = MatchupRunner([(_boars(), PredictableAgent), (_wisps(), DoNothingAgent)], min_games=2, processes=1)
+        matrix = runner.run()
+        self.assertTrue(matrix[0][1].favoured)
+        self.assertFalse(matrix[1][0].favoured)
+        self.assertEqual(0, matrix[0][0].games)
+        self.assertEqual(matrix[0][1].games, runner.games)
+
+    def test_budget(self):
+        runner = MatchupRunner([(_boars(), PredictableAgent)], [(_wisps(), DoNothingAgent)], min_games=2, budget=5,
+                               processes=1)
+        matrix = runner.run()
+        self.assertEqual(5, runner.games)
+        self.assertEqual(5, matrix[0][0].games)
+        self.assertIsNone(matrix[0][0].favoured)
+
+    def test_processes(self):
+        runner = MatchupRunner([(_boars(), PredictableAgent)], [(_wisps(), DoNothingAgent)], min_games=2,
+                               processes=2)
+        matrix = runner.run()
+        self.assertTrue(matrix[0][0].favoured)
+        self.assertEqual(runner.games, matrix[0][0].games)
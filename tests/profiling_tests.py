@@ -0,0 +1,36 @@
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import PredictableAgent
+from hearthbreaker.cards import Abomination, ArcaneExplosion, RaidLeader, StonetuskBoar
+from hearthbreaker.cards.base import Card
+from hearthbreaker.profiling import CardProfile
+from tests.testing_utils import generate_game_for
+
+
+class TestCardProfile(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def test_profile(self):
+        game = generate_game_for([StonetuskBoar, RaidLeader, Abomination], [ArcaneExplosion, StonetuskBoar],
+                                 PredictableAgent, PredictableAgent)
+        use = StonetuskBoar.use
+        with CardProfile() as profile:
+            self.assertIsNot(use, StonetuskBoar.use)
+            for turn in range(16):
+                game.play_single_turn()
+        self.assertIs(use, StonetuskBoar.use)
+        self.assertIs(Card.__dict__["use"], Card.use)
+
+        for name in ["Stonetusk Boar", "Raid Leader", "Arcane Explosion", "Abomination"]:
+            self.assertGreater(profile.calls[name], 0)
+            self.assertGreater(profile.times[name], 0)
+        self.assertEqual(0, profile.calls["(unknown)"])
+        self.assertIn("Raid Leader", profile.report())
+
+    def test_one_profile(self):
+        with CardProfile():
+            with self.assertRaises(RuntimeError):
+                with CardProfile():
+                    pass  # pragma: no cover
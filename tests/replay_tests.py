@@ -1,4 +1,7 @@
 import json
+import os
+import shutil
+import tempfile
 import unittest
 from io import StringIO
 from os import listdir
@@ -15,6 +18,7 @@ from hearthbreaker.cards import *
 import hearthbreaker.game_objects
 from tests.agents.testing_agents import PlayAndAttackAgent, OneCardPlayingAgent
 from tests.testing_utils import StackedDeck
+from verify_replays import verify_replays
 
 
 class TestReplay(unittest.TestCase):
@@ -209,3 +213,35 @@ class TestReplay(unittest.TestCase):
                 with open(rfile, "r") as replay_file:
                     replay_json = json.load(replay_file)
                     validate(replay_json, schema)
+
+    def test_verify_replays(self):
+        replay_dir = tempfile.mkdtemp()
+        try:
+            shutil.copy("tests/replays/example.hsreplay", replay_dir)
+            shutil.copy("tests/replays/stonetusk_power.hsreplay", replay_dir)
+            self.assertEqual([], verify_replays(replay_dir, record=True, processes=1))
+            self.assertEqual([], verify_replays(replay_dir, processes=1))
+
+            digest_file = replay_dir + "/example.hsreplay.digest"
+            with open(digest_file, "r") as file:
+                digests = json.load(file)
+            digests['moves'][5] = "0" * 16
+            with open(digest_file, "w") as file:
+                json.dump(digests, file)
+
+            failures = verify_replays(replay_dir, processes=1)
+            self.assertEqual(1, len(failures))
+            self.assertTrue(failures[0][0].endswith("example.hsreplay"))
+            self.assertEqual("diverged at move 5 (start())", failures[0][1])
+
+            # A replay which can't be read is reported, and the others are still checked
+            with open(replay_dir + "/broken.hsreplay", "w") as file:
+                file.write("not a replay")
+            failures = verify_replays(replay_dir, record=True, processes=1)
+            self.assertEqual(["broken.hsreplay"], [os.path.basename(filename) for filename, message in failures])
+            shutil.copy(replay_dir + "/stonetusk_power.hsreplay.digest", replay_dir + "/broken.hsreplay.digest")
+            failures = verify_replays(replay_dir, processes=1)
+            self.assertEqual(["broken.hsreplay"], [os.path.basename(filename) for filename, message in failures])
+            self.assertTrue(failures[0][1].startswith("diverged at move 0 (end of replay): "))
+        finally:
+            shutil.rmtree(replay_dir)
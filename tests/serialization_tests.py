@@ -1,6 +1,21 @@
 import json
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import types
+import unittest
+from io import StringIO
+from hearthbreaker.cards import StonetuskBoar, Wisp, ArcaneExplosion
 from hearthbreaker.engine import Game
+from hearthbreaker.serialization.binary import serialize_binary, deserialize_binary, _Encoder
+import hearthbreaker.serialization.catalogue
+from hearthbreaker.serialization.catalogue import load_catalogue, catalogue_path
+from hearthbreaker.serialization.delta import StateStream, apply_patch, diff, snapshot
 import tests.copy_tests
+from tests.agents.testing_agents import PlayAndAttackAgent, CardTestingAgent
+from tests.testing_utils import generate_game_for
 
 
 class TestGameSerialization(tests.copy_tests.TestGameCopying):
@@ -43,3 +58,196 @@ class TestMinionSerialization(tests.copy_tests.TestMinionCopying):
     def tearDown(self):
         super().tearDown()
         Game.copy = self._old_copy
+
+
+class TestGameBinarySerialization(tests.copy_tests.TestGameCopying):
+    def setUp(self):
+        def serialization_copy(old_game):
+            game = deserialize_binary(serialize_binary(old_game), [player.agent for player in old_game.players])
+            game._has_turn_ended = old_game._has_turn_ended
+            return game
+
+        super().setUp()
+        self._old_copy = Game.copy
+        Game.copy = serialization_copy
+
+    def tearDown(self):
+        super().tearDown()
+        Game.copy = self._old_copy
+
+
+class TestMinionBinarySerialization(tests.copy_tests.TestMinionCopying):
+    def setUp(self):
+        def serialization_copy(old_game):
+            game = deserialize_binary(serialize_binary(old_game), [player.agent for player in old_game.players])
+            game._has_turn_ended = old_game._has_turn_ended
+            return game
+
+        super().setUp()
+        self._old_copy = Game.copy
+        Game.copy = serialization_copy
+
+    def tearDown(self):
+        super().tearDown()
+        Game.copy = self._old_copy
+
+
+class TestBinaryEncoding(unittest.TestCase):
+    def test_interning(self):
+        root = _Encoder().encode([[1, [2]], [1, [2]], [True, [2]]])
+        self.assertIs(root[1], root[2])
+        self.assertIsNot(root[1], root[3])
+        self.assertIs(root[1][2], root[3][2])
+
+        nested = [0]
+        for depth in range(200):
+            nested = [depth, nested]
+        encoder = _Encoder()
+        encoder.encode([nested, nested])
+        self.assertEqual(202, len(encoder.interned))
+
+
+class TestGamePickling(tests.copy_tests.TestGameCopying):
+    def setUp(self):
+        def pickle_copy(old_game):
+            game = pickle.loads(pickle.dumps(old_game))
+            for player, old_player in zip(game.players, old_game.players):
+                player.agent = old_player.agent
+            return game
+
+        super().setUp()
+        self._old_copy = Game.copy
+        Game.copy = pickle_copy
+
+    def tearDown(self):
+        super().tearDown()
+        Game.copy = self._old_copy
+
+
+class TestMinionPickling(tests.copy_tests.TestMinionCopying):
+    def setUp(self):
+        def pickle_copy(old_game):
+            game = pickle.loads(pickle.dumps(old_game))
+            for player, old_player in zip(game.players, old_game.players):
+                player.agent = old_player.agent
+            return game
+
+        super().setUp()
+        self._old_copy = Game.copy
+        Game.copy = pickle_copy
+
+    def tearDown(self):
+        super().tearDown()
+        Game.copy = self._old_copy
+
+
+class TestStateStream(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def test_diff(self):
+        old = {'a': 1, 'b': [{'sequence_id': 1, 'v': 1}, {'sequence_id': 2, 'v': 1}], 'c': [1, 2, 3], 'd': "gone"}
+        new = {'a': 2, 'b': [{'sequence_id': 3, 'v': 1}, {'sequence_id': 1, 'v': 2}, {'sequence_id': 2, 'v': 1}],
+               'c': [1, 3], 'e': True}
+        patch = diff(old, new)
+        self.assertEqual(new, apply_patch(old, patch))
+        self.assertIn(["splice", ["b"], 0, 0, [{'sequence_id': 3, 'v': 1}]], patch)
+        self.assertIn(["set", ["b", 1, "v"], 2], patch)
+        self.assertIn(["del", ["d"]], patch)
+        self.assertEqual([], diff(new, new))
+        self.assertEqual("gone", old['d'])
+
+    def test_stream(self):
+        game = generate_game_for([StonetuskBoar, Wisp, ArcaneExplosion], StonetuskBoar,
+                                 PlayAndAttackAgent, CardTestingAgent)
+        stream = StateStream()
+        states = [snapshot(game)]
+        stream.record(game)
+        for turn in range(12):
+            game.play_single_turn()
+            states.append(snapshot(game))
+            stream.record(game)
+
+        self.assertEqual(13, len(stream))
+        for index in range(len(states)):
+            self.assertEqual(states[index], stream.state_at(index))
+
+        output = StringIO()
+        stream.write(output)
+        self.assertLess(len(output.getvalue()), sum(len(json.dumps(state)) for state in states) / 3)
+        read_stream = StateStream.read(StringIO(output.getvalue()))
+        self.assertEqual(states[-1], read_stream.state_at(12))
+
+        restored = read_stream.game_at(12, [PlayAndAttackAgent(), CardTestingAgent()])
+        self.assertEqual(game.players[0].hero.health, restored.players[0].hero.health)
+        self.assertEqual(len(game.players[1].minions), len(restored.players[1].minions))
+        self.assertRaises(IndexError, stream.state_at, 13)
+
+
+class TestCatalogue(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, "card_defs.json")
+        shutil.copy("card_defs.json", self.source)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_catalogue(self):
+        with open(self.source, "r") as file:
+            card_defs = json.load(file)
+
+        self.assertFalse(os.path.exists(catalogue_path(self.source)))
+        built = load_catalogue(self.source)
+        self.assertTrue(os.path.exists(catalogue_path(self.source)))
+        loaded = load_catalogue(self.source)
+        self.assertIsNot(built, loaded)
+        for card_def, loaded_def in zip(card_defs, loaded):
+            self.assertEqual(json.dumps(card_def, sort_keys=True),
+                             json.dumps(loaded_def, default=lambda o: o.__to_json__(), sort_keys=True))
+
+        # Changing the source rebuilds the catalogue
+        with open(self.source, "w") as file:
+            json.dump(card_defs[:10], file)
+        self.assertEqual(10, len(load_catalogue(self.source)))
+        self.assertEqual(10, len(load_catalogue(self.source)))
+
+        # As does a damaged catalogue
+        with open(catalogue_path(self.source), "wb") as file:
+            file.write(b"not a catalogue")
+        self.assertEqual(10, len(load_catalogue(self.source)))
+
+    def test_code_changed(self):
+        # A catalogue built before the tags or cards were changed is rebuilt, even though the card definitions are the
+        # same
+        load_catalogue(self.source)
+        old_hash = hearthbreaker.serialization.catalogue._get_code_hash()
+        hearthbreaker.serialization.catalogue._code_hash = "changed"
+        try:
+            load_catalogue(self.source)
+            with open(catalogue_path(self.source), "rb") as file:
+                self.assertEqual("changed", pickle.load(file)['code_hash'])
+        finally:
+            hearthbreaker.serialization.catalogue._code_hash = old_hash
+
+    def test_code_hash(self):
+        # The hash covers the source in the subpackages, such as hearthbreaker.cards.minions
+        package = os.path.join(self.directory, "package")
+        os.makedirs(os.path.join(package, "minions"))
+        for name in ["__init__.py", os.path.join("minions", "neutral.py")]:
+            with open(os.path.join(package, name), "w") as file:
+                file.write("")
+        old_packages = hearthbreaker.serialization.catalogue._CODE_PACKAGES
+        old_hash = hearthbreaker.serialization.catalogue._code_hash
+        hearthbreaker.serialization.catalogue._CODE_PACKAGES = [types.ModuleType("package")]
+        hearthbreaker.serialization.catalogue._CODE_PACKAGES[0].__file__ = os.path.join(package, "__init__.py")
+        try:
+            hearthbreaker.serialization.catalogue._code_hash = None
+            code_hash = hearthbreaker.serialization.catalogue._get_code_hash()
+            with open(os.path.join(package, "minions", "neutral.py"), "w") as file:
+                file.write("changed = True\n")
+            hearthbreaker.serialization.catalogue._code_hash = None
+            self.assertNotEqual(code_hash, hearthbreaker.serialization.catalogue._get_code_hash())
+        finally:
+            hearthbreaker.serialization.catalogue._CODE_PACKAGES = old_packages
+            hearthbreaker.serialization.catalogue._code_hash = old_hash
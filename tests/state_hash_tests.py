@@ -0,0 +1,84 @@
+import pickle
+import random
+import unittest
+
+from hearthbreaker.agents.basic_agents import DoNothingAgent
+from hearthbreaker.cards import StonetuskBoar, Wisp, KoboldGeomancer, SenseDemons, Voidwalker, CaptainsParrot, \
+    BloodsailRaider, Tracking, Mindgames
+from hearthbreaker.state_hash import feature_key
+from tests.agents.testing_agents import CardTestingAgent
+from tests.testing_utils import generate_game_for
+
+
+class TestStateHash(unittest.TestCase):
+    def setUp(self):
+        random.seed(1857)
+
+    def test_transpositions(self):
+        def play(first, first_index, second, second_index):
+            random.seed(1857)
+            game = generate_game_for(StonetuskBoar, Wisp, DoNothingAgent, DoNothingAgent)
+            game.play_single_turn()
+            first().summon(game.players[0], game, first_index)
+            second().summon(game.players[0], game, second_index)
+            return game
+
+        boar_then_wisp = play(StonetuskBoar, 0, Wisp, 1)
+        wisp_then_boar = play(Wisp, 0, StonetuskBoar, 0)
+        wisp_before_boar = play(Wisp, 0, StonetuskBoar, 1)
+
+        self.assertEqual(boar_then_wisp.state_hash(), wisp_then_boar.state_hash())
+        self.assertNotEqual(boar_then_wisp.state_hash(), wisp_before_boar.state_hash())
+        self.assertEqual(boar_then_wisp.state_hash(ordered_board=False),
+                         wisp_before_boar.state_hash(ordered_board=False))
+
+        state_hash = boar_then_wisp.state_hash()
+        boar_then_wisp.players[0].minions[1].damage(1, None)
+        self.assertNotEqual(state_hash, boar_then_wisp.state_hash())
+
+    def test_copies(self):
+        game = generate_game_for(KoboldGeomancer, StonetuskBoar, CardTestingAgent, CardTestingAgent)
+        for turn in range(8):
+            game.play_single_turn()
+
+        self.assertEqual(4, game.players[0].spell_damage)
+        self.assertEqual(4, game.copy().players[0].spell_damage)
+        self.assertEqual(game.state_hash(), game.copy().state_hash())
+        self.assertEqual(game.state_hash(), pickle.loads(pickle.dumps(game)).state_hash())
+
+        state_hash = game.state_hash()
+        game.play_single_turn()
+        self.assertNotEqual(state_hash, game.state_hash())
+        self.assertEqual(game.state_hash(), game.copy().copy().state_hash())
+
+    def test_stable_keys(self):
+        self.assertEqual(feature_key(("hand", 0, "Wisp", 0)), feature_key(("hand", 0, "Wisp", 0)))
+        self.assertNotEqual(feature_key(("hand", 0, "Wisp", 0)), feature_key(("hand", 1, "Wisp", 0)))
+        # Keys must not depend on the process they were computed in
+        self.assertEqual(0x5d1430c56897839d, feature_key(("deck", 0, "Stonetusk Boar")))
+
+    def test_tracked_cards(self):
+        # The keys of the cards in the decks and hands are kept up to date as they change, so they must match games
+        # whose keys are worked out from scratch
+        game = generate_game_for([SenseDemons, Voidwalker, CaptainsParrot, BloodsailRaider], [Tracking, Mindgames],
+                                 CardTestingAgent, CardTestingAgent)
+        for turn in range(12):
+            game.play_single_turn()
+            self.assertEqual(pickle.loads(pickle.dumps(game)).state_hash(), game.state_hash())
+            self.assertEqual(game.state_hash(), game.copy().state_hash())
+
+        state_hash = game.state_hash()
+        game.players[0].hand.pop()
+        self.assertNotEqual(state_hash, game.state_hash())
+        game.players[0].put_back(game.players[0].hand.pop())
+        self.assertNotEqual(state_hash, game.state_hash())
+
+    def test_players_differ(self):
+        # The same cards held by the other player are a different state
+        game = generate_game_for(Wisp, Wisp, DoNothingAgent, DoNothingAgent)
+        card = StonetuskBoar()
+        card.player = game.players[0]
+        game.players[0].hand.append(card)
+        state_hash = game.state_hash()
+        game.players[1].hand.append(game.players[0].hand.pop())
+        self.assertNotEqual(state_hash, game.state_hash())
@@ -0,0 +1,60 @@
+import copy
+import json
+import pickle
+import unittest
+
+from hearthbreaker.tags.base import Buff, Player, Condition, Battlecry, Deathrattle, Aura, Selector, Status, \
+    condition_registry, load_card_defs
+from hearthbreaker.tags.selector import FriendlyPlayer, MinionSelector, AllPicker, RandomPicker, SelfSelector
+from hearthbreaker.tags.status import Taunt, Windfury, MegaWindfury, ChangeAttack
+from hearthbreaker.tags.condition import MinionIsNotTarget, IsType
+
+
+class TestStateless(unittest.TestCase):
+    def test_shared_instances(self):
+        self.assertIs(FriendlyPlayer(), FriendlyPlayer())
+        self.assertIs(Player.from_json("friendly"), MinionSelector().players)
+        self.assertIs(AllPicker(), MinionSelector().picker)
+        self.assertIs(MinionIsNotTarget(), Condition.from_json("minion_is_not_target"))
+        self.assertIs(Taunt(), Taunt())
+        self.assertIsNot(Windfury(), MegaWindfury())
+        self.assertIsInstance(MegaWindfury(), MegaWindfury)
+
+        self.assertIsNot(RandomPicker(1), RandomPicker(1))
+        self.assertIsNot(ChangeAttack(1), ChangeAttack(1))
+        self.assertIsNot(IsType(1), IsType(1))
+
+    def test_copies(self):
+        buff = Buff(Taunt())
+        self.assertIs(buff.status, copy.copy(Taunt()))
+        self.assertIs(buff.status, copy.deepcopy(buff).status)
+        self.assertIs(buff.status, pickle.loads(pickle.dumps(buff)).status)
+        self.assertIs(buff.status, buff.to_instance(None).status)
+        self.assertEqual(str(buff), str(copy.deepcopy(buff)))
+
+
+class TestTagRegistry(unittest.TestCase):
+    def test_lookup(self):
+        self.assertIs(MinionIsNotTarget, condition_registry.lookup("minion_is_not_target"))
+        self.assertIs(MegaWindfury, Status.from_json("mega_windfury").__class__)
+        self.assertIsInstance(Selector.from_json("self"), SelfSelector)
+        self.assertRaises(AttributeError, Selector.from_json, "nonexistent")
+
+    def test_load_card_defs(self):
+        with open("card_defs.json", "r") as file:
+            card_defs = json.load(file)
+        with open("card_defs.json", "r") as file:
+            loaded_defs = load_card_defs(file)
+
+        self.assertEqual(len(card_defs), len(loaded_defs))
+        for card_def, loaded_def in zip(card_defs, loaded_defs):
+            self.assertEqual(card_def["name"], loaded_def["name"])
+            self.assertEqual(json.dumps(card_def, sort_keys=True),
+                             json.dumps(loaded_def, default=lambda o: o.__to_json__(), sort_keys=True))
+            if loaded_def["type"] == "minion":
+                for battlecry in loaded_def.get("battlecry", []):
+                    self.assertIsInstance(battlecry, Battlecry)
+            elif "deathrattle" in loaded_def:
+                self.assertIsInstance(loaded_def["deathrattle"], Deathrattle)
+            for aura in loaded_def.get("impl", {}).get("auras", []):
+                self.assertIsInstance(aura, Aura)
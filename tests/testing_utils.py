@@ -27,8 +27,7 @@ class StackedDeck(Deck):
     def draw(self, random_func):
         for card_index in range(0, len(self.cards)):
             if not self.cards[card_index].drawn:
-                self.cards[card_index].drawn = True
-                self.left -= 1
+                self.take(self.cards[card_index])
                 return self.cards[card_index]
 
 
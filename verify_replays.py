@@ -0,0 +1,184 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+
+from hearthbreaker.replay import Replay, playback
+
+__doc__ = """
+Plays back a directory of replays and checks that each one still produces the same game as when it was recorded.
+
+Each replay has a digest file stored alongside it (``<replay>.digest``), which holds a digest of the state of the game
+after every move, as well as a digest of the final state.  Running with ``--record`` (re)creates the digest files,
+and running without it compares each replay against its stored digests and reports the first move at which a replay
+diverges.
+
+Usage: ``python verify_replays.py [--record] [--processes N] directory``
+"""
+
+REPLAY_EXTENSIONS = (".hsreplay", ".rep")
+DIGEST_EXTENSION = ".digest"
+
+
+def state_digest(game):
+    """
+    Compute a short digest of the current state of a game.  Two games with the same digest have the same serialized
+    state.
+
+    :param hearthbreaker.engine.Game game: The game to compute the digest of
+    :rtype: str
+    """
+    game_json = json.dumps(game, default=lambda o: o.__to_json__(), sort_keys=True)
+    return hashlib.sha1(game_json.encode("utf-8")).hexdigest()[:16]
+
+
+def find_replays(directory):
+    """
+    Find all of the replay files in a directory and its subdirectories, in a stable order
+
+    :param str directory: The directory to search
+    :rtype: [str]
+    """
+    replays = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(REPLAY_EXTENSIONS):
+                replays.append(os.path.join(root, file))
+    return replays
+
+
+def load_replay(filename):
+    replay = Replay()
+    if filename.endswith(".rep"):
+        replay.read(filename)
+    else:
+        replay.read_json(filename)
+    return replay
+
+
+def play_replay(filename):
+    """
+    Play back a replay, recording the digest of the game after each move.
+
+    :param str filename: The replay file to play back
+    :return: A dictionary with the digests of each move (``moves``), the digest of the final state (``final``), and
+             a description of the error which stopped the playback (``error``), if there was one
+    :rtype: dict
+    """
+    digests = []
+
+    def move_played(move_index, game):
+        digests.append(state_digest(game))
+
+    result = {'moves': digests, 'final': None, 'error': None, 'move_names': []}
+    try:
+        # A replay which can't be read is reported the same as one which fails part way through, rather than
+        # stopping the whole run
+        replay = load_replay(filename)
+        result['move_names'] = [move.to_output_string() for move in replay._moves]
+        game = playback(replay, move_played)
+        game.start()
+        result['final'] = state_digest(game)
+    except Exception as e:
+        result['error'] = "{}: {}".format(type(e).__name__, e)
+    return result
+
+
+def record_replay(filename):
+    """
+    Play back a replay and store its digests alongside it
+
+    :param str filename: The replay file to record the digests for
+    :return: A tuple of the filename and an error message, or None if the replay played back successfully
+    """
+    result = play_replay(filename)
+    with open(filename + DIGEST_EXTENSION, "w") as digest_file:
+        json.dump({'moves': result['moves'], 'final': result['final']}, digest_file)
+    return filename, result['error']
+
+
+def verify_replay(filename):
+    """
+    Play back a replay and compare it against its stored digests.
+
+    :param str filename: The replay file to verify
+    :return: A tuple of the filename and a description of where the replay diverged, or None if it matched
+    """
+    try:
+        with open(filename + DIGEST_EXTENSION, "r") as digest_file:
+            expected = json.load(digest_file)
+    except IOError:
+        return filename, "no stored digest"
+
+    result = play_replay(filename)
+    actual_moves = result['moves']
+    expected_moves = expected['moves']
+    for index in range(min(len(actual_moves), len(expected_moves))):
+        if actual_moves[index] != expected_moves[index]:
+            return filename, "diverged at move {} ({})".format(index, result['move_names'][index])
+
+    if len(actual_moves) != len(expected_moves):
+        index = min(len(actual_moves), len(expected_moves))
+        if index < len(result['move_names']):
+            move_name = result['move_names'][index]
+        else:
+            move_name = "end of replay"
+        if result['error']:
+            return filename, "diverged at move {} ({}): {}".format(index, move_name, result['error'])
+        return filename, "diverged at move {} ({})".format(index, move_name)
+
+    if result['final'] != expected['final']:
+        if result['error']:
+            return filename, "final state differs: {}".format(result['error'])
+        return filename, "final state differs"
+    return filename, None
+
+
+def verify_replays(directory, record=False, processes=None):
+    """
+    Verify (or record the digests for) every replay in a directory, spreading the work across a pool of processes.
+
+    :param str directory: The directory containing the replays
+    :param bool record: If True, record new digests rather than verifying against the stored ones
+    :param int processes: The number of processes to use.  If None, one per CPU is used.  If 1, the replays are
+                          played in this process.
+    :return: A list of tuples of the filename and a message for each replay that did not verify (or, when recording,
+             did not play back without error)
+    """
+    replays = find_replays(directory)
+    check = record_replay if record else verify_replay
+    if processes == 1:
+        results = map(check, replays)
+        return [result for result in results if result[1] is not None]
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        chunk_size = max(1, len(replays) // ((processes or multiprocessing.cpu_count()) * 8))
+        results = pool.imap_unordered(check, replays, chunk_size)
+        return sorted(result for result in results if result[1] is not None)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Verify that a directory of replays still plays back identically")
+    parser.add_argument("directory", help="The directory containing the replays to verify")
+    parser.add_argument("--record", action="store_true", help="Record new digests instead of verifying")
+    parser.add_argument("--processes", type=int, default=None, help="The number of processes to use")
+    options = parser.parse_args(args)
+
+    replay_count = len(find_replays(options.directory))
+    failures = verify_replays(options.directory, options.record, options.processes)
+    for filename, message in failures:
+        print("{}: {}".format(filename, message))
+    print("{} of {} replays {}".format(replay_count - len(failures), replay_count,
+                                       "recorded" if options.record else "verified"))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))